@@ -1,3 +1,5 @@
+import numpy as np
+
 from ..engine.concrete.beam import analyze_concrete_beam
 from ..engine.concrete.column import analyze_concrete_column
 from ..engine.concrete.slab_solid import analyze_solid_slab
@@ -7,6 +9,7 @@ from ..engine.concrete.footing import analyze_concrete_footing
 from ..engine.concrete.staircase import analyze_concrete_staircase
 from ..engine.steel.steel_beam import analyze_steel_beam
 from ..engine.steel.steel_column import analyze_steel_column
+from ..engine.structure_model import IndexedStructure
 from .aci import ACI
 
 class ISCode:
@@ -77,51 +80,37 @@ class ISCode:
     # ================================
     # Structure-level analysis (with combos)
     # ================================
-    def analyze_structure(self, structure_data: dict, raw_results: dict):
+    def analyze_structure(self, structure_data: dict, raw_results: dict, model: IndexedStructure = None):
         """
         structure_data: JSON كامل للهيكل
         raw_results: نتائج StructureAnalyzer (لكل Combination)
+        model: IndexedStructure مبني مرة وحدة لكل request (optional)
         """
+        model = model or IndexedStructure(structure_data)
         results = {}
         phi_flexure, phi_shear, phi_axial = 0.9, 0.75, 0.65
 
+        bw, h, cover, d = model.bw, model.h, model.cover, model.d
+        fc, fy = model.fc, model.fy
+
+        # Shear capacity (simplified IS 456)
+        Vc = 0.17 * np.sqrt(fc) * bw * d
+
+        # Axial capacity
+        Pn = 0.85 * fc * bw * h * 1e6 / 1000  # kN
+
         for combo_id, combo_res in raw_results.items():
-            design = {}
-            for mid, forces in combo_res["member_forces"].items():
-                Mu, Vu, Nu = abs(forces["Mmax"]), abs(forces["Vmax"]), abs(forces["Nmax"])
-                member = next(m for m in structure_data["members"] if m["id"] == mid)
-                sec = next(s for s in structure_data["sections"] if s["id"] == member["sectionId"])
-                mat = next(m for m in structure_data["materials"] if m["id"] == member["materialId"])
-
-                bw, h, cover = sec["params"].get("bw", 0.3), sec["params"].get("h", 0.6), sec["params"].get("cover", 0.04)
-                d = h - cover
-                fc, fy = mat["fc"], mat["fy"]
-
-                # Flexural steel requirement
-                As_req = (Mu*1e6) / (phi_flexure * fy * 1e3 * (d - 0.5*cover))
-
-                # Shear capacity (simplified IS 456)
-                Vc = 0.17 * (fc**0.5) * bw * d
-                shear_ok = Vu <= phi_shear * Vc
-
-                # Axial capacity
-                Pn = 0.85 * fc * bw * h * 1e6 / 1000  # kN
-                axial_ok = Nu <= phi_axial * Pn
-
-                design[mid] = {
-                    "Mu": round(Mu, 2),
-                    "Vu": round(Vu, 2),
-                    "Nu": round(Nu, 2),
-                    "As_required": round(As_req, 2),
-                    "As_provided": round(As_req * 1.2, 2),
-                    "Shear_OK": shear_ok,
-                    "Axial_OK": axial_ok,
-                    "Overall_OK": shear_ok and axial_ok
-                }
+            Mu, Vu, Nu = model.force_columns(combo_res["member_forces"])
+
+            # Flexural steel requirement
+            As_req = (Mu*1e6) / (phi_flexure * fy * 1e3 * (d - 0.5*cover))
+
+            shear_ok = Vu <= phi_shear * Vc
+            axial_ok = Nu <= phi_axial * Pn
 
             results[combo_id] = {
                 **combo_res,
-                "design": design
+                "design": model.design_table(Mu, Vu, Nu, As_req, As_req * 1.2, shear_ok, axial_ok)
             }
 
         return results
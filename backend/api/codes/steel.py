@@ -1,5 +1,7 @@
 import math
 
+from ..engine.steel.steel_beam import section_dimensions
+
 class SteelCode:
     def analyze(self, element, data):
         if element == "steel_column":
@@ -18,16 +20,26 @@ class SteelCode:
     def analyze_steel_beam(self, data):
         return self._analyze_beam(data)
 
+    def _dimensions(self, data):
+        # explicit dimensions win; otherwise take them from the section catalog
+        if "dimensions" in data:
+            return data["dimensions"]
+        dims = section_dimensions(data.get("sectionSize"), data.get("sectionType"))
+        if not dims:
+            raise ValueError("Missing section dimensions: give dimensions or a catalog sectionSize.")
+        return dims
+
     def _analyze_column(self, data):
         fy = data["steelGrade"]  # MPa
         P = data["axialLoad"] * 1000  # kN to N
         length = data["length"] / 1000  # mm to m
         K = data.get("kFactor", 1.0)
 
-        b = data["dimensions"]["width"]
-        d = data["dimensions"]["depth"]
-        tf = data["dimensions"]["flangeThickness"]
-        tw = data["dimensions"]["webThickness"]
+        dims = self._dimensions(data)
+        b = dims["width"]
+        d = dims["depth"]
+        tf = dims["flangeThickness"]
+        tw = dims["webThickness"]
 
         A = 2 * b * tf + (d - 2 * tf) * tw  # mm^2
         A_m2 = A / 1e6  # m^2
@@ -55,10 +67,11 @@ class SteelCode:
         w = data["uniformLoad"] * 1000  # kN/m to N/m
         L = data["span"] / 1000  # mm to m
 
-        b = data["dimensions"]["width"]
-        d = data["dimensions"]["depth"]
-        tf = data["dimensions"]["flangeThickness"]
-        tw = data["dimensions"]["webThickness"]
+        dims = self._dimensions(data)
+        b = dims["width"]
+        d = dims["depth"]
+        tf = dims["flangeThickness"]
+        tw = dims["webThickness"]
 
         Z = (b * d**2) / 6  # mm^3
         φ = 0.9
@@ -1,29 +1,133 @@
+import itertools
+
+import numpy as np
+
+from .engine.response_spectrum import design_spectrum
+
+# plateau / peak ground acceleration ratio of the design spectra (2.5 in most codes)
+SPECTRAL_AMPLIFICATION = 2.5
+
+# ================================
+# Design spectrum corner periods (TB, TC, TD) per soil class (s)
+# ================================
+# ASCE 7 / IBC family: T0 = 0.2 Ts, Ts = Sd1 / Sds, TL
+ASCE_CORNER_PERIODS = {
+    "rock": (0.08, 0.4, 4.0),
+    "medium": (0.12, 0.6, 4.0),
+    "soft": (0.16, 0.8, 4.0),
+}
+# EN 1998-1 type 1 spectrum (ground A / B / D)
+EC8_CORNER_PERIODS = {
+    "rock": (0.15, 0.4, 2.0),
+    "medium": (0.15, 0.5, 2.0),
+    "soft": (0.2, 0.8, 2.0),
+}
+# IS 1893: Sa/g = 2.5 from 0.1 s to 0.40 / 0.55 / 0.67 s, then ~1/T
+IS_CORNER_PERIODS = {
+    "rock": (0.1, 0.4, 4.0),
+    "medium": (0.1, 0.55, 4.0),
+    "soft": (0.1, 0.67, 4.0),
+}
+
+
+class SeismicSpectrum:
+    """
+    Design spectrum Sa(T) (g) for arrays of periods, one row per seismic data case.
+    Subclasses give _plateau(data) -> Sds, CORNER_PERIODS and spectrum_inputs();
+    every combination of the tabulated inputs is evaluated once when the class
+    is defined, so lookups for known zone/soil/importance values are table reads.
+    """
+    CORNER_PERIODS = ASCE_CORNER_PERIODS
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        inputs = cls.spectrum_inputs()
+        if not inputs:
+            return
+        handler = cls()
+        cls._table_keys = tuple(inputs)
+        cases = [dict(zip(cls._table_keys, values)) for values in itertools.product(*inputs.values())]
+        cls._table_index = {tuple(case[k] for k in cls._table_keys): i for i, case in enumerate(cases)}
+        cls._table = np.array([handler._parameter_row(case) for case in cases], dtype=float).reshape(-1, 4)
+
+    @classmethod
+    def spectrum_inputs(cls):
+        """
+        data key -> values to tabulate.
+        """
+        return {}
+
+    def _parameter_row(self, data):
+        soil = str(data.get("soil", "medium")).lower()
+        TB, TC, TD = self.CORNER_PERIODS.get(soil, self.CORNER_PERIODS["medium"])
+        return self._plateau(data), TB, TC, TD
+
+    def parameter_rows(self, cases):
+        """
+        (n, 4) [Sds, TB, TC, TD] per case, from the table when the inputs are tabulated.
+        """
+        keys, index, table = self._table_keys, self._table_index, self._table
+        rows = np.empty((len(cases), 4))
+        for i, data in enumerate(cases):
+            j = index.get(tuple(data.get(k) for k in keys))
+            rows[i] = table[j] if j is not None else self._parameter_row(data)
+        return rows
+
+    def spectrum_parameters(self, data):
+        Sds, TB, TC, TD = self.parameter_rows([data])[0].tolist()
+        return {"Sds": Sds, "TB": TB, "TC": TC, "TD": TD, "soil": data.get("soil", "medium")}
+
+    def spectrum_batch(self, periods, cases):
+        """
+        (len(cases), len(periods)) Sa in g; each case may give a behaviour factor R.
+        """
+        params = self.parameter_rows(cases)
+        R = np.array([float(data.get("R", 1.0)) for data in cases])
+        Sds, TB, TC, TD = (params[:, i:i + 1] for i in range(4))
+        return design_spectrum(np.asarray(periods, dtype=float)[None, :], Sds / R[:, None], TB, TC, TD)
+
+    def spectrum(self, periods, data):
+        """
+        Sa (g) at each period for one seismic data case.
+        """
+        return self.spectrum_batch(periods, [data])[0]
+
+
+class JordanSeismic(SeismicSpectrum):
+    ZONE_FACTORS = {
+        "1": 0.10,
+        "2A": 0.15,
+        "2B": 0.20,
+        "3": 0.25
+    }
+    SOIL_FACTORS = {
+        "rock": 0.9,
+        "medium": 1.0,
+        "soft": 1.2
+    }
+    IMPORTANCE_FACTORS = {
+        "low": 0.8,
+        "normal": 1.0,
+        "high": 1.2
+    }
+
+    def _factors(self, data):
+        zone = data.get("zone", "2A")
+        soil = data.get("soil", "medium")
+        importance = data.get("importance", "normal")
+        return (
+            self.ZONE_FACTORS.get(zone.upper(), 0.15),
+            self.SOIL_FACTORS.get(soil.lower(), 1.0),
+            self.IMPORTANCE_FACTORS.get(importance.lower(), 1.0),
+        )
 
-class JordanSeismic:
     def analyze(self, data):
         zone = data.get("zone", "2A")
         soil = data.get("soil", "medium")
         importance = data.get("importance", "normal")
         system = data.get("system", "moment_frame")
 
-        zone_factor = {
-            "1": 0.10,
-            "2A": 0.15,
-            "2B": 0.20,
-            "3": 0.25
-        }.get(zone.upper(), 0.15)
-
-        soil_factor = {
-            "rock": 0.9,
-            "medium": 1.0,
-            "soft": 1.2
-        }.get(soil.lower(), 1.0)
-
-        importance_factor = {
-            "low": 0.8,
-            "normal": 1.0,
-            "high": 1.2
-        }.get(importance.lower(), 1.0)
+        zone_factor, soil_factor, importance_factor = self._factors(data)
 
         base_shear = zone_factor * soil_factor * importance_factor * 1000  # Dummy base shear value
 
@@ -37,25 +141,39 @@ class JordanSeismic:
             "note": "Simplified base shear check based on Jordan seismic code"
         }
 
+    @classmethod
+    def spectrum_inputs(cls):
+        return {"zone": cls.ZONE_FACTORS, "soil": cls.SOIL_FACTORS, "importance": cls.IMPORTANCE_FACTORS}
+
+    def _plateau(self, data):
+        zone_factor, soil_factor, importance_factor = self._factors(data)
+        return SPECTRAL_AMPLIFICATION * zone_factor * soil_factor * importance_factor
+
+
+class SaudiSeismic(SeismicSpectrum):
+    SS_VALUES = {
+        "A": 0.15,
+        "B": 0.25,
+        "C": 0.35,
+        "D1": 0.45,
+        "D2": 0.55
+    }
+    FA_VALUES = {
+        "rock": 0.8,
+        "medium": 1.0,
+        "soft": 1.3
+    }
+
+    def _factors(self, data):
+        zone = data.get("zone", "D1")
+        soil = data.get("soil", "medium")
+        return self.SS_VALUES.get(zone.upper(), 0.25), self.FA_VALUES.get(soil.lower(), 1.0)
 
-class SaudiSeismic:
     def analyze(self, data):
         zone = data.get("zone", "D1")
         soil = data.get("soil", "medium")
 
-        Ss = {
-            "A": 0.15,
-            "B": 0.25,
-            "C": 0.35,
-            "D1": 0.45,
-            "D2": 0.55
-        }.get(zone.upper(), 0.25)
-
-        Fa = {
-            "rock": 0.8,
-            "medium": 1.0,
-            "soft": 1.3
-        }.get(soil.lower(), 1.0)
+        Ss, Fa = self._factors(data)
 
         Sds = Ss * Fa
         base_shear = Sds * 1000
@@ -71,22 +189,62 @@ class SaudiSeismic:
             "note": "Based on Saudi Building Code seismic provisions"
         }
 
+    @classmethod
+    def spectrum_inputs(cls):
+        return {"zone": cls.SS_VALUES, "soil": cls.FA_VALUES}
+
+    def _plateau(self, data):
+        Ss, Fa = self._factors(data)
+        return Ss * Fa
+
+
+class ZoneSoilSeismic(SeismicSpectrum):
+    """
+    Codes whose simplified check is zone factor x soil factor (x 1000 kN).
+    Subclasses give the tables and defaults.
+    """
+    ZONE_FACTORS = {}
+    SOIL_FACTORS = {}
+    DEFAULT_ZONE = None
+    DEFAULT_ZONE_FACTOR = None
+    DEFAULT_SOIL_FACTOR = 1.0
+    UPPER_ZONE = False
+
+    def _factors(self, data):
+        zone = data.get("zone", self.DEFAULT_ZONE)
+        soil = data.get("soil", "medium")
+        zone_factor = self.ZONE_FACTORS.get(zone.upper() if self.UPPER_ZONE else zone, self.DEFAULT_ZONE_FACTOR)
+        soil_factor = self.SOIL_FACTORS.get(soil.lower(), self.DEFAULT_SOIL_FACTOR)
+        return zone_factor, soil_factor
+
+    @classmethod
+    def spectrum_inputs(cls):
+        return {"zone": cls.ZONE_FACTORS, "soil": cls.SOIL_FACTORS}
+
+    def _plateau(self, data):
+        zone_factor, soil_factor = self._factors(data)
+        return SPECTRAL_AMPLIFICATION * zone_factor * soil_factor
+
+
+class EgyptSeismic(ZoneSoilSeismic):
+    ZONE_FACTORS = {
+        "1": 0.10,
+        "2": 0.20,
+        "3": 0.30
+    }
+    SOIL_FACTORS = {
+        "rock": 0.9,
+        "medium": 1.0,
+        "soft": 1.2
+    }
+    DEFAULT_ZONE = "2"
+    DEFAULT_ZONE_FACTOR = 0.20
+    CORNER_PERIODS = EC8_CORNER_PERIODS
 
-class EgyptSeismic:
     def analyze(self, data):
         zone = data.get("zone", "2")
         soil = data.get("soil", "medium")
-        zone_factor = {
-            "1": 0.10,
-            "2": 0.20,
-            "3": 0.30
-        }.get(zone, 0.20)
-
-        soil_modifier = {
-            "rock": 0.9,
-            "medium": 1.0,
-            "soft": 1.2
-        }.get(soil.lower(), 1.0)
+        zone_factor, soil_modifier = self._factors(data)
 
         base_shear = zone_factor * soil_modifier * 1000
 
@@ -100,20 +258,27 @@ class EgyptSeismic:
         }
 
 
-class EurocodeSeismic:
-    def analyze(self, data):
-        ag = {
-            "low": 0.08,
-            "medium": 0.12,
-            "high": 0.16
-        }.get(data.get("zone", "medium"), 0.12)
+class EurocodeSeismic(SeismicSpectrum):
+    AG_VALUES = {
+        "low": 0.08,
+        "medium": 0.12,
+        "high": 0.16
+    }
+    S_VALUES = {
+        "rock": 1.0,
+        "medium": 1.2,
+        "soft": 1.4
+    }
+    CORNER_PERIODS = EC8_CORNER_PERIODS
+
+    def _factors(self, data):
+        ag = self.AG_VALUES.get(data.get("zone", "medium"), 0.12)
+        S = self.S_VALUES.get(data.get("soil", "medium"), 1.2)
+        return ag, S
 
+    def analyze(self, data):
+        ag, S = self._factors(data)
         soil = data.get("soil", "medium")
-        S = {
-            "rock": 1.0,
-            "medium": 1.2,
-            "soft": 1.4
-        }.get(soil, 1.2)
 
         base_shear = ag * S * 1000
 
@@ -126,24 +291,34 @@ class EurocodeSeismic:
             "note": "Eurocode 8 base shear approximation"
         }
 
+    @classmethod
+    def spectrum_inputs(cls):
+        return {"zone": cls.AG_VALUES, "soil": cls.S_VALUES}
+
+    def _plateau(self, data):
+        ag, S = self._factors(data)
+        return SPECTRAL_AMPLIFICATION * ag * S
+
+
+class UAESeismic(ZoneSoilSeismic):
+    ZONE_FACTORS = {
+        "Zone 0": 0.1,
+        "Zone 1": 0.15,
+        "Zone 2A": 0.2,
+        "Zone 2B": 0.3
+    }
+    SOIL_FACTORS = {
+        "rock": 0.9,
+        "medium": 1.0,
+        "soft": 1.2
+    }
+    DEFAULT_ZONE = "Zone 1"
+    DEFAULT_ZONE_FACTOR = 0.15
 
-class UAESeismic:
     def analyze(self, data):
         zone = data.get("zone", "Zone 1")
         soil = data.get("soil", "medium")
-
-        zone_factor = {
-            "Zone 0": 0.1,
-            "Zone 1": 0.15,
-            "Zone 2A": 0.2,
-            "Zone 2B": 0.3
-        }.get(zone, 0.15)
-
-        soil_factor = {
-            "rock": 0.9,
-            "medium": 1.0,
-            "soft": 1.2
-        }.get(soil.lower(), 1.0)
+        zone_factor, soil_factor = self._factors(data)
 
         base_shear = zone_factor * soil_factor * 1000
 
@@ -157,23 +332,25 @@ class UAESeismic:
         }
 
 
-class TurkeySeismic:
+class TurkeySeismic(ZoneSoilSeismic):
+    ZONE_FACTORS = {
+        "1": 0.4,
+        "2": 0.3,
+        "3": 0.2,
+        "4": 0.1
+    }
+    SOIL_FACTORS = {
+        "rock": 0.9,
+        "medium": 1.0,
+        "soft": 1.3
+    }
+    DEFAULT_ZONE = "3"
+    DEFAULT_ZONE_FACTOR = 0.2
+
     def analyze(self, data):
         zone = data.get("zone", "3")
         soil = data.get("soil", "medium")
-
-        zone_factor = {
-            "1": 0.4,
-            "2": 0.3,
-            "3": 0.2,
-            "4": 0.1
-        }.get(zone, 0.2)
-
-        soil_factor = {
-            "rock": 0.9,
-            "medium": 1.0,
-            "soft": 1.3
-        }.get(soil.lower(), 1.0)
+        zone_factor, soil_factor = self._factors(data)
 
         base_shear = zone_factor * soil_factor * 1000
 
@@ -188,23 +365,25 @@ class TurkeySeismic:
 
 
 
-class ACISismic:
+class ACISismic(ZoneSoilSeismic):
+    ZONE_FACTORS = {
+        "1": 0.10,
+        "2": 0.15,
+        "3": 0.25,
+        "4": 0.35
+    }
+    SOIL_FACTORS = {
+        "rock": 0.9,
+        "medium": 1.0,
+        "soft": 1.2
+    }
+    DEFAULT_ZONE = "2"
+    DEFAULT_ZONE_FACTOR = 0.15
+
     def analyze(self, data):
         zone = data.get("zone", "2")
         soil = data.get("soil", "medium")
-
-        zone_factor = {
-            "1": 0.10,
-            "2": 0.15,
-            "3": 0.25,
-            "4": 0.35
-        }.get(zone, 0.15)
-
-        soil_modifier = {
-            "rock": 0.9,
-            "medium": 1.0,
-            "soft": 1.2
-        }.get(soil.lower(), 1.0)
+        zone_factor, soil_modifier = self._factors(data)
 
         base_shear = zone_factor * soil_modifier * 1000
 
@@ -217,22 +396,25 @@ class ACISismic:
         }
 
 
-class BSSeismic:
+class BSSeismic(ZoneSoilSeismic):
+    ZONE_FACTORS = {
+        "low": 0.08,
+        "moderate": 0.12,
+        "high": 0.18
+    }
+    SOIL_FACTORS = {
+        "rock": 0.95,
+        "medium": 1.0,
+        "soft": 1.3
+    }
+    DEFAULT_ZONE = "moderate"
+    DEFAULT_ZONE_FACTOR = 0.12
+    CORNER_PERIODS = EC8_CORNER_PERIODS
+
     def analyze(self, data):
         zone = data.get("zone", "moderate")
         soil = data.get("soil", "medium")
-
-        zone_factor = {
-            "low": 0.08,
-            "moderate": 0.12,
-            "high": 0.18
-        }.get(zone, 0.12)
-
-        soil_factor = {
-            "rock": 0.95,
-            "medium": 1.0,
-            "soft": 1.3
-        }.get(soil.lower(), 1.0)
+        zone_factor, soil_factor = self._factors(data)
 
         base_shear = zone_factor * soil_factor * 1000
 
@@ -245,23 +427,25 @@ class BSSeismic:
         }
 
 
-class ASSeismic:
+class ASSeismic(ZoneSoilSeismic):
+    ZONE_FACTORS = {
+        "A": 0.1,
+        "B": 0.15,
+        "C": 0.2,
+        "D": 0.3
+    }
+    SOIL_FACTORS = {
+        "rock": 0.85,
+        "medium": 1.0,
+        "soft": 1.25
+    }
+    DEFAULT_ZONE = "A"
+    DEFAULT_ZONE_FACTOR = 0.15
+
     def analyze(self, data):
         zone = data.get("zone", "A")
         soil = data.get("soil", "medium")
-
-        zone_factor = {
-            "A": 0.1,
-            "B": 0.15,
-            "C": 0.2,
-            "D": 0.3
-        }.get(zone, 0.15)
-
-        soil_factor = {
-            "rock": 0.85,
-            "medium": 1.0,
-            "soft": 1.25
-        }.get(soil.lower(), 1.0)
+        zone_factor, soil_factor = self._factors(data)
 
         base_shear = zone_factor * soil_factor * 1000
 
@@ -274,22 +458,24 @@ class ASSeismic:
         }
 
 
-class CSASeismic:
+class CSASeismic(ZoneSoilSeismic):
+    ZONE_FACTORS = {
+        "low": 0.08,
+        "medium": 0.12,
+        "high": 0.18
+    }
+    SOIL_FACTORS = {
+        "rock": 0.9,
+        "medium": 1.0,
+        "soft": 1.2
+    }
+    DEFAULT_ZONE = "low"
+    DEFAULT_ZONE_FACTOR = 0.12
+
     def analyze(self, data):
         zone = data.get("zone", "low")
         soil = data.get("soil", "medium")
-
-        zone_factor = {
-            "low": 0.08,
-            "medium": 0.12,
-            "high": 0.18
-        }.get(zone, 0.12)
-
-        soil_factor = {
-            "rock": 0.9,
-            "medium": 1.0,
-            "soft": 1.2
-        }.get(soil.lower(), 1.0)
+        zone_factor, soil_factor = self._factors(data)
 
         base_shear = zone_factor * soil_factor * 1000
 
@@ -302,23 +488,27 @@ class CSASeismic:
         }
 
 
-class ISSeismic:
+class ISSeismic(ZoneSoilSeismic):
+    ZONE_FACTORS = {
+        "II": 0.1,
+        "III": 0.16,
+        "IV": 0.24,
+        "V": 0.36
+    }
+    SOIL_FACTORS = {
+        "rock": 0.8,
+        "medium": 1.0,
+        "soft": 1.3
+    }
+    DEFAULT_ZONE = "III"
+    DEFAULT_ZONE_FACTOR = 0.16
+    CORNER_PERIODS = IS_CORNER_PERIODS
+    UPPER_ZONE = True
+
     def analyze(self, data):
         zone = data.get("zone", "III")
         soil = data.get("soil", "medium")
-
-        zone_factor = {
-            "II": 0.1,
-            "III": 0.16,
-            "IV": 0.24,
-            "V": 0.36
-        }.get(zone.upper(), 0.16)
-
-        soil_factor = {
-            "rock": 0.8,
-            "medium": 1.0,
-            "soft": 1.3
-        }.get(soil.lower(), 1.0)
+        zone_factor, soil_factor = self._factors(data)
 
         base_shear = zone_factor * soil_factor * 1000
 
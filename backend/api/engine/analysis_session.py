@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from uuid import uuid4
+
+import numpy as np
+from scipy import sparse
+from scipy.linalg import LinAlgError
+
+from .frame_elements import to_global
+from .linear_solvers import woodbury_update
+from .analyzers import create_analyzer
+
+# ================================
+# Incremental reanalysis sessions
+# ================================
+# الجلسة بتحتفظ بـ factorization للـ Kff وبتقارن كل تعديل مع النموذج الأساسي:
+# - نفس الـ stiffness (تعديل أحمال بس)      -> نفس الـ factor
+# - تغيير بسيط في أعضاء قليلة              -> Woodbury low-rank update
+# - تغيير كبير / topology مختلفة           -> factorization جديدة
+#
+# STRUCTICODE_WOODBURY_MAX_RANK: free DOFs touched by edits before we refactorize
+# STRUCTICODE_MAX_SESSIONS / STRUCTICODE_SESSION_TTL: session store limits
+
+WOODBURY_MAX_RANK = int(os.getenv("STRUCTICODE_WOODBURY_MAX_RANK", 120))
+MAX_SESSIONS = int(os.getenv("STRUCTICODE_MAX_SESSIONS", 32))
+SESSION_TTL = float(os.getenv("STRUCTICODE_SESSION_TTL", 1800))
+
+
+def topology_signature(structure: dict):
+    """
+    Everything that fixes the DOF numbering and the free/fixed split:
+    dimension, node order, coordinates and supports, member order, connectivity
+    and orientation (member rotations are not part of the stiffness comparison).
+    """
+    nodes = tuple(
+        (n["id"], float(n["x"]), float(n["y"]), float(n.get("z", 0.0)), n["support"]) for n in structure["nodes"]
+    )
+    members = tuple((m["id"], m["n1"], m["n2"], tuple(m.get("orientation") or ())) for m in structure["members"])
+    return structure.get("dimension", 2), nodes, members
+
+
+class AnalysisSession:
+    """
+    One model being edited interactively. update() returns a StructureAnalyzer
+    for the edited structure whose solver reuses (or low-rank updates) the
+    session's factorization; last_update says which path was taken.
+    """
+
+    def __init__(self, structure: dict, solver: str = "auto"):
+        self.id = uuid4().hex
+        self.requested_solver = solver
+        self.lock = threading.Lock()
+        self.touched = time.monotonic()
+        self.last_update = {}
+        self._refactorize(structure, reason="new session")
+
+    def _refactorize(self, structure, reason):
+        start = time.perf_counter()
+        analyzer = create_analyzer(structure, solver=self.requested_solver)
+        analyzer._factorize()
+
+        self._topology = topology_signature(structure)
+        self._base = analyzer
+        self._base_factor = analyzer._factor
+        self._base_K_sf = analyzer._K_sf
+        self._base_k_local = analyzer.member_k_local
+        self._free_position = np.full(analyzer.ndof, -1)
+        self._free_position[analyzer.free_dofs] = np.arange(len(analyzer.free_dofs))
+
+        self.analyzer = analyzer
+        self.last_update = {
+            "mode": "full_factorization",
+            "reason": reason,
+            "changed_members": None,
+            "update_rank": 0,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+        return analyzer
+
+    def update(self, structure: dict):
+        self.touched = time.monotonic()
+
+        if topology_signature(structure) != self._topology:
+            return self._refactorize(structure, reason="topology or supports changed")
+
+        start = time.perf_counter()
+        base = self._base
+        analyzer = type(base)(structure, solver=base.solver, node_position=base.node_position)
+
+        # stiffness edits relative to the factorized base model (same geometry,
+        # so comparing local stiffness is enough)
+        changed = np.flatnonzero(np.any(analyzer.member_k_local != self._base_k_local, axis=(1, 2)))
+
+        if len(changed) == 0:
+            analyzer._factor = self._base_factor
+            analyzer._K_sf = self._base_K_sf
+            mode, rank = "reuse_factorization", 0
+        else:
+            T = analyzer.member_T[changed]
+            delta = to_global(T, analyzer.member_k_local[changed]) - to_global(T, self._base_k_local[changed])
+
+            dofs = base.member_dofs[changed]
+            n = dofs.shape[1]
+            rows = np.repeat(dofs, n, axis=1).ravel()
+            cols = np.tile(dofs, (1, n)).ravel()
+            dK = sparse.coo_matrix((delta.ravel(), (rows, cols)), shape=(base.ndof, base.ndof)).tocsr()
+
+            touched = np.unique(dofs)
+            idx = self._free_position[touched]
+            idx = idx[idx >= 0]
+            if len(idx) > WOODBURY_MAX_RANK:
+                return self._refactorize(structure, reason=f"{len(changed)} members changed (rank {len(idx)})")
+
+            free, fixed = base.free_dofs, base.fixed_dofs
+            D = dK[free[idx]][:, free[idx]].toarray()
+            try:
+                analyzer._factor = woodbury_update(self._base_factor, len(free), idx, D)
+            except LinAlgError:
+                return self._refactorize(structure, reason="low-rank update was singular")
+
+            dK_sf = dK[fixed][:, free]
+            analyzer._K_sf = self._base_K_sf + (dK_sf if sparse.issparse(self._base_K_sf) else dK_sf.toarray())
+            mode, rank = "woodbury_update", int(len(idx))
+
+        self.analyzer = analyzer
+        self.last_update = {
+            "mode": mode,
+            "reason": None,
+            "changed_members": [analyzer.members[i]["id"] for i in changed.tolist()],
+            "update_rank": rank,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+        return analyzer
+
+
+class SessionStore:
+    """
+    In-process sessions, least recently used evicted first, idle ones expire.
+    Sessions hold factorizations (not picklable), so they live in the API process.
+    """
+
+    def __init__(self, max_sessions=MAX_SESSIONS, ttl=SESSION_TTL):
+        self.max_sessions = max(1, max_sessions)
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _purge(self):
+        now = time.monotonic()
+        for sid in [sid for sid, s in self._sessions.items() if self.ttl and now - s.touched > self.ttl]:
+            del self._sessions[sid]
+
+    def add(self, session: AnalysisSession):
+        with self._lock:
+            self._purge()
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session
+
+    def get(self, session_id):
+        with self._lock:
+            self._purge()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                session.touched = time.monotonic()
+            return session
+
+    def remove(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+
+session_store = SessionStore()
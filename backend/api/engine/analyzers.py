@@ -0,0 +1,18 @@
+from .space_frame_analyzer import SpaceFrameAnalyzer
+from .structure_analyzer import StructureAnalyzer
+
+# ================================
+# Analyzer selection (structure["dimension"]: 2 = plane frame, 3 = space frame)
+# ================================
+ANALYZERS = {
+    2: StructureAnalyzer,
+    3: SpaceFrameAnalyzer,
+}
+
+
+def create_analyzer(structure: dict, **kwargs):
+    dimension = structure.get("dimension", 2)
+    analyzer_class = ANALYZERS.get(dimension)
+    if analyzer_class is None:
+        raise ValueError(f"Unsupported structure dimension: {dimension}")
+    return analyzer_class(structure, **kwargs)
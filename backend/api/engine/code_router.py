@@ -1,29 +1,48 @@
-from ..codes.aci import ACI
-from ..codes.bs import BS
-from ..codes.eurocode import Eurocode
-from ..codes.as_code import ASCode
-from ..codes.csa import CSA
-from ..codes.is_code import ISCode
-from ..codes.jordan import JordanCode
-from ..codes.egypt import EgyptianCode
-from ..codes.saudi import SaudiCode
-from ..codes.uae import UAECode
-from ..codes.turkey import TurkishCode
-from ..codes.steel import SteelCode  # ✅ الكود الجديد اللي أضفناه
+from .registry import HandlerRegistry
+from ..utils.executor import register_worker_state
+
+# كل كود بينعمل import و instance أول مرة بينطلب بس، وبعدها بيتخزن
+_registry = HandlerRegistry()
+
+
+def register_code_handler(code_name: str, handler):
+    """
+    Plugin hook for new national codes.
+    handler: class/factory, or "module:Class" imported lazily (e.g. "..codes.aci:ACI").
+    Paths and module-level classes are also registered in the compute workers.
+    """
+    _registry.register(code_name, handler)
+
 
 def get_code_handler(code_name: str):
-    mapping = {
-        "ACI": ACI(),
-        "BS": BS(),
-        "Eurocode": Eurocode(),
-        "AS": ASCode(),
-        "CSA": CSA(),
-        "IS": ISCode(),
-        "Jordan": JordanCode(),
-        "Egypt": EgyptianCode(),
-        "Saudi": SaudiCode(),
-        "UAE": UAECode(),
-        "Turkey": TurkishCode(),
-        "Steel": SteelCode()  # ✅ الدعم الجديد لعناصر الفولاذ
-    }
-    return mapping.get(code_name)
+    return _registry.get(code_name)
+
+
+def available_codes():
+    return _registry.names()
+
+
+def _registrations():
+    return _registry.registrations()
+
+
+def _restore_registrations(registrations):
+    _registry.restore(registrations)
+
+
+# runtime registrations travel with every compute-pool job
+register_worker_state("code_handlers", _registrations, _restore_registrations)
+
+
+register_code_handler("ACI", "..codes.aci:ACI")
+register_code_handler("BS", "..codes.bs:BS")
+register_code_handler("Eurocode", "..codes.eurocode:Eurocode")
+register_code_handler("AS", "..codes.as_code:ASCode")
+register_code_handler("CSA", "..codes.csa:CSA")
+register_code_handler("IS", "..codes.is_code:ISCode")
+register_code_handler("Jordan", "..codes.jordan:JordanCode")
+register_code_handler("Egypt", "..codes.egypt:EgyptianCode")
+register_code_handler("Saudi", "..codes.saudi:SaudiCode")
+register_code_handler("UAE", "..codes.uae:UAECode")
+register_code_handler("Turkey", "..codes.turkey:TurkishCode")
+register_code_handler("Steel", "..codes.steel:SteelCode")  # ✅ الدعم الجديد لعناصر الفولاذ
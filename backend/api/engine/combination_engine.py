@@ -0,0 +1,178 @@
+import re
+
+import numpy as np
+
+# ================================
+# Load Combination Engine (compiled factor matrix)
+# ================================
+# كل الـ combinations بتتحول مرة وحدة لمصفوفة معاملات (combos x basic cases)،
+# وبعدها أي نتيجة للـ basic cases (displacements, forces, reactions) بتتجمع
+# لكل الـ combos بـ matmul واحد.
+#
+# expression syntax: signed terms joined by + / -, each term a product of
+# numbers and companion factors followed by a case name:
+#   "1.2D+1.6L+0.5Lr", "0.9D-1.0EX", "1.35D+1.5W+1.5*0.7L", "1.35D+1.5W+1.5psi0L"
+# a case the model doesn't have contributes nothing (factor 0 on a zero column).
+
+# EN 1990 Table A1.1 (buildings, category A/B imposed load): ψ0, ψ1, ψ2 per case
+PSI_FACTORS = {
+    "L": (0.7, 0.5, 0.3),
+    "Lr": (0.0, 0.0, 0.0),
+    "S": (0.5, 0.2, 0.0),
+    "W": (0.6, 0.2, 0.0),
+    "T": (0.6, 0.5, 0.0),
+}
+
+_TERM = re.compile(
+    r"(?P<sign>[+-])(?P<coeffs>(?:(?:\d+\.?\d*|\.\d+|ψ[012]|psi[012])\*?)*)(?P<case>[A-Za-z][A-Za-z0-9_]*)"
+)
+_COEFF = re.compile(r"\d+\.?\d*|\.\d+|ψ[012]|psi[012]")
+
+
+def parse_combination(expr: str, psi=None):
+    """
+    {case: factor} of one expression; repeated cases are summed.
+    ψ0 / ψ1 / ψ2 (or psi0 ...) take the value of the term's case from psi,
+    which overrides / extends PSI_FACTORS per case.
+    """
+    psi = PSI_FACTORS if not psi else {**PSI_FACTORS, **psi}
+    text = expr.replace(" ", "")
+    if text and text[0] not in "+-":
+        text = "+" + text
+
+    factors = {}
+    pos = 0
+    while pos < len(text):
+        match = _TERM.match(text, pos)
+        if match is None:
+            raise ValueError(f"Invalid load combination expression: {expr}")
+        case = match.group("case")
+        factor = -1.0 if match.group("sign") == "-" else 1.0
+        for coeff in _COEFF.findall(match.group("coeffs")):
+            if coeff[0] in "ψp":
+                if case not in psi:
+                    raise ValueError(f"No ψ factors for load case {case} in: {expr}")
+                factor *= psi[case][int(coeff[-1])]
+            else:
+                factor *= float(coeff)
+        factors[case] = factors.get(case, 0.0) + factor
+        pos = match.end()
+
+    if not factors:
+        raise ValueError(f"Empty load combination expression: {expr!r}")
+    return factors
+
+
+class CompiledCombinations:
+    """
+    Combinations compiled against an ordered list of basic cases:
+    factors[i, j] is the factor of cases[j] in combos[i].
+    """
+
+    def __init__(self, combos, cases, psi=None):
+        self.combos = list(combos)
+        self.cases = list(cases)
+        column = {case: j for j, case in enumerate(self.cases)}
+
+        self.factors = np.zeros((len(self.combos), len(self.cases)))
+        self.missing_cases = set()
+        for i, combo in enumerate(self.combos):
+            for case, factor in parse_combination(combo["expr"], psi).items():
+                if case in column:
+                    self.factors[i, column[case]] += factor
+                else:
+                    self.missing_cases.add(case)
+
+    @property
+    def ids(self):
+        return [combo["id"] for combo in self.combos]
+
+    def select(self, indices):
+        """
+        The combinations at indices (same cases), in their original order.
+        """
+        indices = np.sort(np.asarray(indices, dtype=int))
+        selected = CompiledCombinations([], self.cases)
+        selected.combos = [self.combos[i] for i in indices]
+        selected.factors = self.factors[indices]
+        selected.missing_cases = self.missing_cases
+        return selected
+
+    def as_cases(self):
+        """
+        The same combinations against themselves as cases (identity factors), for
+        results solved per combination (P-Delta) rather than superposed.
+        """
+        compiled = CompiledCombinations([], self.ids)
+        compiled.combos = list(self.combos)
+        compiled.factors = np.eye(len(self.combos))
+        compiled.missing_cases = self.missing_cases
+        return compiled
+
+    def governing(self, responses, rtol=1e-9, block_rows=4096):
+        """
+        Indices of a small set of combinations that between them give the largest
+        |value| (to rtol) of every response row ((..., ncases) basic-case responses).
+        Every other combination is dominated: for each row some kept combination is
+        at least as large, so checks monotonic in |M|, |V|, |N| never depend on it.
+        """
+        rows = np.asarray(responses).reshape(-1, len(self.cases))
+        candidates = np.empty((len(rows), len(self.combos)), dtype=bool)
+        for start in range(0, len(rows), block_rows):
+            combined = np.abs(rows[start:start + block_rows] @ self.factors.T)
+            peak = combined.max(axis=1, keepdims=True)
+            candidates[start:start + block_rows] = combined >= peak * (1 - rtol)
+
+        # rows with a single governing combination decide most of the set, the rest
+        # is a greedy cover (combination covering most remaining rows first)
+        keep = set(np.argmax(candidates[candidates.sum(axis=1) == 1], axis=1).tolist())
+        uncovered = ~candidates[:, sorted(keep)].any(axis=1) if keep else np.ones(len(rows), dtype=bool)
+        while uncovered.any():
+            j = int(candidates[uncovered].sum(axis=0).argmax())
+            keep.add(j)
+            uncovered &= ~candidates[:, j]
+        return sorted(keep)
+
+    def apply(self, responses):
+        """
+        (..., ncases) basic-case responses -> (..., ncombos) combined responses.
+        """
+        return responses @ self.factors.T
+
+    def apply_stacked(self, *responses):
+        """
+        Combines several response arrays (each (..., ncases)) with one product;
+        returns them in the same order with the case axis replaced by combos.
+        """
+        ncases = len(self.cases)
+        blocks = [np.asarray(r).reshape(-1, ncases) for r in responses]
+        combined = np.concatenate(blocks, axis=0) @ self.factors.T
+
+        out, start = [], 0
+        for r, block in zip(responses, blocks):
+            out.append(combined[start:start + len(block)].reshape(*np.shape(r)[:-1], -1))
+            start += len(block)
+        return out
+
+
+def reduce_envelope(values):
+    """
+    Reductions over the combinations (last axis) of (..., ncombos) responses:
+    max / min with their indices, and the signed value of largest magnitude.
+    """
+    max_index = np.argmax(values, axis=-1)
+    min_index = np.argmin(values, axis=-1)
+    governing_index = np.argmax(np.abs(values), axis=-1)
+
+    def take(index):
+        return np.take_along_axis(values, index[..., None], axis=-1)[..., 0]
+
+    return {
+        "max": take(max_index), "max_index": max_index,
+        "min": take(min_index), "min_index": min_index,
+        "governing": take(governing_index), "governing_index": governing_index,
+    }
+
+
+def compile_combinations(combos, cases, psi=None):
+    return CompiledCombinations(combos, cases, psi)
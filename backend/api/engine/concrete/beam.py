@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def analyze_concrete_beam(data, code='ACI'):
     beam_type = data.get('type', 'Normal')
 
@@ -36,6 +39,54 @@ def get_code_parameters(code):
         return {'phi': 0.9, 'fy': 420}  # default fallback
 
 
+# ================================
+# Vectorized normal beam check (columnar arrays, one row per beam)
+# ================================
+def analyze_normal_beams(fc, width, depth, length, cover, bar_count, bar_diameter, w_total, code='ACI', fy=None):
+    """
+    Same flexure check as analyze_normal_beam for many beams at once.
+    Units as the dict API: width/depth/cover in cm, length in m, fc/fy in MPa,
+    w_total in kN/m. Scalars broadcast against arrays.
+    Returns dict of arrays: As, a, jd, d, Mn (capacity), Mu (demand),
+    utilization = Mu/Mn, safe (bool) and valid (rows with usable input).
+    """
+    fc, b, h, L, cover_cm, n, dia, w = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (fc, width, depth, length, cover, bar_count, bar_diameter, w_total))
+    )
+
+    params = get_code_parameters(code)
+    phi = params['phi']
+    fy = np.asarray(params['fy'] if fy is None else fy, dtype=float)
+
+    # نفس شرط الـ dict API: أي قيمة صفر أو ناقصة = مدخلات غير صالحة
+    valid = (fc != 0) & (b != 0) & (h != 0) & (L != 0) & (n != 0) & (dia != 0)
+    valid &= ~np.isnan(fc + b + h + L + n + dia + cover_cm + w)
+
+    b_mm = b * 10
+    d = h * 10 - cover_cm * 10
+    As = (3.1416 / 4) * (dia ** 2) * n
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = As * fy / (0.85 * fc * b_mm)
+        jd = d - a / 2
+        Mn = phi * (As * fy * jd) / 1e6
+        Mu = w * (L ** 2) / 8
+        utilization = Mu / Mn
+
+    return {
+        "As": As,
+        "a": a,
+        "jd": jd,
+        "d": d,
+        "Mn": Mn,
+        "Mu": Mu,
+        "utilization": utilization,
+        "safe": valid & (Mu <= Mn),
+        "valid": valid,
+        "phi": phi,
+    }
+
+
 def analyze_normal_beam(data, code='ACI'):
     fc = data.get('fc')
     b = data.get('width')
@@ -48,25 +99,17 @@ def analyze_normal_beam(data, code='ACI'):
     if not all([fc, b, h, L, rebar.get('count'), rebar.get('diameter')]):
         return {"status": "error", "message": "Missing required beam input values."}
 
-    b_mm = b * 10
-    h_mm = h * 10
-    cover_mm = cover_cm * 10
-    d = h_mm - cover_mm
-
-    dia = rebar.get('diameter')
-    n = rebar.get('count')
-    As = (3.1416 / 4) * (dia ** 2) * n
-
-    params = get_code_parameters(code)
-    phi = params['phi']
-    fy = data.get('fy', params['fy'])
-
-    a = As * fy / (0.85 * fc * b_mm)
-    jd = d - a / 2
-    Mn = phi * (As * fy * jd) / 1e6
-
     w_total = sum(float(loads.get(key, 0)) for key in ['dead', 'live', 'wind', 'snow'])
-    Mu = w_total * (L ** 2) / 8
+
+    res = analyze_normal_beams(
+        fc, b, h, L, cover_cm, rebar.get('count'), rebar.get('diameter'), w_total,
+        code=code, fy=data.get('fy'),
+    )
+    As = float(res["As"])
+    Mn = float(res["Mn"])
+    Mu = float(res["Mu"])
+    d = float(res["d"])
+    phi = res["phi"]
 
     status = "safe" if Mu <= Mn else "unsafe"
     recommendations = []
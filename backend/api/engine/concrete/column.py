@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def analyze_concrete_column(data, code='ACI'):
     col_type = data.get('type', 'Rectangular')
 
@@ -34,6 +37,49 @@ def get_code_parameters(code):
         return {'phi': 0.65, 'fy': 420}
 
 
+# ================================
+# Vectorized rectangular column check (columnar arrays, one row per column)
+# ================================
+def analyze_rectangular_columns(b, h, fc, bar_count, bar_diameter, Pu, code='ACI', fy=None):
+    """
+    Same axial check as analyze_rectangular_column for many columns at once.
+    b/h in cm, fc/fy in MPa, bar diameter in mm, Pu in kN. fy of 0/NaN (or None)
+    falls back to the code default, like the dict API.
+    Returns dict of arrays: As_cm2, Ag_cm2, Pn, capacity (phi*Pn), Pu,
+    utilization, safe and status ("safe"/"unsafe").
+    """
+    b, h, fc, n, dia, Pu = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (b, h, fc, bar_count, bar_diameter, Pu))
+    )
+
+    params = get_code_parameters(code)
+    phi = params['phi']
+    fy = np.asarray(params['fy'] if fy is None else fy, dtype=float)
+    fy = np.where((fy == 0) | np.isnan(fy), params['fy'], fy)
+
+    As_cm2 = (3.1416 / 4) * (dia ** 2) * n / 100.0
+    Ag_cm2 = b * h
+
+    Pn = (0.85 * fc * (Ag_cm2 - As_cm2) + fy * As_cm2) / 1000
+    capacity = phi * Pn
+    safe = Pu <= capacity
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        utilization = Pu / capacity
+
+    return {
+        "As_cm2": As_cm2,
+        "Ag_cm2": Ag_cm2,
+        "Pn": Pn,
+        "capacity": capacity,
+        "Pu": Pu,
+        "utilization": utilization,
+        "safe": safe,
+        "status": np.where(safe, "safe", "unsafe"),
+        "phi": phi,
+    }
+
+
 def analyze_rectangular_column(data, code='ACI'):
     b = data['geometry']['b']
     h = data['geometry']['h']
@@ -43,18 +89,16 @@ def analyze_rectangular_column(data, code='ACI'):
     dia = data['reinforcement']['barDiameter']
     Pu = data['loads'].get('axial', 0)
 
-    As = (3.1416 / 4) * (dia ** 2) * n_bars
-    As_cm2 = As / 100.0
-    Ag_cm2 = b * h
-
     params = get_code_parameters(code)
-    phi = params['phi']
     fy = fy or params['fy']
 
-    Pn = 0.85 * fc * (Ag_cm2 - As_cm2) + fy * As_cm2
-    Pn = Pn / 1000
+    res = analyze_rectangular_columns(b, h, fc, n_bars, dia, Pu, code=code, fy=fy)
+    As_cm2 = float(res["As_cm2"])
+    Ag_cm2 = b * h
+    Pn = float(res["Pn"])
+    phi = res["phi"]
 
-    status = "safe" if Pu <= phi * Pn else "unsafe"
+    status = str(res["status"])
     recommendations = []
 
     if status == "unsafe":
@@ -1,3 +1,73 @@
+import numpy as np
+
+# ================================
+# Vectorized footing check (columnar arrays, one row per footing)
+# ================================
+SOIL_BEARING = {
+    'clay': 150,
+    'sand': 250,
+    'rock': 500
+}
+DEFAULT_BEARING = 200
+
+FOOTING_COVER_MM = 75
+FOOTING_COLUMN_SIZE = 0.4  # assume 40x40 cm square column
+
+# status_code = 1 * bearing_fail + 2 * punching_fail
+FOOTING_STATUSES = ("safe", "unsafe (bearing)", "unsafe (punching)", "unsafe (bearing + punching)")
+
+
+def allowable_bearing(soil_type):
+    """
+    q_allow (kN/m²) for a soil type name, or an array of them for a list.
+    """
+    if isinstance(soil_type, (list, tuple, np.ndarray)):
+        return np.array([allowable_bearing(t) for t in soil_type], dtype=float)
+    return SOIL_BEARING.get(str(soil_type).lower(), DEFAULT_BEARING)
+
+
+def analyze_concrete_footings(length, width, thickness, column_load, fc, q_allow, code='ACI'):
+    """
+    Bearing + punching check of analyze_concrete_footing for many footings.
+    length/width in m, thickness in cm, column_load in kN, fc in MPa,
+    q_allow in kN/m² (see allowable_bearing).
+    Returns dict of arrays: area, q_actual, punching_capacity, bearing_ok,
+    punching_ok, status_code (index into FOOTING_STATUSES), status, valid.
+    """
+    L, B, h_cm, P, fc, q_allow = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (length, width, thickness, column_load, fc, q_allow))
+    )
+
+    phi = get_code_parameters(code)['phi']
+
+    A = L * B
+    valid = A != 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        q_actual = P / A
+
+    # Punching shear check (simplified)
+    bo = 4 * FOOTING_COLUMN_SIZE  # perimeter in m
+    d = h_cm * 10 - FOOTING_COVER_MM  # mm
+    Vc = 0.17 * np.sqrt(fc) * bo * 1000 * d / 1000  # kN
+    punching_capacity = phi * Vc
+
+    bearing_ok = ~(q_actual > q_allow)
+    punching_ok = P <= punching_capacity
+    status_code = (~bearing_ok).astype(np.int8) + 2 * (~punching_ok).astype(np.int8)
+
+    return {
+        "area": A,
+        "q_actual": q_actual,
+        "punching_capacity": punching_capacity,
+        "bearing_ok": bearing_ok,
+        "punching_ok": punching_ok,
+        "status_code": status_code,
+        "status": np.array(FOOTING_STATUSES)[status_code],
+        "valid": valid,
+        "phi": phi,
+    }
+
+
 def analyze_concrete_footing(data, code='ACI'):
     """
     Analyze isolated rectangular footing under axial load.
@@ -24,7 +94,6 @@ def analyze_concrete_footing(data, code='ACI'):
         rebar_s = data.get('rebarSpacing')
         fc = data.get('fc', 25)
         fy = data.get('fy')  # Optional override
-        cover = 75  # mm
 
         # Get phi and fy from code
         params = get_code_parameters(code)
@@ -33,34 +102,21 @@ def analyze_concrete_footing(data, code='ACI'):
 
         # Soil type
         soil_type = data.get('soilType', 'sand')
-        q_allow = {
-            'clay': 150,
-            'sand': 250,
-            'rock': 500
-        }.get(str(soil_type).lower(), 200)
+        q_allow = allowable_bearing(soil_type)
 
         # Area & pressure
         A = L * B
         if A == 0:
             return {"error": "Footing area cannot be zero."}
-        q_actual = P / A
 
-        # Punching shear check (simplified)
-        col_size = 0.4  # assume 40x40 cm square column
-        bo = 4 * col_size  # perimeter in m
-        d = h_mm - cover  # mm
-        Vc = 0.17 * (fc ** 0.5) * bo * 1000 * d / 1000  # kN
-        punching_safe = P <= phi * Vc
+        res = analyze_concrete_footings(L, B, h_cm, P, fc, q_allow, code=code)
+        q_actual = float(res["q_actual"])
+        col_size = FOOTING_COLUMN_SIZE
+        d = h_mm - FOOTING_COVER_MM  # mm
+        punching_capacity = float(res["punching_capacity"])
 
         # Determine status
-        if q_actual > q_allow and not punching_safe:
-            status = "unsafe (bearing + punching)"
-        elif q_actual > q_allow:
-            status = "unsafe (bearing)"
-        elif not punching_safe:
-            status = "unsafe (punching)"
-        else:
-            status = "safe"
+        status = str(res["status"])
 
         # Recommendations
         recommendations = []
@@ -80,7 +136,7 @@ def analyze_concrete_footing(data, code='ACI'):
             "q_actual (kN/m²)": round(q_actual, 2),
             "q_allow (kN/m²)": q_allow,
             "axial_load (kN)": round(P, 2),
-            "punching_capacity (kN)": round(phi * Vc, 2),
+            "punching_capacity (kN)": round(punching_capacity, 2),
             "phi": phi,
             "status": status,
             "details": {
@@ -0,0 +1,316 @@
+import numpy as np
+
+from .beam import analyze_normal_beams, get_code_parameters as beam_code_parameters
+from .column import analyze_rectangular_columns, get_code_parameters as column_code_parameters
+from .slab_solid import analyze_solid_slabs
+from .slab_strip import SLAB_COVER_MM, slab_code_parameters
+from .slab_waffle import analyze_waffle_slabs
+
+# ================================
+# Rebar layout search (design mode)
+# ================================
+# كل عنصر × كل تركيبة (قطر × عدد) بتنحسب مرة وحدة كـ array (E, C)
+# وبعدين بنختار أقل حديد من التركيبات اللي بتحقق الأمان + شروط التباعد والنسب
+
+DEFAULT_TOP = 3
+
+BEAM_DIAMETERS = (10, 12, 14, 16, 18, 20, 22, 25, 28, 32)  # mm
+BEAM_COUNTS = tuple(range(2, 13))
+BEAM_RHO_MAX = 0.025
+
+COLUMN_DIAMETERS = (12, 14, 16, 18, 20, 22, 25, 28, 32)  # mm
+COLUMN_COUNTS = tuple(range(4, 21, 2))
+COLUMN_RHO_MIN = 0.01
+COLUMN_RHO_MAX = 0.08
+COLUMN_COVER_CM = 4
+
+SLAB_DIAMETERS = (8, 10, 12, 14, 16)  # mm
+SLAB_SPACINGS = tuple(range(100, 301, 25))  # mm
+SLAB_RHO_SHRINKAGE = 0.0018
+SLAB_MAX_SPACING = 450  # mm
+
+RIB_DIAMETERS = (10, 12, 14, 16, 18, 20)  # mm
+RIB_COUNTS = (1, 2, 3, 4)
+
+MIN_CLEAR_SPACING = 25  # mm
+
+
+def _grid(first, second):
+    """
+    All (first, second) pairs as two flat arrays, ordered by second then first.
+    """
+    s, f = np.meshgrid(second, first, indexing="ij")
+    return f.ravel().astype(float), s.ravel().astype(float)
+
+
+def _values(items, getter, default=np.nan):
+    out = []
+    for data in items:
+        try:
+            v = getter(data)
+        except (KeyError, TypeError, AttributeError):
+            v = None
+        out.append(default if v is None else v)
+    return np.array(out, dtype=float)
+
+
+def _loads(items, keys):
+    return _values(items, lambda d: sum(float(d.get('loads', {}).get(k, 0)) for k in keys))
+
+
+def _layer_clear_spacing(width_mm, cover_mm, n, dia):
+    """
+    Clear spacing of n bars in one layer; n = 1 -> room left beside the bar.
+    """
+    room = width_mm - 2 * cover_mm - n * dia
+    return np.where(n > 1, room / np.maximum(n - 1, 1), room)
+
+
+def _select(As, feasible, top, layouts, extra):
+    """
+    Per element: the `top` feasible layouts with the least steel.
+    layouts: callable(candidate index) -> input fragment for the element
+    extra: {output key: ((E, C) array, decimals)}
+    """
+    cost = np.where(feasible, As, np.inf)
+    order = np.argsort(cost, axis=1, kind="stable")
+    n_feasible = feasible.sum(axis=1)
+
+    results = []
+    for e in range(As.shape[0]):
+        options = []
+        seen = set()
+        for c in order[e][:n_feasible[e]].tolist():
+            layout = layouts(e, c)
+            key = repr(layout)
+            if key in seen:  # e.g. two grid spacings rounding to the same bar count
+                continue
+            seen.add(key)
+            option = {"layout": layout, "As (mm²)": round(float(As[e, c]), 2)}
+            for key, (values, decimals) in extra.items():
+                option[key] = round(float(values[e, c]), decimals)
+            options.append(option)
+            if len(options) == top:
+                break
+        results.append({
+            "status": "success" if options else "no_feasible_layout",
+            "candidates_checked": int(As.shape[1]),
+            "candidates_feasible": int(n_feasible[e]),
+            "options": options,
+        })
+    return results
+
+
+def _with_missing(valid, results, message):
+    """
+    Spread results of the valid rows back over all rows; invalid rows get an error.
+    """
+    it = iter(results)
+    return [next(it) if ok else {"status": "error", "message": message} for ok in valid.tolist()]
+
+
+# ================================
+# Beams (single layer of bottom bars)
+# ================================
+def design_beams(items, code='ACI', top=DEFAULT_TOP):
+    fc = _values(items, lambda d: d['fc'])
+    b = _values(items, lambda d: d['width'])
+    h = _values(items, lambda d: d['depth'])
+    L = _values(items, lambda d: d['length'])
+    cover = _values(items, lambda d: d.get('cover', 3))
+    w = _loads(items, ['dead', 'live', 'wind', 'snow'])
+    fy = _values(items, lambda d: d.get('fy'), beam_code_parameters(code)['fy'])
+
+    valid = np.isfinite(fc + b + h + L + cover + w) & (fc != 0) & (b != 0) & (h != 0) & (L != 0)
+    fc, b, h, L, cover, w, fy = (x[valid, None] for x in (fc, b, h, L, cover, w, fy))
+
+    dia, n = _grid(BEAM_DIAMETERS, BEAM_COUNTS)
+    res = analyze_normal_beams(fc, b, h, L, cover, n, dia, w, code=code, fy=fy)
+
+    b_mm = b * 10
+    d = res["d"]
+    As = res["As"]
+    As_min = np.maximum(0.25 * np.sqrt(fc) / fy, 1.4 / fy) * b_mm * d
+    clear = _layer_clear_spacing(b_mm, cover * 10, n, dia)
+
+    feasible = (
+        res["safe"]
+        & (clear >= np.maximum(MIN_CLEAR_SPACING, dia))
+        & (As >= As_min)
+        & (As <= BEAM_RHO_MAX * b_mm * d)
+    )
+
+    results = _select(
+        As, feasible, top,
+        lambda e, c: {"rebar": {"count": int(n[c]), "diameter": int(dia[c])}},
+        {"utilization": (res["utilization"], 3)},
+    )
+    return _with_missing(valid, results, "Missing required beam input values.")
+
+
+# ================================
+# Rectangular columns (bars spread around the perimeter)
+# ================================
+def design_columns(items, code='ACI', top=DEFAULT_TOP):
+    b = _values(items, lambda d: d['geometry']['b'])
+    h = _values(items, lambda d: d['geometry']['h'])
+    cover = _values(items, lambda d: d['geometry'].get('cover', COLUMN_COVER_CM))
+    fc = _values(items, lambda d: d['materials']['fc'])
+    fy = _values(items, lambda d: d['materials'].get('fy') or None, column_code_parameters(code)['fy'])
+    Pu = _values(items, lambda d: d['loads'].get('axial', 0))
+
+    valid = np.isfinite(b + h + cover + fc + Pu)
+    b, h, cover, fc, fy, Pu = (x[valid, None] for x in (b, h, cover, fc, fy, Pu))
+
+    dia, n = _grid(COLUMN_DIAMETERS, COLUMN_COUNTS)
+    res = analyze_rectangular_columns(b, h, fc, n, dia, Pu, code=code, fy=fy)
+
+    rho = res["As_cm2"] / res["Ag_cm2"]
+    perimeter_mm = 2 * ((b - 2 * cover) + (h - 2 * cover)) * 10
+    clear = perimeter_mm / n - dia
+
+    feasible = (
+        res["safe"]
+        & (rho >= COLUMN_RHO_MIN)
+        & (rho <= COLUMN_RHO_MAX)
+        & (clear >= np.maximum(40, 1.5 * dia))
+    )
+
+    results = _select(
+        res["As_cm2"] * 100, feasible, top,
+        lambda e, c: {"reinforcement": {"barCount": int(n[c]), "barDiameter": int(dia[c])}},
+        {"utilization": (res["utilization"], 3), "rho": (rho, 4)},
+    )
+    return _with_missing(valid, results, "Missing required column input values.")
+
+
+# ================================
+# Solid slabs (bottom bars by spacing over the slab width)
+# ================================
+def design_solid_slabs(items, code='ACI', top=DEFAULT_TOP):
+    L = _values(items, lambda d: d['length'])
+    B = _values(items, lambda d: d.get('width', 1))
+    h_cm = _values(items, lambda d: d['thickness'])
+    dead, live, wind, snow = (_loads(items, [k]) for k in ('dead', 'live', 'wind', 'snow'))
+    fy = _values(items, lambda d: d.get('fy'), slab_code_parameters(code)[1])
+
+    valid = np.isfinite(L + B + h_cm + dead + live + wind + snow)
+    L, B, h_cm, dead, live, wind, snow, fy = (
+        x[valid, None] for x in (L, B, h_cm, dead, live, wind, snow, fy)
+    )
+
+    dia, spacing = _grid(SLAB_DIAMETERS, SLAB_SPACINGS)
+    n = np.ceil(B * 1000 / spacing)
+    res = analyze_solid_slabs(L, B, h_cm, dead, live, wind, snow, dia, 0, n, code=code, fy=fy)
+
+    h_mm = h_cm * 10
+    As = res["As_bottom"]
+    feasible = (
+        res["safe"]
+        & res["valid"]
+        & (spacing <= np.minimum(3 * h_mm, SLAB_MAX_SPACING))
+        & (As >= SLAB_RHO_SHRINKAGE * B * 1000 * h_mm)
+    )
+
+    results = _select(
+        As, feasible, top,
+        lambda e, c: {
+            "barDiameter": int(dia[c]),
+            "bottomBarCount": int(n[e, c]),
+            "spacing (mm)": int(B[e, 0] * 1000 // n[e, c]),
+        },
+        {"utilization": (res["utilization"], 3)},
+    )
+    return _with_missing(valid, results, "Length and thickness are required.")
+
+
+# ================================
+# Waffle slabs (bottom bars per rib)
+# ================================
+def design_waffle_slabs(items, code='ACI', top=DEFAULT_TOP):
+    L = _values(items, lambda d: d['length'])
+    B = _values(items, lambda d: d.get('width', 1))
+    h_cm = _values(items, lambda d: d['thickness'])
+    rib_cm = _values(items, lambda d: d.get('waffle', {}).get('ribWidth', 15))
+    dead, live, wind, snow = (_loads(items, [k]) for k in ('dead', 'live', 'wind', 'snow'))
+    fy = _values(items, lambda d: d.get('fy'), slab_code_parameters(code)[1])
+
+    valid = np.isfinite(L + B + h_cm + rib_cm + dead + live + wind + snow)
+    L, B, h_cm, rib_cm, dead, live, wind, snow, fy = (
+        x[valid, None] for x in (L, B, h_cm, rib_cm, dead, live, wind, snow, fy)
+    )
+
+    dia, n = _grid(RIB_DIAMETERS, RIB_COUNTS)
+    res = analyze_waffle_slabs(L, B, h_cm, dead, live, wind, snow, dia, n, code=code, fy=fy)
+
+    rib_mm = rib_cm * 10
+    As = res["As_bottom"]
+    clear = _layer_clear_spacing(rib_mm, SLAB_COVER_MM, n, dia)
+    feasible = (
+        res["safe"]
+        & res["valid"]
+        & (clear >= np.where(n > 1, np.maximum(MIN_CLEAR_SPACING, dia), 0))
+        & (As >= SLAB_RHO_SHRINKAGE * rib_mm * h_cm * 10)
+    )
+
+    results = _select(
+        As, feasible, top,
+        lambda e, c: {"barDiameter": int(dia[c]), "bottomBarCount": int(n[c])},
+        {"utilization": (res["utilization"], 3)},
+    )
+    return _with_missing(valid, results, "Length and thickness are required.")
+
+
+# ================================
+# Project-wide entry point
+# ================================
+def _designer(element_type, data, code):
+    """
+    (design function, engine code) for one element, or (None, message).
+    """
+    if element_type == "beam":
+        if data.get('type', 'Normal') not in ('Normal', 'Inverted', 'Tee'):
+            return None, f"Rebar design not supported for beam type: {data.get('type')}"
+        return design_beams, code
+    if element_type == "column":
+        if data.get('type', 'Rectangular') != 'Rectangular':
+            return None, f"Rebar design not supported for column type: {data.get('type')}"
+        return design_columns, code
+    if element_type == "slab":
+        # slab engines read the code from the slab data, same as /analyze
+        slab_type = data.get("type", "solid")
+        if slab_type == "solid":
+            return design_solid_slabs, data.get("code", "ACI")
+        if slab_type == "waffle":
+            return design_waffle_slabs, data.get("code", "ACI")
+        return None, f"Rebar design not supported for slab type: {slab_type}"
+    return None, f"Rebar design not supported for element: {element_type}"
+
+
+def run_rebar_design(items: list, top: int = DEFAULT_TOP):
+    """
+    items: [(code, element, data), ...] from a whole project.
+    Elements are grouped by (designer, code) and each group is searched in one
+    vectorized pass. Returns one result per item in the same order.
+    """
+    results = [None] * len(items)
+    groups = {}
+
+    for i, (code, element_type, data) in enumerate(items):
+        if element_type == "slab" and "geometry" in data:
+            data = {**data, **data["geometry"]}
+        designer, engine_code = _designer(element_type, data, code)
+        if designer is None:
+            results[i] = {"status": "error", "element": element_type, "message": engine_code}
+            continue
+        groups.setdefault((designer, engine_code, element_type), []).append((i, data))
+
+    for (designer, engine_code, element_type), members in groups.items():
+        try:
+            designed = designer([data for _, data in members], engine_code, top)
+        except Exception as e:
+            designed = [{"status": "error", "message": str(e)}] * len(members)
+        for (i, _), result in zip(members, designed):
+            results[i] = {"element": element_type, **result}
+
+    return results
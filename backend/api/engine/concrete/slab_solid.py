@@ -1,4 +1,23 @@
-import math
+import numpy as np
+
+from .slab_strip import SLAB_COVER_MM, one_way_strip_check, slab_code_parameters
+
+
+# ================================
+# Vectorized solid slab check (columnar arrays, one row per slab)
+# ================================
+def analyze_solid_slabs(length, width, thickness, dead, live, wind, snow,
+                        bar_diameter, top_bar_count, bottom_bar_count, code="ACI", fy=None):
+    """
+    Columnar analyze_solid_slab: strip check arrays (see one_way_strip_check)
+    plus As_top.
+    """
+    res = one_way_strip_check(length, width, thickness, dead, live, wind, snow,
+                              bar_diameter, bottom_bar_count, code=code, fy=fy)
+    top_n, dia = np.broadcast_arrays(np.asarray(top_bar_count, dtype=float), np.asarray(bar_diameter, dtype=float))
+    res["As_top"] = top_n * (np.pi / 4) * dia ** 2
+    return res
+
 
 def analyze_solid_slab(data):
     """
@@ -16,23 +35,9 @@ def analyze_solid_slab(data):
             return {"error": "Length and thickness are required."}
 
         h = h_cm * 10  # mm
-        cover = 20     # mm
-        d = h - cover  # mm
+        d = h - SLAB_COVER_MM  # mm
 
-        phi_values = {
-            "ACI": 0.9, "Jordan": 0.9, "Saudi": 0.9, "UAE": 0.9,
-            "BS": 1.0, "Eurocode": 1.0, "CSA": 0.9,
-            "IS": 0.9, "Egypt": 0.9, "AS": 0.9, "Turkey": 1.0
-        }
-
-        fy_defaults = {
-            "ACI": 420, "Jordan": 420, "Saudi": 420, "UAE": 420,
-            "Egypt": 360, "Eurocode": 500, "BS": 460,
-            "CSA": 400, "IS": 415, "AS": 500, "Turkey": 500
-        }
-
-        phi = phi_values.get(code, 0.9)
-        fy = data.get("fy", fy_defaults.get(code, 420))
+        phi, fy = slab_code_parameters(code, data.get("fy"))
         fc = data.get("fc", 25)
 
         # الأحمال
@@ -41,28 +46,26 @@ def analyze_solid_slab(data):
         wind = float(loads.get("wind", 0))
         snow = float(loads.get("snow", 0))
 
-        LF = {"dead": 1.2, "live": 1.6, "wind": 1.0, "snow": 1.0}
-        wu = LF["dead"] * dead + LF["live"] * live + LF["wind"] * wind + LF["snow"] * snow
-        wu_total = wu * B
-
-        # العزم التصميمي
-        Mu = wu_total * (L ** 2) / 8
-        Mu_Nmm = Mu * 1e6
-        jd = d - (0.4 * d) / 2
-        As_required = Mu_Nmm / (phi * fy * jd)
-
         # التسليح المدخل
         dia = data.get("barDiameter")
         top_n = data.get("topBarCount")
         bot_n = data.get("bottomBarCount")
 
+        # bars may still be missing here (NaN rows); As_required is valid without them
+        res = analyze_solid_slabs(L, B, h_cm, dead, live, wind, snow, dia, top_n, bot_n, code=code, fy=fy)
+        if not res["valid"]:
+            return {"error": f"Effective depth or fy is zero (thickness must exceed the {SLAB_COVER_MM} mm cover)."}
+
         if None in [dia, top_n, bot_n]:
             return {"error": "Missing bar diameter or bar counts."}
 
-        As_top = top_n * (math.pi / 4) * dia ** 2
-        As_bot = bot_n * (math.pi / 4) * dia ** 2
+        wu_total = float(res["wu_total"])
+        Mu = float(res["Mu"])
+        As_required = float(res["As_required"])
+        As_top = float(res["As_top"])
+        As_bot = float(res["As_bottom"])
 
-        status = "safe" if As_bot >= As_required else "unsafe"
+        status = str(res["status"])
         ratio = round(As_required / As_bot, 2)
 
         recommendations = []
@@ -0,0 +1,87 @@
+import math
+
+import numpy as np
+
+# ================================
+# One-way slab strip check (shared by solid / hollow / waffle slabs)
+# ================================
+
+SLAB_PHI = {
+    "ACI": 0.9, "Jordan": 0.9, "Saudi": 0.9, "UAE": 0.9,
+    "BS": 1.0, "Eurocode": 1.0, "CSA": 0.9,
+    "IS": 0.9, "Egypt": 0.9, "AS": 0.9, "Turkey": 1.0
+}
+
+SLAB_FY_DEFAULTS = {
+    "ACI": 420, "Jordan": 420, "Saudi": 420, "UAE": 420,
+    "Egypt": 360, "Eurocode": 500, "BS": 460,
+    "CSA": 400, "IS": 415, "AS": 500, "Turkey": 500
+}
+
+SLAB_LOAD_FACTORS = {"dead": 1.2, "live": 1.6, "wind": 1.0, "snow": 1.0}
+
+SLAB_COVER_MM = 20
+
+# rows with a zero lever arm (thickness = cover) or fy = 0 can't be checked
+SLAB_STATUSES = ("safe", "unsafe", "invalid (zero effective depth or fy)")
+
+
+def slab_code_parameters(code, fy=None):
+    """
+    phi and fy for a slab check; fy=None means the code default.
+    """
+    phi = SLAB_PHI.get(code, 0.9)
+    if fy is None:
+        fy = SLAB_FY_DEFAULTS.get(code, 420)
+    return phi, fy
+
+
+def one_way_strip_check(length, width, thickness, dead, live, wind, snow,
+                        bar_diameter, bottom_bar_count, code="ACI", fy=None):
+    """
+    Simply supported strip (wL²/8) with jd ≈ 0.8d, for many slabs at once.
+    length/width in m, thickness in cm, loads in kN/m², bar diameter in mm.
+    Returns dict of arrays: d, wu_total, Mu, As_required, As_bottom,
+    utilization (As_required / As_bottom), safe, status_code (index into
+    SLAB_STATUSES), status and valid (rows where As_required is computable).
+    """
+    L, B, h_cm, dead, live, wind, snow, dia, bot_n = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in
+          (length, width, thickness, dead, live, wind, snow, bar_diameter, bottom_bar_count))
+    )
+
+    phi, fy = slab_code_parameters(code, fy)
+    fy = np.asarray(fy, dtype=float)
+    LF = SLAB_LOAD_FACTORS
+
+    d = h_cm * 10 - SLAB_COVER_MM  # mm
+
+    wu = LF["dead"] * dead + LF["live"] * live + LF["wind"] * wind + LF["snow"] * snow
+    wu_total = wu * B
+
+    Mu = wu_total * (L ** 2) / 8  # kN·m
+    jd = d - (0.4 * d) / 2
+    denom = phi * fy * jd
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        As_required = Mu * 1e6 / denom
+        As_bottom = bot_n * (math.pi / 4) * dia ** 2
+        utilization = As_required / As_bottom
+
+    valid = denom != 0
+    safe = valid & (As_bottom >= As_required)
+    status_code = np.where(valid, (~safe).astype(np.int8), 2)
+
+    return {
+        "d": d,
+        "wu_total": wu_total,
+        "Mu": Mu,
+        "As_required": As_required,
+        "As_bottom": As_bottom,
+        "utilization": utilization,
+        "safe": safe,
+        "status_code": status_code,
+        "status": np.array(SLAB_STATUSES)[status_code],
+        "valid": valid,
+        "phi": phi,
+    }
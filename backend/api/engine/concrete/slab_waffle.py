@@ -1,4 +1,17 @@
-import math
+from .slab_strip import SLAB_COVER_MM, one_way_strip_check, slab_code_parameters
+
+
+# ================================
+# Vectorized waffle slab check (columnar arrays, one row per slab)
+# ================================
+def analyze_waffle_slabs(length, width, thickness, dead, live, wind, snow,
+                         bar_diameter, bottom_bar_count, code="ACI", fy=None):
+    """
+    Columnar analyze_waffle_slab: per-rib strip check arrays (see one_way_strip_check).
+    """
+    return one_way_strip_check(length, width, thickness, dead, live, wind, snow,
+                               bar_diameter, bottom_bar_count, code=code, fy=fy)
+
 
 def analyze_waffle_slab(data):
     """
@@ -19,25 +32,12 @@ def analyze_waffle_slab(data):
             return {"error": "Length and thickness are required."}
 
         h = h_cm * 10  # mm
-        d = h - 20     # mm (cover assumed 20mm)
+        d = h - SLAB_COVER_MM  # mm
         rib_spacing = rib_spacing_cm / 100  # m
 
         fc = data.get("fc", 25)
 
-        phi_values = {
-            "ACI": 0.9, "Jordan": 0.9, "Saudi": 0.9, "UAE": 0.9,
-            "BS": 1.0, "Eurocode": 1.0, "CSA": 0.9,
-            "IS": 0.9, "Egypt": 0.9, "AS": 0.9, "Turkey": 1.0
-        }
-
-        fy_defaults = {
-            "ACI": 420, "Jordan": 420, "Saudi": 420, "UAE": 420,
-            "Egypt": 360, "Eurocode": 500, "BS": 460,
-            "CSA": 400, "IS": 415, "AS": 500, "Turkey": 500
-        }
-
-        phi = phi_values.get(code, 0.9)
-        fy = data.get("fy", fy_defaults.get(code, 420))
+        phi, fy = slab_code_parameters(code, data.get("fy"))
 
         # --- الأحمال ---
         loads = data.get("loads", {})
@@ -46,38 +46,23 @@ def analyze_waffle_slab(data):
         wind = float(loads.get("wind", 0))
         snow = float(loads.get("snow", 0))
 
-        LF = {
-            "dead": 1.2,
-            "live": 1.6,
-            "wind": 1.0,
-            "snow": 1.0
-        }
-
-        wu = (
-            LF["dead"] * dead +
-            LF["live"] * live +
-            LF["wind"] * wind +
-            LF["snow"] * snow
-        )  # kN/m²
-
-        wu_total = wu * B  # kN/m on 1m strip
-
-        # --- العزم التصميمي Mu ---
-        Mu = wu_total * (L ** 2) / 8  # kN·m
-        Mu_Nmm = Mu * 1e6
-
-        jd = d - (0.4 * d) / 2
-        As_required = Mu_Nmm / (phi * fy * jd)  # mm² per rib
-
         # --- المدخلات الخاصة بالتسليح ---
         dia = data.get("barDiameter")
         bot_n = data.get("bottomBarCount")
 
+        # bars may still be missing here (NaN rows); As_required is valid without them
+        res = analyze_waffle_slabs(L, B, h_cm, dead, live, wind, snow, dia, bot_n, code=code, fy=fy)
+        if not res["valid"]:
+            return {"error": f"Effective depth or fy is zero (thickness must exceed the {SLAB_COVER_MM} mm cover)."}
+
         if None in [dia, bot_n]:
             return {"error": "Missing bar diameter or bottom bar count."}
 
-        As_bot = bot_n * (math.pi / 4) * dia ** 2
-        status = "safe" if As_bot >= As_required else "unsafe"
+        wu_total = float(res["wu_total"])
+        Mu = float(res["Mu"])
+        As_required = float(res["As_required"])
+        As_bot = float(res["As_bottom"])
+        status = str(res["status"])
 
         recommendations = []
         if status == "unsafe":
@@ -1,3 +1,65 @@
+import numpy as np
+
+# ================================
+# Vectorized staircase check (columnar arrays, one row per flight)
+# ================================
+STAIR_STRIP_WIDTH_MM = 1000
+STAIR_COVER_MM = 25
+STAIR_BAR_COUNT = 4  # assumed number of bars
+
+# rows with fc = 0 have no concrete block depth and can't be checked
+STAIR_STATUSES = ("safe", "unsafe", "invalid (fc = 0)")
+
+
+def analyze_concrete_staircases(tread, riser, steps, thickness, bar_diameter, wu, fc=25, code='ACI', fy=None):
+    """
+    Inclined-slab check of analyze_concrete_staircase for many flights.
+    tread/riser/thickness in cm, bar diameter in mm, wu in kN/m² (unfactored
+    sum of dead + live + wind, like the dict API). fy of 0/NaN (or None)
+    falls back to the code default.
+    Returns dict of arrays: L, d, As, Mn, Mu, utilization, safe, status_code
+    (index into STAIR_STATUSES), status, valid.
+    """
+    tread, riser, n, h_cm, dia, wu, fc = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (tread, riser, steps, thickness, bar_diameter, wu, fc))
+    )
+
+    params = get_code_parameters(code)
+    phi = params['phi']
+    fy = np.asarray(params['fy'] if fy is None else fy, dtype=float)
+    fy = np.where((fy == 0) | np.isnan(fy), params['fy'], fy)
+
+    d = h_cm * 10 - STAIR_COVER_MM
+    L = np.sqrt((tread / 100) ** 2 + (riser / 100) ** 2) * n  # m
+
+    As = (3.1416 / 4) * (dia ** 2) * STAIR_BAR_COUNT  # mm²
+    valid = fc != 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = As * fy / (0.85 * fc * STAIR_STRIP_WIDTH_MM)
+        jd = d - a / 2
+        Mn = phi * (As * fy * jd) / 1e6  # kN·m
+        Mu = wu * (L ** 2) / 8  # kN·m (1m wide strip)
+        utilization = Mu / Mn
+
+    safe = valid & (Mu <= Mn)
+    status_code = np.where(valid, (~safe).astype(np.int8), 2)
+
+    return {
+        "L": L,
+        "d": d,
+        "As": As,
+        "Mn": Mn,
+        "Mu": Mu,
+        "utilization": utilization,
+        "safe": safe,
+        "status_code": status_code,
+        "status": np.array(STAIR_STATUSES)[status_code],
+        "valid": valid,
+        "phi": phi,
+    }
+
+
 def analyze_concrete_staircase(data, code='ACI'):
     """
     Analyzes a concrete staircase flight modeled as an inclined slab.
@@ -15,10 +77,8 @@ def analyze_concrete_staircase(data, code='ACI'):
             return {"error": "Missing geometry or reinforcement inputs (tread, riser, steps, thickness, or rebar)."}
 
         h = h_cm * 10                           # mm
-        b = 1000                                # mm strip width
-        cover = 25                              # mm
-        d = h - cover                           # effective depth
-        n_bars = 4                              # assumed number of bars
+        b = STAIR_STRIP_WIDTH_MM                # mm strip width
+        d = h - STAIR_COVER_MM                  # effective depth
 
         # Material properties
         fc = data.get('fc', 25)                # MPa
@@ -28,26 +88,21 @@ def analyze_concrete_staircase(data, code='ACI'):
         phi = params['phi']
         fy = fy or params['fy']
 
-        # Inclined slab length
-        tread_m = tread / 100
-        riser_m = riser / 100
-        L = ((tread_m ** 2 + riser_m ** 2) ** 0.5) * n  # m
-
-        # Steel area
-        As = (3.1416 / 4) * (dia ** 2) * n_bars         # mm²
-
-        # Capacity
-        a = As * fy / (0.85 * fc * b)
-        jd = d - a / 2
-        Mn = phi * (As * fy * jd) / 1e6                # kN·m
-
         # Loads
         loads = data.get('loads', {})
         wu = sum(float(loads.get(k, 0)) for k in ['dead', 'live', 'wind'])  # kN/m²
-        Mu = wu * (L ** 2) / 8                         # kN·m (1m wide strip)
+
+        res = analyze_concrete_staircases(tread, riser, n, h_cm, dia, wu, fc=fc, code=code, fy=fy)
+        if not res["valid"]:
+            return {"error": "Concrete strength fc must not be zero."}
+
+        L = float(res["L"])
+        As = float(res["As"])
+        Mn = float(res["Mn"])
+        Mu = float(res["Mu"])
 
         # Result
-        status = "safe" if Mu <= Mn else "unsafe"
+        status = str(res["status"])
 
         # Recommendations
         recommendations = []
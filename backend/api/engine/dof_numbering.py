@@ -0,0 +1,45 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+# ================================
+# Node / DOF numbering (bandwidth reduction)
+# ================================
+
+
+def rcm_node_order(n_nodes, n1, n2):
+    """
+    Reverse Cuthill-McKee ordering of the node connectivity graph.
+    Returns position[i] = new number of node i.
+    """
+    if n_nodes == 0 or len(n1) == 0:
+        return np.arange(n_nodes)
+
+    ones = np.ones(2 * len(n1))
+    adjacency = sparse.coo_matrix(
+        (ones, (np.concatenate([n1, n2]), np.concatenate([n2, n1]))), shape=(n_nodes, n_nodes)
+    ).tocsr()
+    perm = reverse_cuthill_mckee(adjacency, symmetric_mode=True)
+
+    position = np.empty(n_nodes, dtype=int)
+    position[perm] = np.arange(n_nodes)
+    return position
+
+
+def half_bandwidth(member_dofs):
+    """
+    Largest |i - j| over all coupled DOF pairs, member_dofs: (M, ndof per member).
+    """
+    if len(member_dofs) == 0:
+        return 0
+    return int((member_dofs.max(axis=1) - member_dofs.min(axis=1)).max())
+
+
+def member_dof_table(node_position, n1, n2, dofs_per_node):
+    """
+    (M, 2 * dofs_per_node) global DOF indices of each member for a given node numbering.
+    """
+    local = np.arange(dofs_per_node)
+    d1 = node_position[n1][:, None] * dofs_per_node + local
+    d2 = node_position[n2][:, None] * dofs_per_node + local
+    return np.hstack([d1, d2])
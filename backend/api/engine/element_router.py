@@ -0,0 +1,79 @@
+from .code_router import get_code_handler
+from .seismic_router import get_seismic_handler
+from .concrete.slab_solid import analyze_solid_slab
+from .concrete.slab_hollow import analyze_hollow_slab
+from .concrete.slab_waffle import analyze_waffle_slab
+from .concrete.beam import analyze_concrete_beam
+from .concrete.column import analyze_concrete_column
+from .concrete.footing import analyze_concrete_footing
+from .concrete.staircase import analyze_concrete_staircase
+
+
+# ================================
+# Single element analysis (sync, runs inside the compute executor)
+# ================================
+def run_element_analysis(code: str, element_type: str, data: dict, seismic_data: dict | None = None):
+    if element_type == "slab" and "geometry" in data:
+        geom = data.pop("geometry")
+        data = {**data, **geom}
+
+    try:
+        if element_type == "slab":
+            slab_type = data.get("type", "solid")
+            if slab_type == "solid":
+                structural = analyze_solid_slab(data)
+            elif slab_type == "hollow":
+                structural = analyze_hollow_slab(data)
+            elif slab_type == "waffle":
+                structural = analyze_waffle_slab(data)
+            else:
+                return {"status": "error", "message": f"Unsupported slab type: {slab_type}"}
+        elif element_type == "beam":
+            structural = analyze_concrete_beam(data, code)
+        elif element_type == "column":
+            structural = analyze_concrete_column(data, code)
+        elif element_type == "footing":
+            structural = analyze_concrete_footing(data, code)
+        elif element_type == "staircase":
+            structural = analyze_concrete_staircase(data)
+        else:
+            handler = get_code_handler(code)
+            if not handler:
+                return {"status": "error", "message": "Unsupported code"}
+            structural = handler.analyze(element_type, data)
+
+        seismic_result = None
+        if seismic_data:
+            seismic_handler = get_seismic_handler(code)
+            if seismic_handler:
+                seismic_result = seismic_handler.analyze(seismic_data)
+
+        return {
+            "status": "success",
+            "element": element_type,
+            "result": {
+                "structural": structural,
+                "seismic": seismic_result
+            }
+        }
+
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+# ================================
+# Batch element analysis (one executor job per chunk of elements)
+# ================================
+def run_element_batch(items: list):
+    """
+    items: [(code, element, data, seismic), ...]
+    Returns one result per item in the same order; a failing item gets an
+    error entry instead of failing the whole batch.
+    """
+    results = []
+    for code, element_type, data, seismic_data in items:
+        try:
+            results.append(run_element_analysis(code, element_type, data, seismic_data))
+        except Exception as e:
+            results.append({"status": "error", "message": str(e)})
+    return results
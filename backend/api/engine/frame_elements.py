@@ -0,0 +1,310 @@
+import numpy as np
+
+# ================================
+# Batched 2D frame element kernels
+# ================================
+# كل الدوال هنا بتشتغل على كل الأعضاء مرة وحدة (arrays of length M)
+
+
+def member_geometry(xy1, xy2):
+    """
+    Lengths and direction cosines for all members.
+    xy1, xy2: (M, 2) end coordinates -> L, c, s each (M,)
+    """
+    dx = xy2[:, 0] - xy1[:, 0]
+    dy = xy2[:, 1] - xy1[:, 1]
+    L = np.sqrt(dx**2 + dy**2)
+    return L, dx / L, dy / L
+
+
+def transformation_stack(c, s):
+    """
+    (M, 6, 6) global -> local rotation matrices.
+    """
+    T = np.zeros((len(c), 6, 6))
+    for k in (0, 3):
+        T[:, k, k] = c
+        T[:, k, k+1] = s
+        T[:, k+1, k] = -s
+        T[:, k+1, k+1] = c
+        T[:, k+2, k+2] = 1.0
+    return T
+
+
+def local_stiffness_stack(E, A, I, L):
+    """
+    (M, 6, 6) Euler-Bernoulli frame stiffness in local axes.
+    """
+    EA_L = E * A / L
+    EI = E * I
+    k1 = 12 * EI / L**3
+    k2 = 6 * EI / L**2
+    k3 = 4 * EI / L
+    k4 = 2 * EI / L
+
+    k = np.zeros((len(L), 6, 6))
+    k[:, 0, 0] = k[:, 3, 3] = EA_L
+    k[:, 0, 3] = k[:, 3, 0] = -EA_L
+    k[:, 1, 1] = k[:, 4, 4] = k1
+    k[:, 1, 4] = k[:, 4, 1] = -k1
+    k[:, 1, 2] = k[:, 2, 1] = k[:, 1, 5] = k[:, 5, 1] = k2
+    k[:, 2, 4] = k[:, 4, 2] = k[:, 4, 5] = k[:, 5, 4] = -k2
+    k[:, 2, 2] = k[:, 5, 5] = k3
+    k[:, 2, 5] = k[:, 5, 2] = k4
+    return k
+
+
+def consistent_mass_stack(m, L):
+    """
+    (M, 6, 6) consistent mass in local axes, m = mass per unit length.
+    """
+    mL = m * L
+    M = np.zeros((len(L), 6, 6))
+    M[:, 0, 0] = M[:, 3, 3] = mL / 3
+    M[:, 0, 3] = M[:, 3, 0] = mL / 6
+    _bending_mass(M, mL, L, (1, 2, 4, 5), 1.0)
+    return M
+
+
+def _bending_mass(M, mL, L, dofs, sign):
+    """
+    Adds the cubic-beam mass of one bending plane; dofs = (u1, r1, u2, r2).
+    sign = -1 for the x-z plane (rotation ry opposes duz/dx).
+    """
+    u1, r1, u2, r2 = dofs
+    c = mL / 420
+    M[:, u1, u1] += 156 * c
+    M[:, u2, u2] += 156 * c
+    M[:, u1, u2] += 54 * c
+    M[:, u2, u1] += 54 * c
+    M[:, r1, r1] += 4 * L**2 * c
+    M[:, r2, r2] += 4 * L**2 * c
+    M[:, r1, r2] -= 3 * L**2 * c
+    M[:, r2, r1] -= 3 * L**2 * c
+    for i, j, v in ((u1, r1, 22), (u1, r2, -13), (u2, r1, 13), (u2, r2, -22)):
+        M[:, i, j] += sign * v * L * c
+        M[:, j, i] += sign * v * L * c
+
+
+def to_global(T, k_local):
+    """
+    T^T k T for every member at once (any DOFs per member).
+    """
+    return np.matmul(np.swapaxes(T, 1, 2), np.matmul(k_local, T))
+
+
+def uniform_load_fef(w, L):
+    """
+    (K, 6) fixed-end forces in local axes for uniform loads w on spans L.
+    """
+    f = np.zeros((len(w), 6))
+    f[:, 1] = f[:, 4] = w * L / 2
+    f[:, 2] = w * L**2 / 12
+    f[:, 5] = -w * L**2 / 12
+    return f
+
+
+def geometric_stiffness_unit(L):
+    """
+    (M, 6, 6) consistent geometric stiffness per unit axial force (tension
+    positive): k_G = N * geometric_stiffness_unit(L).
+    """
+    return _bending_geometric(np.zeros((len(L), 6, 6)), L, (1, 2, 4, 5), 1.0)
+
+
+def _bending_geometric(G, L, dofs, sign):
+    """
+    Adds the bending-plane terms of k_G / N on dofs (v1, θ1, v2, θ2); sign = -1
+    for the x-z plane, where θ = -dw/dx.
+    """
+    v1, t1, v2, t2 = dofs
+    c = 1 / (30 * L)
+    terms = (
+        (v1, v1, 36), (v2, v2, 36), (v1, v2, -36),
+        (t1, t1, 4 * L**2), (t2, t2, 4 * L**2), (t1, t2, -L**2),
+        (v1, t1, 3 * L * sign), (v1, t2, 3 * L * sign), (v2, t1, -3 * L * sign), (v2, t2, -3 * L * sign),
+    )
+    for i, j, value in terms:
+        G[:, i, j] = G[:, j, i] = c * value
+    return G
+
+
+def end_forces(T, k_local, u_elem):
+    """
+    Local end forces for element displacements u_elem (M, 6) or (M, 6, n).
+    """
+    u_local = np.einsum("mij,mj...->mi...", T, u_elem)
+    return np.einsum("mij,mj...->mi...", k_local, u_local)
+
+
+# ================================
+# Batched 3D (space) frame element kernels
+# ================================
+# DOFs per node: ux, uy, uz, rx, ry, rz -> 12 per member
+# local x على طول العضو، local z باتجاه الـ orientation vector (افتراضياً global Z)
+# عشان نموذج 2D بالمستوى XY يطلع نفس نتائج الـ 2D analyzer
+
+GLOBAL_Y = np.array([0.0, 1.0, 0.0])
+GLOBAL_Z = np.array([0.0, 0.0, 1.0])
+
+PARALLEL_TOLERANCE = 1e-9
+
+
+def space_member_axes(p1, p2, orientation=None):
+    """
+    Lengths and local axes for all members.
+    p1, p2: (M, 3) end coordinates; orientation: (M, 3) vectors in the local x-z plane
+    (default global Z). Members parallel to the default get local y = global Y.
+    -> L (M,), R (M, 3, 3) with rows = local x, y, z in global components.
+    """
+    d = p2 - p1
+    L = np.linalg.norm(d, axis=1)
+    x = d / L[:, None]
+
+    if orientation is None:
+        orientation = np.broadcast_to(GLOBAL_Z, x.shape)
+    y = np.cross(orientation, x)
+    norm = np.linalg.norm(y, axis=1)
+
+    parallel = norm <= PARALLEL_TOLERANCE * np.linalg.norm(orientation, axis=1)
+    if parallel.any():
+        if not np.allclose(orientation[parallel], GLOBAL_Z):
+            raise ValueError("Member orientation vector is parallel to the member axis")
+        y[parallel] = GLOBAL_Y
+        norm[parallel] = 1.0
+    y /= norm[:, None]
+    z = np.cross(x, y)
+
+    return L, np.stack([x, y, z], axis=1)
+
+
+def space_transformation_stack(R):
+    """
+    (M, 12, 12) global -> local rotation matrices from the (M, 3, 3) member axes.
+    """
+    T = np.zeros((len(R), 12, 12))
+    for k in range(0, 12, 3):
+        T[:, k:k+3, k:k+3] = R
+    return T
+
+
+def space_local_stiffness_stack(E, G, A, Iy, Iz, J, L):
+    """
+    (M, 12, 12) Euler-Bernoulli space frame stiffness in local axes:
+    axial (EA), torsion (GJ), bending in x-y (EIz) and in x-z (EIy).
+    """
+    k = np.zeros((len(L), 12, 12))
+
+    EA_L = E * A / L
+    GJ_L = G * J / L
+    for i, j, v in ((0, 6, EA_L), (3, 9, GJ_L)):
+        k[:, i, i] = k[:, j, j] = v
+        k[:, i, j] = k[:, j, i] = -v
+
+    # (translation, rotation) DOFs of each bending plane and the sign of the coupling
+    for (u1, r1, u2, r2), EI, sign in (((1, 5, 7, 11), E * Iz, 1.0), ((2, 4, 8, 10), E * Iy, -1.0)):
+        k1 = 12 * EI / L**3
+        k2 = sign * 6 * EI / L**2
+        k[:, u1, u1] = k[:, u2, u2] = k1
+        k[:, u1, u2] = k[:, u2, u1] = -k1
+        k[:, u1, r1] = k[:, r1, u1] = k[:, u1, r2] = k[:, r2, u1] = k2
+        k[:, r1, u2] = k[:, u2, r1] = k[:, u2, r2] = k[:, r2, u2] = -k2
+        k[:, r1, r1] = k[:, r2, r2] = 4 * EI / L
+        k[:, r1, r2] = k[:, r2, r1] = 2 * EI / L
+    return k
+
+
+def space_uniform_load_fef(wy, wz, L):
+    """
+    (K, 12) fixed-end forces in local axes for uniform loads wy, wz (local y / z) on spans L.
+    """
+    f = np.zeros((len(L), 12))
+    f[:, 1] = f[:, 7] = wy * L / 2
+    f[:, 5] = wy * L**2 / 12
+    f[:, 11] = -wy * L**2 / 12
+    f[:, 2] = f[:, 8] = wz * L / 2
+    f[:, 4] = -wz * L**2 / 12
+    f[:, 10] = wz * L**2 / 12
+    return f
+
+
+def space_geometric_stiffness_unit(L):
+    """
+    (M, 12, 12) geometric stiffness per unit axial force for both bending planes
+    (the torsional / Wagner terms are left out).
+    """
+    G = np.zeros((len(L), 12, 12))
+    _bending_geometric(G, L, (1, 5, 7, 11), 1.0)
+    _bending_geometric(G, L, (2, 4, 8, 10), -1.0)
+    return G
+
+
+def space_consistent_mass_stack(m, r2, L):
+    """
+    (M, 12, 12) consistent mass in local axes; m = mass per unit length,
+    r2 = polar radius of gyration squared (Iy + Iz) / A for the torsional inertia.
+    """
+    mL = m * L
+    M = np.zeros((len(L), 12, 12))
+    for i, j, v in ((0, 6, mL), (3, 9, mL * r2)):
+        M[:, i, i] = M[:, j, j] = v / 3
+        M[:, i, j] = M[:, j, i] = v / 6
+    _bending_mass(M, mL, L, (1, 5, 7, 11), 1.0)
+    _bending_mass(M, mL, L, (2, 4, 8, 10), -1.0)
+    return M
+
+
+# ================================
+# Section forces / deflections at stations along the members
+# ================================
+# x = ξ L من الطرف 1؛ N موجب شد، V = dM/dx، M (2D / Mz) موجب sagging
+
+def station_forces(f1, w, L, xi):
+    """
+    (M, 3, S, n) section forces N, V, M at stations xi (S,) fractions of L,
+    from end-1 local forces f1 (M, 3, n) with the member loads included and
+    uniform loads w (M, n) along local y.
+    """
+    x = L[:, None, None] * xi[None, :, None]
+    N1, V1, M1 = (f1[:, k, None, :] for k in range(3))
+    w = w[:, None, :]
+    return np.stack([
+        np.broadcast_to(-N1, x.shape[:2] + N1.shape[2:]),
+        V1 + w * x,
+        -M1 + V1 * x + w * x**2 / 2,
+    ], axis=1)
+
+
+def space_station_forces(f1, wy, wz, L, xi):
+    """
+    (M, 6, S, n) section forces N, Vy, Vz, T, My, Mz at stations from end-1 local
+    forces f1 (M, 6, n) (member loads included) and uniform loads wy, wz (M, n);
+    T and My are the right-hand moments on the section, Vz = -dMy/dx.
+    """
+    x = L[:, None, None] * xi[None, :, None]
+    N1, Vy1, Vz1, T1, My1, Mz1 = (f1[:, k, None, :] for k in range(6))
+    wy, wz = wy[:, None, :], wz[:, None, :]
+    shape = x.shape[:2] + N1.shape[2:]
+    return np.stack([
+        np.broadcast_to(-N1, shape),
+        Vy1 + wy * x,
+        Vz1 + wz * x,
+        np.broadcast_to(-T1, shape),
+        -My1 - Vz1 * x - wz * x**2 / 2,
+        -Mz1 + Vy1 * x + wy * x**2 / 2,
+    ], axis=1)
+
+
+def station_deflections(v, w, EI, L, xi):
+    """
+    (M, S, n) transverse displacement (local axes) at stations: Hermite interpolation
+    of the local end displacements v (M, 4, n) = (v1, θ1, v2, θ2) in the bending
+    plane plus the fixed-end solution of the uniform load w (M, n).
+    """
+    xi = xi[None, :, None]
+    L = L[:, None, None]
+    v1, t1, v2, t2 = (v[:, k, None, :] for k in range(4))
+    ends = (1 - 3 * xi**2 + 2 * xi**3) * v1 + (3 * xi**2 - 2 * xi**3) * v2
+    rotations = L * (xi - 2 * xi**2 + xi**3) * t1 + L * (xi**3 - xi**2) * t2
+    load = w[:, None, :] * L**4 * xi**2 * (1 - xi)**2 / (24 * EI[:, None, None])
+    return ends + rotations + load
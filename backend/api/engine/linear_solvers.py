@@ -0,0 +1,89 @@
+import numpy as np
+from scipy.linalg import (
+    LinAlgError,
+    cho_factor,
+    cho_solve,
+    cho_solve_banded,
+    cholesky_banded,
+    lu_factor,
+    lu_solve,
+)
+from scipy.sparse.linalg import splu
+
+# ================================
+# Factorizations for the reduced stiffness Kff
+# ================================
+# كل دالة بترجع solve(b) تشتغل على vector أو block of vectors
+
+
+def factorize_dense(Kff):
+    try:
+        cho = cho_factor(Kff)
+        return lambda b: cho_solve(cho, b)
+    except LinAlgError:
+        # not positive definite -> fall back to LU, still factorized once
+        lu = lu_factor(Kff)
+        if np.any(np.diag(lu[0]) == 0):
+            raise LinAlgError("Singular stiffness matrix")
+        return lambda b: lu_solve(lu, b)
+
+
+def factorize_sparse(Kff):
+    # SuperLU on CSC (scipy has no sparse Cholesky); Kff is symmetric, so a minimum
+    # degree ordering of Aᵀ+A gives about half the fill of the default COLAMD
+    # (matters most for 3D frames: ~2x faster factorization)
+    lu = splu(Kff.tocsc(), permc_spec="MMD_AT_PLUS_A")
+    return lu.solve
+
+
+def factorize_banded(Kff, bandwidth):
+    """
+    Banded Cholesky on the upper profile of a (reordered) sparse Kff.
+    Storage is n x (bandwidth + 1) instead of n x n.
+    """
+    ab = to_upper_banded(Kff, bandwidth)
+    try:
+        cb = cholesky_banded(ab)
+    except LinAlgError:
+        return factorize_sparse(Kff)
+    return lambda b: cho_solve_banded((cb, False), b)
+
+
+def to_upper_banded(K, bandwidth):
+    """
+    Upper banded storage ab[u + i - j, j] = K[i, j] for i <= j <= i + u.
+    """
+    coo = K.tocoo()
+    upper = coo.row <= coo.col
+    rows, cols, vals = coo.row[upper], coo.col[upper], coo.data[upper]
+
+    ab = np.zeros((bandwidth + 1, K.shape[0]))
+    np.add.at(ab, (bandwidth + rows - cols, cols), vals)
+    return ab
+
+
+def woodbury_update(solve, n, idx, D):
+    """
+    Solver for (K + P D Pᵀ) from a solver for the n x n K, where P selects the rows idx
+    and D (s x s) is the stiffness change on those DOFs (Sherman-Morrison-Woodbury):
+    (K + P D Pᵀ)⁻¹ b = x - Z (I + D Z_S)⁻¹ D x_S, x = K⁻¹ b, Z = K⁻¹ P.
+    D may be singular (element stiffness changes usually are).
+    """
+    n_idx = len(idx)
+    if n_idx == 0:
+        return solve
+
+    E = np.zeros((n, n_idx))
+    E[idx, np.arange(n_idx)] = 1.0
+    Z = solve(E)
+
+    C = np.eye(n_idx) + D @ Z[idx]
+    lu = lu_factor(C)
+    if np.any(np.diag(lu[0]) == 0):
+        raise LinAlgError("Singular stiffness after update")
+
+    def updated(b):
+        x = solve(b)
+        return x - Z @ lu_solve(lu, D @ x[idx])
+
+    return updated
@@ -1,3 +1,7 @@
+import itertools
+
+from .combination_engine import parse_combination
+
 # ================================
 # Load Combination Generator
 # ================================
@@ -20,35 +24,207 @@ def combine_loads(loads: dict, factors: dict) -> float:
     )
 
 
-def generate_combinations(code: str):
+# ================================
+# Ultimate combinations per code
+# ================================
+# templates بأسماء العائلات (D, L, Lr, S, W, E)؛ كل template بيتوسّع حسب الـ cases
+# الموجودة بالموديل: اتجاهات الريح والزلزال (±) والـ live-load patterns.
+# case names: "<family>" or "<family>_<suffix>" (D_2, W_X, E_Y ...); several
+# cases of D / L / Lr / S add up, several W or E cases are alternative directions.
+# the first term after D is the template's leading action: a template is skipped
+# when the model doesn't have it, companion terms the model doesn't have are dropped.
+# aliases: families a code combines with another one (roof live / snow as imposed load)
+
+ASCE7_COMBINATIONS = {  # ASCE 7-16 §2.3.1 (ACI 318 / AISC LRFD / SBC 301)
+    "templates": [
+        "1.4D",
+        "1.2D+1.6L+0.5Lr", "1.2D+1.6L+0.5S",
+        "1.2D+1.6Lr+1.0L", "1.2D+1.6S+1.0L", "1.2D+1.6Lr+0.5W", "1.2D+1.6S+0.5W",
+        "1.2D+1.0W+1.0L+0.5Lr", "1.2D+1.0W+1.0L+0.5S",
+        "1.2D+1.0E+1.0L+0.2S",
+        "0.9D+1.0W", "0.9D+1.0E",
+    ],
+    "aliases": {},
+}
+
+CODE_COMBINATIONS = {
+    "ACI": ASCE7_COMBINATIONS,
+    "JORDAN": ASCE7_COMBINATIONS,
+    "SAUDI": ASCE7_COMBINATIONS,
+    "UAE": ASCE7_COMBINATIONS,
+    "BS": {  # BS 8110-1 Table 2.1 (seismic per EN 1998 with ψ2 = 0.3)
+        "templates": [
+            "1.4D", "1.4D+1.6L", "1.0D+1.6L",
+            "1.4D+1.4W", "1.0D+1.4W", "1.2D+1.2W+1.2L",
+            "1.0D+1.0E+0.3L",
+        ],
+        "aliases": {"Lr": "L", "S": "L"},
+    },
+    "EUROCODE": {  # EN 1990 eq. 6.10 (leading variable action + ψ0 companions), 6.12b seismic
+        "templates": [
+            "1.35D",
+            "1.35D+1.5L+1.5psi0S", "1.35D+1.5S+1.5psi0L",
+            "1.35D+1.5L+1.5psi0S+1.5psi0W",
+            "1.35D+1.5S+1.5psi0L+1.5psi0W",
+            "1.35D+1.5W+1.5psi0L+1.5psi0S",
+            "1.0D+1.5W",
+            "1.0D+1.0E+psi2L+psi2S",
+        ],
+        "aliases": {"Lr": "L"},
+    },
+    "EGYPT": {  # ECP 203 §3.2.1
+        "templates": [
+            "1.5D", "1.4D+1.6L",
+            "1.12D+1.28W+1.28L", "0.9D+1.3W",
+            "1.12D+1.0E+0.5L", "0.9D+1.0E",
+        ],
+        "aliases": {"Lr": "L", "S": "L"},
+    },
+    "IS": {  # IS 456 Table 18 / IS 1893-1 §6.3
+        "templates": [
+            "1.5D", "1.5D+1.5L",
+            "1.5D+1.5W", "0.9D+1.5W", "1.2D+1.2W+1.2L",
+            "1.5D+1.5E", "0.9D+1.5E", "1.2D+1.2E+1.2L",
+        ],
+        "aliases": {"Lr": "L", "S": "L"},
+    },
+    "AS": {  # AS/NZS 1170.0 §4.2.2 (ψc = 0.4, ψE = 0.3)
+        "templates": [
+            "1.35D", "1.2D+1.5L",
+            "1.2D+1.0W+0.4L", "0.9D+1.0W",
+            "1.2D+1.0S+0.4L",
+            "1.0D+1.0E+0.3L",
+        ],
+        "aliases": {"Lr": "L"},
+    },
+    "CSA": {  # NBCC 2015 Table 4.1.3.2-A
+        "templates": [
+            "1.4D",
+            "1.25D+1.5L+0.5S", "1.25D+1.5L+0.4W", "0.9D+1.5L",
+            "1.25D+1.5S+0.5L", "1.25D+1.5S+0.4W",
+            "1.25D+1.4W+0.5L", "1.25D+1.4W+0.5S", "0.9D+1.4W",
+            "1.0D+1.0E+0.5L+0.25S", "0.9D+1.0E",
+        ],
+        "aliases": {"Lr": "L"},
+    },
+    "TURKEY": {  # TS 500 §6.2.6 / TBDY 2018 §4.4.4
+        "templates": [
+            "1.4D", "1.4D+1.6L",
+            "1.0D+1.3W+1.3L", "0.9D+1.3W",
+            "1.0D+1.0E+1.0L", "0.9D+1.0E",
+        ],
+        "aliases": {"Lr": "L", "S": "L"},
+    },
+}
+
+# cases assumed when the model's load cases aren't given
+DEFAULT_CASES = ("D", "L", "W", "E")
+
+# W / E cases are direction alternatives; E also takes 30% of the other directions
+LATERAL_FAMILIES = ("W", "E")
+ORTHOGONAL_FACTOR = 0.3
+
+
+def case_family(case: str, aliases=None):
+    family = case.split("_")[0]
+    return (aliases or {}).get(family, family)
+
+
+def _lateral_variants(family, directions, factor):
+    """
+    ({case: factor} alternatives) of one lateral term: ± every direction, and for
+    seismic 100% of one direction with ± ORTHOGONAL_FACTOR of each other one.
+    """
+    variants = []
+    for d in directions:
+        others = [o for o in directions if o != d] if family == "E" else []
+        for sign in (1.0, -1.0):
+            for signs in itertools.product((1.0, -1.0), repeat=len(others)):
+                terms = {d: sign * factor}
+                terms.update((o, s * ORTHOGONAL_FACTOR * factor) for o, s in zip(others, signs))
+                variants.append(terms)
+    return variants
+
+
+def _format_factor(factor):
+    text = f"{factor:+.4f}".rstrip("0")
+    return text + "0" if text.endswith(".") else text
+
+
+def _format_expr(terms):
+    expr = "".join(f"{_format_factor(factor)}{case}" for case, factor in terms.items())
+    return expr[1:] if expr.startswith("+") else expr
+
+
+def _expand_template(template, families, live_patterns, strict, psi=None):
+    """
+    {case: factor} combinations of one template. strict: None when its leading
+    action (first term after D) is missing from the model.
+    """
+    terms = parse_combination(template, psi)
+    leading = next((family for family in terms if family != "D"), None)
+    if strict and leading is not None and not families.get(leading):
+        return None
+
+    fixed, alternatives = {}, []
+    for family, factor in terms.items():
+        members = families.get(family, [])
+        if not members:
+            continue
+        if factor == 0:
+            continue
+        if family in LATERAL_FAMILIES:
+            alternatives.append(_lateral_variants(family, members, factor))
+        elif family == "L" and live_patterns and "L" in members:
+            # full live load, or a pattern in place of the L case itself
+            rest = {c: factor for c in members if c != "L"}
+            alternatives.append([{**rest, "L": factor}] + [{**rest, p: factor} for p in live_patterns])
+        else:
+            fixed.update((c, factor) for c in members)
+
+    expanded = []
+    for choice in itertools.product(*alternatives):
+        terms = dict(fixed)
+        for part in choice:
+            terms.update(part)
+        expanded.append(terms)
+    return expanded
+
+
+def generate_combinations(code: str, cases=None, live_patterns=(), psi=None):
     """
     بيرجع قائمة بالـ load combinations حسب الكود
     كل combo = {id, name, expr}
+    The code's templates are expanded over the model's cases (default D, L, W, E):
+    lateral direction / sign permutations and, for every term on L, the full live
+    load plus each live_patterns case (L_P1 ...). Companion terms on families the
+    model doesn't have are dropped and duplicate combinations removed.
+    psi: {case: [ψ0, ψ1, ψ2]} overrides for the ψ terms of the templates.
     """
-    code = code.upper()
-    combos = []
-
-    if code == "ACI":
-        combos = [
-            {"id": "LC1", "name": "1.4D", "expr": "1.4D"},
-            {"id": "LC2", "name": "1.2D+1.6L", "expr": "1.2D+1.6L"},
-            {"id": "LC3", "name": "1.2D+1.0L+1.0E", "expr": "1.2D+1.0L+1.0E"},
-            {"id": "LC4", "name": "0.9D+1.0E", "expr": "0.9D+1.0E"},
-        ]
-    elif code == "BS":
-        combos = [
-            {"id": "LC1", "name": "1.4D", "expr": "1.4D"},
-            {"id": "LC2", "name": "1.4D+1.6L", "expr": "1.4D+1.6L"},
-            {"id": "LC3", "name": "1.0D+1.0L+1.4W", "expr": "1.0D+1.0L+1.4W"},
-        ]
-    elif code == "EUROCODE":
-        combos = [
-            {"id": "LC1", "name": "1.35G+1.5Q", "expr": "1.35D+1.5L"},
-            {"id": "LC2", "name": "1.35G+1.5Q+1.5W", "expr": "1.35D+1.5L+1.5W"},
-            {"id": "LC3", "name": "0.9G+1.5E", "expr": "0.9D+1.5E"},
-        ]
-    else:
+    spec = CODE_COMBINATIONS.get(code.upper())
+    if spec is None:
         # Default (لو ما في كود معروف)
-        combos = [{"id": "LC1", "name": "1.0D", "expr": "1.0D"}]
+        return [{"id": "LC1", "name": "1.0D", "expr": "1.0D"}]
+
+    cases = list(DEFAULT_CASES if cases is None else cases)
+    aliases = spec["aliases"]
+    families = {}
+    for case in cases:
+        families.setdefault(case_family(case, aliases), []).append(case)
+
+    # templates led by an action the model doesn't have are skipped, unless
+    # that leaves nothing (e.g. a model without dead load)
+    expanded = [_expand_template(t, families, live_patterns, True, psi) for t in spec["templates"]]
+    if not any(expanded):
+        expanded = [_expand_template(t, families, live_patterns, False, psi) for t in spec["templates"]]
+
+    combos, seen = [], set()
+    for terms in itertools.chain.from_iterable(e for e in expanded if e):
+        key = tuple(sorted((c, round(f, 9)) for c, f in terms.items()))
+        if not terms or key in seen:
+            continue
+        seen.add(key)
+        expr = _format_expr(terms)
+        combos.append({"id": f"LC{len(combos) + 1}", "name": expr, "expr": expr})
 
     return combos
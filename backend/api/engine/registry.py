@@ -0,0 +1,72 @@
+import importlib
+import threading
+
+# ================================
+# Lazy handler registry (codes / seismic)
+# ================================
+
+class HandlerRegistry:
+    """
+    Case-insensitive name -> handler registry.
+    Handlers are registered as a class/factory or as a "module:Class" path
+    (relative to backend.api.engine, or absolute) and are only imported and
+    instantiated on first lookup; the instance is then cached and shared.
+    Path and module-level class registrations also reach the compute workers
+    (registrations()); other factories stay in the registering process.
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._instances = {}
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, handler):
+        key = name.upper()
+        with self._lock:
+            if self._factories.get(key) is handler or (
+                isinstance(handler, str) and self._factories.get(key) == handler
+            ):
+                return
+            self._factories[key] = handler
+            self._names[key] = name
+            self._instances.pop(key, None)
+
+    def get(self, name: str):
+        if not name:
+            return None
+        key = name.upper()
+
+        handler = self._instances.get(key)
+        if handler is not None:
+            return handler
+
+        with self._lock:
+            if key not in self._instances:
+                factory = self._factories.get(key)
+                if factory is None:
+                    return None
+                if isinstance(factory, str):
+                    module_path, class_name = factory.split(":")
+                    factory = getattr(importlib.import_module(module_path, package=__package__), class_name)
+                self._instances[key] = factory()
+            return self._instances[key]
+
+    def names(self):
+        return list(self._names.values())
+
+    def registrations(self):
+        """
+        [(name, handler)] of the registrations a worker process can rebuild:
+        "module:Class" paths and importable (module-level) classes.
+        """
+        with self._lock:
+            return [
+                (self._names[key], factory) for key, factory in self._factories.items()
+                if isinstance(factory, str)
+                or (isinstance(factory, type) and "<locals>" not in factory.__qualname__)
+            ]
+
+    def restore(self, registrations):
+        for name, handler in registrations:
+            self.register(name, handler)
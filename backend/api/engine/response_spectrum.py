@@ -0,0 +1,41 @@
+import numpy as np
+
+# ================================
+# Response spectrum (design spectrum shape + modal combination)
+# ================================
+GRAVITY = 9.81  # m/s²
+
+MODAL_COMBINATIONS = ("SRSS", "CQC")
+
+
+def design_spectrum(periods, Sds, TB, TC, TD):
+    """
+    Sa(T) in g, broadcasting over periods and spectrum parameters:
+    linear rise from 0.4 Sds to the plateau Sds at TB, Sds on [TB, TC],
+    Sds TC / T up to TD and Sds TC TD / T² beyond.
+    """
+    T = np.asarray(periods, dtype=float)
+    Tsafe = np.maximum(T, 1e-12)
+    return np.where(
+        T < TB, Sds * (0.4 + 0.6 * T / TB),
+        np.where(T <= TC, Sds, np.where(T <= TD, Sds * TC / Tsafe, Sds * TC * TD / Tsafe**2)),
+    )
+
+
+def cqc_correlation(omega, damping=0.05):
+    """
+    (n, n) CQC modal correlation coefficients (Der Kiureghian, equal damping).
+    """
+    beta = omega[None, :] / omega[:, None]
+    z = damping
+    return (8 * z**2 * (1 + beta) * beta**1.5) / ((1 - beta**2)**2 + 4 * z**2 * beta * (1 + beta)**2)
+
+
+def combine_modal(responses, combination="CQC", rho=None):
+    """
+    Peak responses from per-mode values, modes on the last axis:
+    SRSS = sqrt(Σ r²), CQC = sqrt(Σ_ij r_i ρ_ij r_j).
+    """
+    if combination == "SRSS" or rho is None:
+        return np.sqrt(np.sum(responses**2, axis=-1))
+    return np.sqrt(np.maximum(np.sum((responses @ rho) * responses, axis=-1), 0.0))
@@ -1,29 +1,61 @@
-from ..codes_seismic import (
-    JordanSeismic,
-    SaudiSeismic,
-    EgyptSeismic,
-    EurocodeSeismic,
-    UAESeismic,
-    TurkeySeismic,
-    ACISismic,
-    BSSeismic,
-    ASSeismic,
-    CSASeismic,
-    ISSeismic
-)
+import numpy as np
+
+from .registry import HandlerRegistry
+from ..utils.executor import register_worker_state
+
+_registry = HandlerRegistry()
+
+
+def register_seismic_handler(code_name: str, handler):
+    """
+    Plugin hook for new seismic codes (same rules as register_code_handler).
+    """
+    _registry.register(code_name, handler)
+
 
 def get_seismic_handler(code_name: str):
-    mapping = {
-        "Jordan": JordanSeismic(),
-        "Saudi": SaudiSeismic(),
-        "Egypt": EgyptSeismic(),
-        "Eurocode": EurocodeSeismic(),
-        "UAE": UAESeismic(),
-        "Turkey": TurkeySeismic(),
-        "ACI": ACISismic(),
-        "BS": BSSeismic(),
-        "AS": ASSeismic(),
-        "CSA": CSASeismic(),
-        "IS": ISSeismic()
-    }
-    return mapping.get(code_name)
+    return _registry.get(code_name)
+
+
+def available_seismic_codes():
+    return _registry.names()
+
+
+def _registrations():
+    return _registry.registrations()
+
+
+def _restore_registrations(registrations):
+    _registry.restore(registrations)
+
+
+register_worker_state("seismic_handlers", _registrations, _restore_registrations)
+
+
+register_seismic_handler("Jordan", "..codes_seismic:JordanSeismic")
+register_seismic_handler("Saudi", "..codes_seismic:SaudiSeismic")
+register_seismic_handler("Egypt", "..codes_seismic:EgyptSeismic")
+register_seismic_handler("Eurocode", "..codes_seismic:EurocodeSeismic")
+register_seismic_handler("UAE", "..codes_seismic:UAESeismic")
+register_seismic_handler("Turkey", "..codes_seismic:TurkeySeismic")
+register_seismic_handler("ACI", "..codes_seismic:ACISismic")
+register_seismic_handler("BS", "..codes_seismic:BSSeismic")
+register_seismic_handler("AS", "..codes_seismic:ASSeismic")
+register_seismic_handler("CSA", "..codes_seismic:CSASeismic")
+register_seismic_handler("IS", "..codes_seismic:ISSeismic")
+
+
+def run_spectrum_batch(code: str, cases: list, periods):
+    """
+    Design spectra of many seismic data cases (zone / soil / importance / R) for one code.
+    """
+    handler = get_seismic_handler(code)
+    periods = np.asarray(periods, dtype=float)
+    params = handler.parameter_rows(cases)
+    Sa = handler.spectrum_batch(periods, cases)
+
+    results = [
+        {"Sds": round(Sds, 5), "TB": TB, "TC": TC, "TD": TD, "Sa": np.round(row, 5).tolist()}
+        for (Sds, TB, TC, TD), row in zip(params.tolist(), Sa)
+    ]
+    return {"status": "success", "code": code, "periods": periods.tolist(), "count": len(results), "results": results}
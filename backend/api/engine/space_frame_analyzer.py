@@ -0,0 +1,171 @@
+import numpy as np
+
+from .frame_elements import (
+    end_forces,
+    space_consistent_mass_stack,
+    space_geometric_stiffness_unit,
+    space_local_stiffness_stack,
+    space_member_axes,
+    space_station_forces,
+    space_transformation_stack,
+    space_uniform_load_fef,
+    station_deflections,
+)
+from .steel.section_catalog import get_section_catalog
+from .response_spectrum import GRAVITY
+from .structure_analyzer import StructureAnalyzer
+
+# ================================
+# Space Frame Analyzer (3D, 6 DOFs per node)
+# ================================
+# نفس الـ assembly/solvers/combinations تبع الـ 2D analyzer، بس العنصر 12x12:
+# axial + torsion + bending حول المحورين. Y هو الاتجاه الرأسي زي الـ 2D.
+
+# Poisson's ratio when the material doesn't give G or nu (concrete)
+DEFAULT_POISSON = 0.2
+
+
+def rectangular_section_properties(bw, h):
+    """
+    A, Iy (weak), Iz (strong, bending in the local x-y plane) and the
+    Saint-Venant torsion constant J of a bw x h rectangle.
+    """
+    a, b = max(bw, h), min(bw, h)
+    beta = 1/3 - 0.21 * (b / a) * (1 - (b / a)**4 / 12)
+    return bw * h, h * bw**3 / 12.0, bw * h**3 / 12.0, beta * a * b**3
+
+
+def i_section_properties(h, b, tf, tw):
+    """
+    A, Iy, Iz, J of a doubly symmetric I section (thin-walled torsion).
+    """
+    hw = h - 2 * tf
+    A = 2 * b * tf + hw * tw
+    Iz = (b * h**3 - (b - tw) * hw**3) / 12.0
+    Iy = (2 * tf * b**3 + hw * tw**3) / 12.0
+    J = (2 * b * tf**3 + hw * tw**3) / 3.0
+    return A, Iy, Iz, J
+
+
+def space_section_properties(params: dict):
+    """
+    (A, Iy, Iz, J) in m units from Section.params: a steel catalog section
+    (sectionSize, optional sectionType) or a bw x h rectangle; explicit
+    A / Iy / Iz / J values always take precedence.
+    """
+    size = params.get("sectionSize")
+    if size:
+        section = get_section_catalog().get(size, params.get("sectionType"))
+        if section is None:
+            raise ValueError(f"Unknown steel section: {size}")
+        A, Iy, Iz, J = i_section_properties(*(section[k] / 1000.0 for k in ("h", "b", "tf", "tw")))
+        A = section["A"] * 1e-4  # catalog area is in cm²
+    else:
+        A, Iy, Iz, J = rectangular_section_properties(params["bw"], params["h"])
+
+    return tuple(float(params.get(k, v)) for k, v in (("A", A), ("Iy", Iy), ("Iz", Iz), ("J", J)))
+
+
+class SpaceFrameAnalyzer(StructureAnalyzer):
+    """
+    3D frame: nodes carry z (default 0), members an optional orientation vector
+    lying in their local x-z plane, member loads w (local y) and wz (local z).
+    """
+
+    DIMENSION = 3
+    DOFS_PER_NODE = 6
+    DISPLACEMENT_KEYS = ("ux", "uy", "uz", "rx", "ry", "rz")
+    REACTION_KEYS = ("Rx", "Ry", "Rz", "Mx", "My", "Mz")
+    SUPPORT_DOFS = {"fix": (0, 1, 2, 3, 4, 5), "pin": (0, 1, 2), "roller": (1,)}
+    TRANSLATIONAL_DOFS = (0, 1, 2)
+    DIRECTIONS = ("X", "Y", "Z")
+    # Vmax / Mmax keep the 2D meaning (strong-axis shear and moment) for the code handlers
+    MEMBER_FORCE_KEYS = ("Nmax", "Vmax", "Vz", "T", "My", "Mmax")
+    DEFLECTION_KEYS = ("dy", "dz")
+    DIAGRAM_KEYS = ("N", "Vy", "Vz", "T", "My", "Mz", "dy", "dz")
+
+    def _build_member_arrays(self):
+        xyz = np.array(
+            [[n["x"], n["y"], n.get("z", 0.0)] for n in self.nodes.values()], dtype=float
+        ).reshape(-1, 3)
+        n1, n2 = self._n1, self._n2
+
+        section_props = {sid: space_section_properties(sec["params"]) for sid, sec in self.sections.items()}
+        shear_moduli = {
+            mid: mat.get("G") or mat["E"] / (2 * (1 + (mat.get("nu") or DEFAULT_POISSON)))
+            for mid, mat in self.materials.items()
+        }
+
+        E, gamma = self._material_columns()
+        G = np.array([shear_moduli[m["materialId"]] for m in self.members], dtype=float)
+        A, Iy, Iz, J = np.array(
+            [section_props[m["sectionId"]] for m in self.members], dtype=float
+        ).reshape(-1, 4).T
+
+        orientation = None
+        if any(m.get("orientation") for m in self.members):
+            orientation = np.array(
+                [m.get("orientation") or (0.0, 0.0, 1.0) for m in self.members], dtype=float
+            ).reshape(-1, 3)
+
+        L, R = space_member_axes(xyz[n1], xyz[n2], orientation)
+        self.member_L = L
+        self.member_T = space_transformation_stack(R)
+        self.member_k_local = space_local_stiffness_stack(E, G, A, Iy, Iz, J, L)
+        self._member_EI = np.stack([E * Iz, E * Iy], axis=1)
+        self.member_mass = gamma * A / GRAVITY  # t/m
+        self._member_r2 = (Iy + Iz) / A
+
+        self._build_load_rows()
+        self._load_wz = np.array(
+            [load.get("wz", 0.0) for m in self.members for load in m.get("loads", [])], dtype=float
+        )
+
+    def _consistent_mass_local(self):
+        return space_consistent_mass_stack(self.member_mass, self._member_r2, self.member_L)
+
+    def _geometric_unit_local(self):
+        return space_geometric_stiffness_unit(self.member_L)
+
+    def _member_load_fef(self, scale):
+        return space_uniform_load_fef(
+            self._load_w * scale, self._load_wz * scale, self.member_L[self._load_member]
+        )
+
+    def _recover_case_forces(self, U):
+        """
+        End-1 local forces (N, Vy, Vz, T, My, Mz) for all members.
+        """
+        f_local = end_forces(self.member_T, self.member_k_local, U[self.member_dofs])
+        return f_local[:, :6]
+
+    def _member_loads(self, row_scales):
+        """
+        (M, 2, n) uniform loads wy, wz per member for load row scales (rows, n).
+        """
+        W = np.zeros((len(self.members), 2, row_scales.shape[1]))
+        np.add.at(W[:, 0], self._load_member, self._load_w[:, None] * row_scales)
+        np.add.at(W[:, 1], self._load_member, self._load_wz[:, None] * row_scales)
+        return W
+
+    def _station_values(self, U, W, members=slice(None), axial=None):
+        """
+        (Mb, 8, S, n) N, Vy, Vz, T, My, Mz, dy, dz at the stations of the members.
+        """
+        L = self.member_L[members]
+        u_local = np.einsum("mij,mj...->mi...", self.member_T[members], U[self.member_dofs[members]])
+        f1 = self._end1_forces(u_local, members, axial)
+        wy, wz = W[members, 0], W[members, 1]
+        Lc = L[:, None]
+        f1[:, 1] -= wy * Lc / 2
+        f1[:, 2] -= wz * Lc / 2
+        f1[:, 4] += wz * Lc**2 / 12
+        f1[:, 5] -= wy * Lc**2 / 12
+
+        forces = space_station_forces(f1, wy, wz, L, self.stations)
+        EI = self._member_EI[members]
+        dy = station_deflections(u_local[:, [1, 5, 7, 11]], wy, EI[:, 0], L, self.stations)
+        # bending in the x-z plane: θy = -dw/dx
+        v = u_local[:, [2, 4, 8, 10]] * np.array([1.0, -1.0, 1.0, -1.0])[:, None]
+        dz = station_deflections(v, wz, EI[:, 1], L, self.stations)
+        return np.concatenate([forces, dy[:, None], dz[:, None]], axis=1)
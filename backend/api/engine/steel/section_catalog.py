@@ -0,0 +1,202 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+# ================================
+# Steel section catalog (NumPy columns + name index)
+# ================================
+# الجدول محفوظ كـ structured array: ممكن نحفظه .npy ونفتحه memory-mapped
+# بدل ما نعمل parse للـ JSON كل مرة (مهم للكتالوجات الكبيرة IPE/HEA/HEB/W)
+#
+# STRUCTICODE_STEEL_CATALOG: optional path to a catalog file (.json or prebuilt .npy)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '../data')
+DEFAULT_JSON_PATH = os.path.join(DATA_DIR, 'steel_sections_data.json')
+DEFAULT_NPY_PATH = os.path.join(DATA_DIR, 'steel_sections_data.npy')
+
+PROPERTIES = ("h", "b", "tf", "tw", "A", "Zx", "r")
+
+NAME_LENGTH = 32
+TYPE_LENGTH = 16
+
+CATALOG_DTYPE = np.dtype(
+    [("name", f"U{NAME_LENGTH}"), ("type", f"U{TYPE_LENGTH}")] + [(p, "f8") for p in PROPERTIES]
+)
+
+
+class SectionCatalog:
+    """
+    Section properties as columns (h, b, tf, tw in mm; A in cm²; Zx in cm³; r in cm)
+    with a name index and property queries.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.names = table["name"]
+        self.types = table["type"]
+        for p in PROPERTIES:
+            setattr(self, p, table[p])
+
+        self._index = {str(name): i for i, name in enumerate(self.names)}
+        self._type_rows = {}
+        for i, t in enumerate(self.types):
+            self._type_rows.setdefault(str(t), []).append(i)
+        self._type_rows = {t: np.array(rows) for t, rows in self._type_rows.items()}
+        self._sorted = {}
+
+    # ================================
+    # Loading / saving
+    # ================================
+    @classmethod
+    def from_dict(cls, data):
+        """
+        {type: {name: {h, b, tf, tw, A, Zx, r}}} -> catalog (same layout as the JSON file).
+        """
+        rows = [
+            (name, section_type) + tuple(props.get(p, np.nan) for p in PROPERTIES)
+            for section_type, sections in data.items()
+            for name, props in sections.items()
+        ]
+        return cls(np.array(rows, dtype=CATALOG_DTYPE))
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def from_npy(cls, path, mmap=True):
+        """
+        Prebuilt catalog written by save(); memory-mapped by default.
+        """
+        table = np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+        if table.dtype.names != CATALOG_DTYPE.names:
+            raise ValueError(f"Not a section catalog file: {path}")
+        return cls(table)
+
+    @classmethod
+    def load(cls, path):
+        if path.endswith(".npy"):
+            return cls.from_npy(path)
+        return cls.from_json(path)
+
+    def save(self, path):
+        np.save(path, np.ascontiguousarray(self.table, dtype=CATALOG_DTYPE), allow_pickle=False)
+
+    # ================================
+    # Lookups
+    # ================================
+    def __len__(self):
+        return len(self.table)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def index_of(self, name, section_type=None):
+        """
+        Row of a section, or None. With section_type the section must belong to it.
+        """
+        i = self._index.get(name)
+        if i is None or (section_type is not None and self.types[i] != section_type):
+            return None
+        return i
+
+    def get(self, name, section_type=None):
+        """
+        {h, b, tf, tw, A, Zx, r} of a section, or None if not found.
+        """
+        i = self.index_of(name, section_type)
+        if i is None:
+            return None
+        row = self.table[i]
+        return {p: float(row[p]) for p in PROPERTIES}
+
+    def section_types(self):
+        return list(self._type_rows)
+
+    def rows(self, section_type=None):
+        if section_type is None:
+            return np.arange(len(self))
+        if isinstance(section_type, (list, tuple, set)):
+            parts = [self._type_rows.get(t, np.empty(0, dtype=int)) for t in section_type]
+            return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=int)
+        return self._type_rows.get(section_type, np.empty(0, dtype=int))
+
+    def sorted_rows(self, prop):
+        """
+        Row indices in ascending order of a property (cached per property).
+        """
+        if prop not in self._sorted:
+            self._sorted[prop] = np.argsort(getattr(self, prop), kind="stable")
+        return self._sorted[prop]
+
+    # ================================
+    # Property queries
+    # ================================
+    def query(self, section_type=None, sort_by="A", **minimums):
+        """
+        Rows with every given property >= its minimum, ascending by sort_by.
+        e.g. query(section_type="IPE", Zx=500, r=2.0)
+        """
+        for p in minimums:
+            if p not in PROPERTIES:
+                raise ValueError(f"Unknown section property: {p}")
+
+        order = self.sorted_rows(sort_by)
+        if section_type is not None:
+            allowed = np.zeros(len(self), dtype=bool)
+            allowed[self.rows(section_type)] = True
+            order = order[allowed[order]]
+
+        ok = np.ones(len(order), dtype=bool)
+        for p, value in minimums.items():
+            ok &= getattr(self, p)[order] >= value
+        return order[ok]
+
+    def lightest(self, section_type=None, **minimums):
+        """
+        Name of the lightest (smallest A) section meeting the minimums, or None.
+        """
+        rows = self.query(section_type, sort_by="A", **minimums)
+        return str(self.names[rows[0]]) if len(rows) else None
+
+
+# ================================
+# Shared catalog (loaded lazily on first use, not at import)
+# ================================
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def _default_path():
+    path = os.getenv("STRUCTICODE_STEEL_CATALOG")
+    if path:
+        return path
+    # use the prebuilt binary if it's up to date with the JSON
+    if os.path.exists(DEFAULT_NPY_PATH) and os.path.getmtime(DEFAULT_NPY_PATH) >= os.path.getmtime(DEFAULT_JSON_PATH):
+        return DEFAULT_NPY_PATH
+    return DEFAULT_JSON_PATH
+
+
+def get_section_catalog():
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = SectionCatalog.load(_default_path())
+    return _catalog
+
+
+def build_catalog_file(json_path=DEFAULT_JSON_PATH, npy_path=DEFAULT_NPY_PATH):
+    """
+    Prebuild the memory-mappable catalog from the JSON section data.
+    """
+    catalog = SectionCatalog.from_json(json_path)
+    catalog.save(npy_path)
+    return npy_path
+
+
+if __name__ == "__main__":
+    print(build_catalog_file())
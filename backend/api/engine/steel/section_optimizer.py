@@ -0,0 +1,136 @@
+import numpy as np
+
+from .section_catalog import get_section_catalog
+from .steel_beam import analyze_steel_beams
+from .steel_column import analyze_steel_columns
+
+# ================================
+# Steel section selection (scan the whole catalog in one vectorized pass)
+# ================================
+STEEL_DENSITY_KG_M_PER_CM2 = 0.785  # 7850 kg/m³ × 1e-4 m²/cm²
+DEFAULT_TOP = 5
+
+
+def _rank(res, A, top):
+    """
+    Positions of passing sections, lightest first; ties broken by the higher utilization.
+    """
+    ok = res["safe"] & np.isfinite(res["utilization"])
+    passing = np.flatnonzero(ok)
+    order = np.lexsort((-res["utilization"][passing], A[passing]))[:top]
+    return passing[order], ok
+
+
+def _candidates(catalog, rows, res, best, columns):
+    """
+    columns: {output key: (result key, decimals)} extra per-section values.
+    """
+    candidates = []
+    for i in best.tolist():
+        row = rows[i]
+        A = float(catalog.A[row])
+        entry = {
+            "section": str(catalog.names[row]),
+            "type": str(catalog.types[row]),
+            "A (cm²)": round(A, 2),
+            "weight (kg/m)": round(A * STEEL_DENSITY_KG_M_PER_CM2, 2),
+            "utilization (%)": round(float(res["utilization"][i]) * 100, 1),
+        }
+        for key, (field, decimals) in columns.items():
+            entry[key] = round(float(res[field][i]), decimals)
+        candidates.append(entry)
+    return candidates
+
+
+def optimize_steel_beam(data, code='AISC'):
+    """
+    Lightest catalog sections passing the analyze_steel_beam flexural check.
+    data: { steelGrade, span (m), uniformLoad (kN/m), supportType, sectionType?, top? }
+    """
+    fy = data.get('steelGrade')
+    span = data.get('span')
+    w = data.get('uniformLoad')
+    support = data.get('supportType', 'Simply Supported')
+    top = int(data.get('top', DEFAULT_TOP))
+
+    if not all([fy, span, w]):
+        return {"status": "error", "message": "Missing required beam parameters (steelGrade, span, uniformLoad)."}
+
+    catalog = get_section_catalog()
+    rows = catalog.rows(data.get('sectionType'))
+    res = analyze_steel_beams(
+        fy, span, w, catalog.h[rows], catalog.b[rows], catalog.tf[rows], support=support, code=code
+    )
+    best, ok = _rank(res, catalog.A[rows], top)
+    candidates = _candidates(catalog, rows, res, best, {
+        "Zx (cm³)": ("Zx", 2),
+        "phi*Mp (kN·m)": ("capacity", 2),
+    })
+
+    return {
+        "element": "steel_beam",
+        "status": "success" if candidates else "no_section",
+        "Mu (kN·m)": round(float(res["Mu"][0]), 2) if len(rows) else None,
+        "phi": res["phi"],
+        "sections_checked": int(len(rows)),
+        "sections_passing": int(ok.sum()),
+        "candidates": candidates,
+        "details": {
+            "support_type": support,
+            "note": f"Lightest sections passing the flexural check using {code}",
+        },
+    }
+
+
+def optimize_steel_column(data, code='AISC'):
+    """
+    Lightest catalog sections passing the analyze_steel_column buckling check.
+    data: { steelGrade, axialLoad (kN), length (mm), kFactor, sectionType?, top? }
+    """
+    fy = data.get('steelGrade')
+    Pu = data.get('axialLoad')
+    length = data.get('length')
+    K = data.get('kFactor', 1.0)
+    top = int(data.get('top', DEFAULT_TOP))
+
+    if not all([fy, Pu, length, K]):
+        return {"status": "error", "message": "Missing required column parameters (steelGrade, axialLoad, length)."}
+
+    catalog = get_section_catalog()
+    rows = catalog.rows(data.get('sectionType'))
+    res = analyze_steel_columns(fy, Pu, length, catalog.A[rows], catalog.r[rows], K=K, code=code)
+    best, ok = _rank(res, catalog.A[rows], top)
+    candidates = _candidates(catalog, rows, res, best, {
+        "KL/r": ("KL_r", 2),
+        "phi*Pn (kN)": ("capacity", 2),
+    })
+
+    return {
+        "element": "steel_column",
+        "status": "success" if candidates else "no_section",
+        "Pu (kN)": Pu,
+        "phi": res["phi"],
+        "sections_checked": int(len(rows)),
+        "sections_passing": int(ok.sum()),
+        "candidates": candidates,
+        "details": {
+            "boundary_condition": data.get('boundaryCondition'),
+            "note": f"Lightest sections passing AISC column buckling using {code}",
+        },
+    }
+
+
+OPTIMIZERS = {
+    "steel_beam": optimize_steel_beam,
+    "steel_column": optimize_steel_column,
+}
+
+
+def run_steel_optimization(element, data, code='AISC'):
+    optimizer = OPTIMIZERS.get(element)
+    if optimizer is None:
+        return {"status": "error", "message": f"Unsupported element for section optimization: {element}"}
+    try:
+        return optimizer(data, code)
+    except Exception as e:
+        return {"status": "error", "message": f"Section optimization failed: {str(e)}"}
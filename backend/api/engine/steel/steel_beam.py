@@ -1,3 +1,51 @@
+import numpy as np
+
+from .section_catalog import get_section_catalog
+
+# Mu = w L² / divisor
+SUPPORT_MOMENT_DIVISOR = {
+    "Simply Supported": 8,
+    "Fixed": 12,
+    "Cantilever": 2,
+    "Continuous": 10,
+}
+
+
+# ================================
+# Vectorized steel beam check (columnar arrays, one row per beam/section)
+# ================================
+def analyze_steel_beams(fy, span, w, h, b, tf, support="Simply Supported", code='AISC'):
+    """
+    Same flexural check as analyze_steel_beam for many beams or sections at once.
+    fy in MPa, span in m, w in kN/m, h/b/tf in mm.
+    Returns dict of arrays: Zx (cm³), Mp, capacity (phi*Mp), Mu, utilization, safe.
+    """
+    fy, span, w, h, b, tf = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (fy, span, w, h, b, tf))
+    )
+
+    phi = 0.9 if code in ['AISC', 'Eurocode', 'Jordan', 'Egypt'] else 1.0
+
+    # Approximate plastic section modulus Zx (simplified for I-section)
+    Zx = (b * tf * (h - tf)) / 10  # cm³
+    Mp = fy * Zx / 100  # kN·m
+    Mu = w * (span ** 2) / SUPPORT_MOMENT_DIVISOR.get(support, 8)
+    capacity = phi * Mp
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        utilization = Mu / capacity
+
+    return {
+        "Zx": Zx,
+        "Mp": Mp,
+        "capacity": capacity,
+        "Mu": Mu,
+        "utilization": utilization,
+        "safe": Mu <= capacity,
+        "phi": phi,
+    }
+
+
 def analyze_steel_beam(data, code='AISC'):
     """
     Analyzes steel I-beam under uniform load.
@@ -19,7 +67,7 @@ def analyze_steel_beam(data, code='AISC'):
     w = data.get('uniformLoad')  # kN/m
     support = data.get('supportType', 'Simply Supported')
 
-    dims = data.get('dimensions', {})
+    dims = data.get('dimensions') or section_dimensions(data.get('sectionSize'), data.get('sectionType'))
     h = dims.get('depth')        # mm
     b = dims.get('width')        # mm
     tf = dims.get('flangeThickness')  # mm
@@ -30,25 +78,12 @@ def analyze_steel_beam(data, code='AISC'):
     if not all([fy, span, w, h, b, tf, tw]):
         return {"status": "error", "message": "Missing required beam parameters."}
 
-    # Approximate plastic section modulus Zx (simplified for I-section)
-    Zx = (b * tf * (h - tf)) / 10  # cm³
-
-    # Plastic moment capacity Mp
-    Mp = fy * Zx / 100  # kN·m
+    res = analyze_steel_beams(fy, span, w, h, b, tf, support=support, code=code)
+    Zx = float(res["Zx"])
+    Mp = float(res["Mp"])
+    Mu = float(res["Mu"])
 
-    # Maximum moment based on support type
-    if support == "Simply Supported":
-        Mu = w * (span ** 2) / 8
-    elif support == "Fixed":
-        Mu = w * (span ** 2) / 12
-    elif support == "Cantilever":
-        Mu = w * (span ** 2) / 2
-    elif support == "Continuous":
-        Mu = w * (span ** 2) / 10
-    else:
-        Mu = w * (span ** 2) / 8  # default
-
-    status = "safe" if Mu <= phi * Mp else "unsafe"
+    status = "safe" if res["safe"] else "unsafe"
 
     # Recommendations if unsafe
     recommendations = []
@@ -78,3 +113,19 @@ def analyze_steel_beam(data, code='AISC'):
         },
         "recommendations": recommendations
     }
+
+
+def section_dimensions(section_size, section_type=None):
+    """
+    {depth, width, flangeThickness, webThickness} (mm) of a catalog section,
+    same keys as the request's dimensions; {} if the section is unknown.
+    """
+    section = get_section_catalog().get(section_size, section_type) if section_size else None
+    if not section:
+        return {}
+    return {
+        "depth": section["h"],
+        "width": section["b"],
+        "flangeThickness": section["tf"],
+        "webThickness": section["tw"],
+    }
@@ -1,11 +1,46 @@
 import math
-import json
-import os
 
-# تحميل بيانات القطاعات إذا لزم
-DATA_PATH = os.path.join(os.path.dirname(__file__), '../data/steel_sections_data.json')
-with open(DATA_PATH, 'r') as f:
-    section_db = json.load(f)
+import numpy as np
+
+from .section_catalog import get_section_catalog
+
+E_STEEL = 200000  # MPa
+
+
+# ================================
+# Vectorized steel column check (columnar arrays, one row per column/section)
+# ================================
+def analyze_steel_columns(fy, Pu, length, A, r, K=1.0, code='AISC'):
+    """
+    Same AISC flexural buckling check as analyze_steel_column for many
+    columns or sections at once. fy in MPa, Pu in kN, length in mm,
+    A in cm², r in cm.
+    Returns dict of arrays: KL_r, Fcr, Pn, capacity (phi*Pn), utilization, safe.
+    """
+    fy, Pu, length, A, r, K = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (fy, Pu, length, A, r, K))
+    )
+
+    phi = 0.9 if code in ['AISC', 'Eurocode', 'Jordan', 'Egypt'] else 1.0
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        KL_over_r = K * (length / 10) / r
+        Fe = (math.pi**2 * E_STEEL) / (KL_over_r ** 2)  # Euler stress
+        Fcr = np.where(fy / Fe <= 2.25, 0.658 ** (fy / Fe) * fy, 0.877 * Fe)
+
+        Pn = Fcr * A / 10  # → kN
+        capacity = phi * Pn
+        utilization = Pu / capacity
+
+    return {
+        "KL_r": KL_over_r,
+        "Fcr": Fcr,
+        "Pn": Pn,
+        "capacity": capacity,
+        "utilization": utilization,
+        "safe": Pu <= capacity,
+        "phi": phi,
+    }
 
 def analyze_steel_column(data, code='AISC'):
     """
@@ -30,7 +65,7 @@ def analyze_steel_column(data, code='AISC'):
     phi = 0.9 if code in ['AISC', 'Eurocode', 'Jordan', 'Egypt'] else 1.0
 
     # جلب خصائص المقطع
-    section = section_db.get(section_type, {}).get(section_size)
+    section = get_section_catalog().get(section_size, section_type)
     if not section:
         return {"status": "error", "message": "Section data not found."}
 
@@ -39,15 +74,11 @@ def analyze_steel_column(data, code='AISC'):
     if not all([A, r, fy, L]):
         return {"status": "error", "message": "Missing required values (A, r, fy, L)."}
 
-    KL_over_r = K * L / r
-    E = 200000  # MPa
-    Fe = (math.pi**2 * E) / (KL_over_r ** 2)  # Euler stress
-    if fy / Fe <= 2.25:
-        Fcr = 0.658 ** (fy / Fe) * fy
-    else:
-        Fcr = 0.877 * Fe
+    res = analyze_steel_columns(fy, Pu, data.get('length'), A, r, K=K, code=code)
+    KL_over_r = float(res["KL_r"])
+    Fcr = float(res["Fcr"])
+    Pn = float(res["Pn"])
 
-    Pn = Fcr * A / 10  # → kN
     status = "safe" if Pu <= phi * Pn else "unsafe"
 
     # Recommendations if unsafe
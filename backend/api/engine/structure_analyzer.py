@@ -1,11 +1,72 @@
 import numpy as np
+from scipy import sparse
+from scipy.linalg import eigh
+from scipy.sparse.linalg import LinearOperator, eigsh
+
+from .dof_numbering import half_bandwidth, member_dof_table, rcm_node_order
+from .frame_elements import (
+    consistent_mass_stack,
+    end_forces,
+    geometric_stiffness_unit,
+    local_stiffness_stack,
+    member_geometry,
+    station_deflections,
+    station_forces,
+    to_global,
+    transformation_stack,
+    uniform_load_fef,
+)
+from .combination_engine import compile_combinations, reduce_envelope
+from .linear_solvers import factorize_banded, factorize_dense, factorize_sparse
+from .response_spectrum import GRAVITY, combine_modal, cqc_correlation
 
 # ================================
 # Structure Analyzer (2D Frame v2) + Load Combinations
 # ================================
 
+# models above this many DOFs are assembled as CSR and solved with a sparse direct solver
+SPARSE_DOF_THRESHOLD = 600
+
+# above the dense threshold, a banded Cholesky is used when the reordered
+# half-bandwidth stays below this (memory ndof * bandwidth instead of ndof²)
+BANDED_MAX_HALF_BANDWIDTH = 250
+
+SOLVER_MODES = ("auto", "dense", "banded", "sparse")
+
+MASS_TYPES = ("lumped", "consistent")
+
+# stations per member (ends included) for section forces and deflections
+DEFAULT_STATIONS = 11
+MAX_STATIONS = 101
+# members x stations x combinations values evaluated per block
+STATION_BLOCK_VALUES = 4_000_000
+
+# first order (linear) or second order P-Delta: every combination solved on
+# K + K_G(N) from the first-order result, preconditioned by the factorized linear K
+ANALYSIS_MODES = ("linear", "p-delta")
+P_DELTA_TOLERANCE = 1e-6  # residual of (K + K_G) U = F relative to |F|
+P_DELTA_MAX_ITERATIONS = 50  # preconditioned CG steps per combination
+
+# kN/m³ when a material has no unitWeight (reinforced concrete, same as the slab self-weight)
+DEFAULT_UNIT_WEIGHT = 25.0
+
 class StructureAnalyzer:
-    def __init__(self, structure: dict):
+    # degrees of freedom per node (ux, uy, rotation) and the output keys for them
+    DIMENSION = 2
+    DOFS_PER_NODE = 3
+    DISPLACEMENT_KEYS = ("ux", "uy", "rz")
+    REACTION_KEYS = ("Rx", "Ry", "Mz")
+    # restrained local DOFs per support type
+    SUPPORT_DOFS = {"fix": (0, 1, 2), "pin": (0, 1), "roller": (1,)}
+    # translational DOFs (carry lumped mass) and the matching global directions
+    TRANSLATIONAL_DOFS = (0, 1)
+    DIRECTIONS = ("X", "Y")
+    # member results: extreme section forces, transverse deflection (local y), diagram rows
+    MEMBER_FORCE_KEYS = ("Nmax", "Vmax", "Mmax")
+    DEFLECTION_KEYS = ("dy",)
+    DIAGRAM_KEYS = ("N", "V", "M", "dy")
+
+    def __init__(self, structure: dict, solver: str = "auto", node_position=None):
         self.structure = structure
         self.nodes = {n["id"]: n for n in structure["nodes"]}
         self.members = structure["members"]
@@ -14,223 +75,842 @@ class StructureAnalyzer:
         self.materials = {m["id"]: m for m in structure["materials"]}
         self.loads = structure.get("loads", {})
 
-        # degrees of freedom per node (ux, uy, rotation)
-        self.dofs_per_node = 3
+        self.dofs_per_node = self.DOFS_PER_NODE
         self.ndof = len(self.nodes) * self.dofs_per_node
 
-        # mapping node -> dof indices
-        self.node_dofs = {
-            nid: [i*self.dofs_per_node, i*self.dofs_per_node+1, i*self.dofs_per_node+2]
-            for i, nid in enumerate(self.nodes.keys())
+        # member connectivity as node indices
+        node_index = {nid: i for i, nid in enumerate(self.nodes)}
+        self._n1 = np.array([node_index[m["n1"]] for m in self.members], dtype=int)
+        self._n2 = np.array([node_index[m["n2"]] for m in self.members], dtype=int)
+
+        # mapping node -> dof indices, numbered in reverse Cuthill-McKee order
+        # so the profile of K stays narrow whatever order the nodes arrive in
+        # (a session re-analysing the same topology passes its numbering back in)
+        if node_position is None:
+            node_position = rcm_node_order(len(self.nodes), self._n1, self._n2)
+        self.node_position = position = node_position
+        self._node_dof_table = position[:, None] * self.dofs_per_node + np.arange(self.dofs_per_node)
+        self.node_dofs = dict(zip(self.nodes.keys(), self._node_dof_table.tolist()))
+        self.member_dofs = member_dof_table(position, self._n1, self._n2, self.dofs_per_node)
+
+        bandwidth_before = half_bandwidth(
+            member_dof_table(np.arange(len(self.nodes)), self._n1, self._n2, self.dofs_per_node)
+        )
+        self.bandwidth = half_bandwidth(self.member_dofs)
+
+        if solver not in SOLVER_MODES:
+            raise ValueError(f"Unknown solver mode: {solver}")
+        if solver == "auto":
+            if self.ndof <= SPARSE_DOF_THRESHOLD:
+                solver = "dense"
+            elif self.bandwidth <= BANDED_MAX_HALF_BANDWIDTH:
+                solver = "banded"
+            else:
+                solver = "sparse"
+        self.solver = solver
+
+        self.metadata = {
+            "dimension": self.DIMENSION,
+            "ndof": self.ndof,
+            "solver": self.solver,
+            "renumbering": "reverse_cuthill_mckee",
+            "bandwidth_before": bandwidth_before,
+            "bandwidth_after": self.bandwidth,
         }
 
+        # support bookkeeping: boolean mask + index arrays, built once per model
+        self.fixed_mask = np.zeros(self.ndof, dtype=bool)
+        self.fixed_mask[self._get_support_dofs()] = True
+        self.fixed_dofs = np.flatnonzero(self.fixed_mask)
+        self.free_dofs = np.flatnonzero(~self.fixed_mask)
+        self._reaction_rows = [
+            (nid, key, int(np.searchsorted(self.fixed_dofs, dof)))
+            for nid, dofs in self.node_dofs.items()
+            for key, dof in zip(self.REACTION_KEYS, dofs)
+            if self.fixed_mask[dof]
+        ]
+
+        # factorized Kff and the Ksf partition (reactions), built on first solve
+        self._factor = None
+        self._K_sf = None
+        self._live_patterns = None
+
+        n_stations = int(structure.get("stations") or DEFAULT_STATIONS)
+        if not 2 <= n_stations <= MAX_STATIONS:
+            raise ValueError(f"stations must be between 2 and {MAX_STATIONS}")
+        self.stations = np.linspace(0.0, 1.0, n_stations)
+
+        self.analysis = structure.get("analysis") or "linear"
+        if self.analysis not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode: {self.analysis}")
+        p_delta = structure.get("pDelta") or {}
+        self.p_delta_tolerance = float(p_delta.get("tolerance") or P_DELTA_TOLERANCE)
+        self.p_delta_max_iterations = int(p_delta.get("maxIterations") or P_DELTA_MAX_ITERATIONS)
+        self._geometric_unit = None
+
+        # batched member data (geometry, stiffness, loads), built once
+        self._build_member_arrays()
+
     # ================================
     # Run All Load Combinations
     # ================================
-    def analyze_combinations(self):
+    def analyze_combinations(self, combos=None, prune=False, diagrams=False):
         """
         بيرجع النتائج لكل Combination (D, L, E ...)
+        K is factorized once, the basic load cases are solved as one multi-RHS
+        block and every combination is a linear superposition of those results.
+        combos defaults to loads.combinations; with prune=True only the
+        combinations that govern some member extreme are returned.
+        Member forces / deflections are the extremes along each member (signed
+        value of largest magnitude) and extreme_locations their distance from end 1.
         """
+        compiled, U_cases, W_cases, reactions_cases, axial = self._solve_combinations(combos, prune)
+        U, reactions = compiled.apply_stacked(U_cases, reactions_cases)
+
+        n_members, n_keys, n_combos = len(self.members), len(self.DIAGRAM_KEYS), len(compiled.combos)
+        extremes = np.empty((n_members, n_keys, n_combos))
+        locations = np.empty((n_members, n_keys, n_combos))
+        stations = np.empty((n_members, n_keys, len(self.stations), n_combos)) if diagrams else None
+        for members, values in self._combined_station_blocks(U_cases, W_cases, compiled.factors, axial):
+            index = np.argmax(np.abs(values), axis=2)
+            extremes[members] = np.take_along_axis(values, index[:, :, None], axis=2)[:, :, 0]
+            locations[members] = self.stations[index] * self.member_L[members, None, None]
+            if diagrams:
+                stations[members] = values
+
+        n_forces = len(self.MEMBER_FORCE_KEYS)
         results = {}
-        combos = self.loads.get("combinations", [{"id":"LC1","name":"1.0D","expr":"1.0D"}])
+        for i, combo in enumerate(compiled.combos):
+            results[combo["id"]] = {
+                "name": combo["name"],
+                "expr": combo["expr"],
+                "displacements": self._format_displacements(U[:, i]),
+                "member_forces": self._format_member_forces(extremes[:, :n_forces, i]),
+                "member_deflections": self._format_member_values(extremes[:, n_forces:, i], self.DEFLECTION_KEYS),
+                "extreme_locations": self._format_member_values(locations[..., i], self._extreme_keys()),
+                "reactions": self._format_reactions(reactions[:, i])
+            }
+            if diagrams:
+                results[combo["id"]]["diagrams"] = self._format_diagrams(stations[..., i])
+
+        return results
 
-        for combo in combos:
-            combo_id, expr = combo["id"], combo["expr"]
+    def analyze_envelope(self, combos=None, diagrams=False):
+        """
+        Envelope over all combinations, reduced in NumPy: max / min of every
+        displacement, reaction and member force / deflection (over the stations
+        of each member, with the location) with the combination giving it.
+        "governing" has the signed value of largest magnitude per entry (laid out
+        like one combination's results) and "governing_combos" where it comes from;
+        with diagrams, max / min over the combinations at every station.
+        """
+        compiled, U_cases, W_cases, reactions_cases, axial = self._solve_combinations(combos)
+        U, reactions = compiled.apply_stacked(U_cases, reactions_cases)
+        ids = np.array(compiled.ids, dtype=object)
+
+        envelope = {"combinations": {c["id"]: {"name": c["name"], "expr": c["expr"]} for c in compiled.combos}}
+        governing, governing_combos = {}, {}
+        for key, values, formatter in (
+            ("displacements", U, self._format_displacements),
+            ("reactions", reactions, self._format_reactions),
+        ):
+            env = reduce_envelope(values)
+            envelope[key] = {
+                "max": formatter(env["max"]),
+                "min": formatter(env["min"]),
+                "max_combo": formatter(ids[env["max_index"]]),
+                "min_combo": formatter(ids[env["min_index"]]),
+            }
+            governing[key] = formatter(env["governing"])
+            governing_combos[key] = formatter(ids[env["governing_index"]])
+
+        # member extremes over stations x combinations, one block of members at a time
+        n_members, n_keys, n_combos = len(self.members), len(self.DIAGRAM_KEYS), len(compiled.combos)
+        member_env = {
+            kind: {part: np.empty((n_members, n_keys), dtype=int if part == "combo" else float)
+                   for part in ("value", "combo", "at")}
+            for kind in ("max", "min", "governing")
+        }
+        if diagrams:
+            station_max = np.empty((n_members, n_keys, len(self.stations)))
+            station_min = np.empty_like(station_max)
+        for members, values in self._combined_station_blocks(U_cases, W_cases, compiled.factors, axial):
+            env = reduce_envelope(values.reshape(values.shape[0], n_keys, -1))
+            for kind, target in member_env.items():
+                station, combo = np.divmod(env[f"{kind}_index"], n_combos)
+                target["value"][members] = env[kind]
+                target["combo"][members] = combo
+                target["at"][members] = self.stations[station] * self.member_L[members, None]
+            if diagrams:
+                station_max[members] = values.max(axis=3)
+                station_min[members] = values.min(axis=3)
+
+        n_forces = len(self.MEMBER_FORCE_KEYS)
+        for key, columns, keys in (
+            ("member_forces", slice(None, n_forces), self.MEMBER_FORCE_KEYS),
+            ("member_deflections", slice(n_forces, None), self.DEFLECTION_KEYS),
+        ):
+            def formatter(values):
+                return self._format_member_values(values[:, columns], keys)
+
+            envelope[key] = {
+                "max": formatter(member_env["max"]["value"]),
+                "min": formatter(member_env["min"]["value"]),
+                "max_combo": formatter(ids[member_env["max"]["combo"]]),
+                "min_combo": formatter(ids[member_env["min"]["combo"]]),
+                "max_at": formatter(member_env["max"]["at"]),
+                "min_at": formatter(member_env["min"]["at"]),
+            }
+            governing[key] = formatter(member_env["governing"]["value"])
+            governing_combos[key] = formatter(ids[member_env["governing"]["combo"]])
+        governing["extreme_locations"] = self._format_member_values(member_env["governing"]["at"], self._extreme_keys())
+
+        if diagrams:
+            envelope["diagrams"] = {
+                mid: {"x": x, "max": mx, "min": mn}
+                for (mid, x), mx, mn in zip(
+                    self._station_positions().items(),
+                    self._format_diagrams(station_max, positions=False).values(),
+                    self._format_diagrams(station_min, positions=False).values(),
+                )
+            }
+        envelope["governing"] = governing
+        envelope["governing_combos"] = governing_combos
+        return envelope
 
-            # scale loads بناءً على التعبير (ex: 1.2D+1.6L)
-            load_factors = self._parse_load_combination(expr)
+    def _solve_combinations(self, combos=None, prune=False):
+        """
+        Solves the basic cases once and compiles the combinations against them:
+        (compiled, U_cases (ndof, nc), member loads W_cases (M, nl, nc), reactions (nr, nc),
+        axial forces (M, nc) of the second-order analysis or None).
+        In P-Delta mode every combination is iterated to its own second-order
+        state and the "cases" returned are the combinations themselves.
+        """
+        if combos is None:
+            combos = self.loads.get("combinations", [{"id":"LC1","name":"1.0D","expr":"1.0D"}])
+
+        cases = self._basic_load_cases()
+        row_scales = self._case_row_scales(cases)
+        F_cases = self._basic_load_vectors(cases, row_scales)
+        U_cases = self._solve(F_cases)
+        W_cases = self._member_loads(row_scales)
+        reactions_cases = self._reactions(U_cases, F_cases)
+
+        # كل الـ combos مع بعض: مصفوفة معاملات واحدة و matmul واحد لكل النتائج
+        compiled = compile_combinations(combos, cases, self.loads.get("psi"))
+        summary = {
+            "generated": len(compiled.combos),
+            "basic_cases": cases,
+            "unused_cases": [c for c, used in zip(cases, compiled.factors.any(axis=0)) if not used],
+            "stations": len(self.stations),
+        }
 
-            res = self._analyze_single_case(load_factors)
-            results[combo_id] = {
-                "name": combo["name"],
-                "expr": expr,
-                "displacements": res["displacements"],
-                "member_forces": res["member_forces"]
+        axial = None
+        if self.analysis == "p-delta" and compiled.combos:
+            # superposition doesn't hold any more: each combination is solved on its
+            # own, all of them as one multi-RHS block warm-started from the linear result
+            F, U0 = compiled.apply_stacked(F_cases, U_cases)
+            U_cases, axial, G, iterations, converged, stable = self._p_delta(F, U0)
+            if not stable.all():
+                unstable = [cid for cid, ok in zip(compiled.ids, stable) if not ok]
+                raise ValueError(
+                    f"P-Delta: structure unstable under {', '.join(unstable[:10])}"
+                    f"{' ...' if len(unstable) > 10 else ''} (axial loads above the elastic buckling load)"
+                )
+            W_cases = compiled.apply(W_cases)
+            reactions_cases = self._reactions(U_cases, F) + G[self.fixed_dofs]
+            self.metadata["p_delta"] = {
+                "tolerance": self.p_delta_tolerance,
+                "max_iterations": self.p_delta_max_iterations,
+                "iterations": dict(zip(compiled.ids, iterations.tolist())),
+                "unconverged": [cid for cid, ok in zip(compiled.ids, converged) if not ok],
             }
+            compiled = compiled.as_cases()
 
-        return results
+        if prune and compiled.combos:
+            compiled = compiled.select(compiled.governing(self._station_values(U_cases, W_cases, axial=axial)))
+        self.metadata["combinations"] = {**summary, "analyzed": len(compiled.combos)}
+        return compiled, U_cases, W_cases, reactions_cases, axial
 
     # ================================
-    # Analyze Single Load Case
+    # P-Delta (second order)
     # ================================
-    def _analyze_single_case(self, load_factors: dict):
-        # 1. Global stiffness matrix
-        K = np.zeros((self.ndof, self.ndof))
-        F = np.zeros(self.ndof)
+    def _p_delta(self, F, U0):
+        """
+        Second-order displacements for load vectors F (ndof, n): (K + K_G(N)) U = F
+        solved by conjugate gradients preconditioned with the factorized linear K
+        (one multi-RHS back-substitution per step, converged columns drop out),
+        warm-started from the first-order U0. The axial forces N are held during a
+        CG run and updated from U until the residual with the new N is within tolerance.
+        Returns U, N (M, n), K_G U (ndof, n), CG steps (n,), converged (n,), stable (n,):
+        K + K_G losing positive definiteness means the load is above the buckling load.
+        """
+        free = self.free_dofs
+        K = self._assemble_stiffness()
+        K = K[np.ix_(free, free)] if self.solver == "dense" else K[free][:, free]
+        tol = self.p_delta_tolerance
+
+        U = U0.copy()
+        N = self._axial_forces(U)
+        n = U.shape[1]
+        iterations = np.zeros(n, dtype=int)
+        converged = np.zeros(n, dtype=bool)
+        stable = np.ones(n, dtype=bool)
+        F_norm = np.maximum(np.linalg.norm(F[free], axis=0), np.finfo(float).tiny)
+
+        def tangent(X, cols):
+            # (K + K_G(N)) X on the free DOFs
+            full = np.zeros((self.ndof, X.shape[1]))
+            full[free] = X
+            return K @ X + self._geometric_forces(full, N[:, cols])[free]
+
+        active = np.arange(n)
+        while len(active):
+            N[:, active] = self._axial_forces(U[:, active])
+            R = F[free][:, active] - tangent(U[free][:, active], active)
+            done = np.linalg.norm(R, axis=0) <= tol * F_norm[active]
+            converged[active[done]] = True
+            keep = ~done & (iterations[active] < self.p_delta_max_iterations)
+            active, R = active[keep], R[:, keep]
+            if not len(active):
+                break
+
+            # CG on the fixed-N system, columns leaving as they converge
+            cols = active
+            Uf = U[free][:, cols]
+            Z = self._factor(R)
+            P = Z.copy()
+            rz = np.einsum("ij,ij->j", R, Z)
+            while len(cols):
+                AP = tangent(P, cols)
+                pAp = np.einsum("ij,ij->j", P, AP)
+                positive = pAp > 0
+                stable[cols[~positive]] = False
+                alpha = np.where(positive, rz / np.where(positive, pAp, 1.0), 0.0)
+                Uf += alpha * P
+                R -= alpha * AP
+                iterations[cols] += 1
+
+                inner_done = np.linalg.norm(R, axis=0) <= 0.1 * tol * F_norm[cols]
+                keep = positive & ~inner_done & (iterations[cols] < self.p_delta_max_iterations)
+                U[free[:, None], cols[~keep]] = Uf[:, ~keep]
+                cols, Uf, R, P, rz = cols[keep], Uf[:, keep], R[:, keep], P[:, keep], rz[keep]
+                if not len(cols):
+                    break
+                Z = self._factor(R)
+                rz_new = np.einsum("ij,ij->j", R, Z)
+                P = Z + rz_new / rz * P
+                rz = rz_new
+            active = active[stable[active]]
+
+        return U, N, self._geometric_forces(U, N), iterations, converged, stable
+
+    def _axial_forces(self, U):
+        """
+        (M, n) member axial forces, tension positive.
+        """
+        a = self.dofs_per_node
+        u_local = np.einsum("mij,mj...->mi...", self.member_T[:, [0, a]], U[self.member_dofs])
+        return self.member_k_local[:, a, a, None] * (u_local[:, 1] - u_local[:, 0])
 
-        # 2. Assemble members
-        for member in self.members:
-            self._assemble_member(K, F, member, load_factors)
+    def _geometric_forces(self, U, N):
+        """
+        Global nodal forces K_G(N) U (ndof, n), assembled member by member for
+        each column's own axial forces.
+        """
+        if self._geometric_unit is None:
+            self._geometric_unit = self._geometric_unit_local()
+        u_local = np.einsum("mij,mj...->mi...", self.member_T, U[self.member_dofs])
+        f_local = N[:, None] * np.einsum("mij,mj...->mi...", self._geometric_unit, u_local)
+        G = np.zeros((self.ndof, U.shape[1]))
+        np.add.at(G, self.member_dofs, np.einsum("mji,mj...->mi...", self.member_T, f_local))
+        return G
 
-        # 3. Slab loads -> distribute to beams
-        for slab in self.slabs:
-            self._distribute_slab_load(F, slab, load_factors)
+    def _geometric_unit_local(self):
+        return geometric_stiffness_unit(self.member_L)
 
-        # 4. Apply supports
-        fixed_dofs = self._get_support_dofs()
-        free_dofs = [i for i in range(self.ndof) if i not in fixed_dofs]
+    # ================================
+    # Member stations (section forces + deflections along the members)
+    # ================================
+    def _station_values(self, U, W, members=slice(None), axial=None):
+        """
+        (Mb, K, S, n) values of DIAGRAM_KEYS (N, V, M, dy) at the stations of the
+        members, for displacements U (ndof, n) and member loads W (M, 1, n).
+        End forces are k u (plus k_G u for second-order axial forces) minus the
+        fixed-end forces of the member loads.
+        """
+        L = self.member_L[members]
+        u_local = np.einsum("mij,mj...->mi...", self.member_T[members], U[self.member_dofs[members]])
+        f1 = self._end1_forces(u_local, members, axial)
+        w = W[members, 0]
+        f1[:, 1] -= w * L[:, None] / 2
+        f1[:, 2] -= w * L[:, None]**2 / 12
+
+        forces = station_forces(f1, w, L, self.stations)
+        dy = station_deflections(u_local[:, [1, 2, 4, 5]], w, self._member_EI[members, 0], L, self.stations)
+        return np.concatenate([forces, dy[:, None]], axis=1)
+
+    def _end1_forces(self, u_local, members, axial=None):
+        """
+        Local end-1 forces k u of the members (+ N k_G u in P-Delta mode).
+        """
+        a = self.dofs_per_node
+        f1 = np.einsum("mij,mj...->mi...", self.member_k_local[members][:, :a], u_local)
+        if axial is not None:
+            f1 += axial[members][:, None] * np.einsum("mij,mj...->mi...", self._geometric_unit[members][:, :a], u_local)
+        return f1
+
+    def _combined_station_blocks(self, U_cases, W_cases, factors, axial=None):
+        """
+        Yields (members slice, (Mb, K, S, ncombos) combined station values) over
+        blocks of members, so members x stations x combinations never sits in memory at once.
+        """
+        per_member = len(self.DIAGRAM_KEYS) * len(self.stations) * max(len(factors), 1)
+        block = max(1, STATION_BLOCK_VALUES // per_member)
+        for start in range(0, len(self.members), block):
+            members = slice(start, start + block)
+            yield members, self._station_values(U_cases, W_cases, members, axial) @ factors.T
+
+    def _station_positions(self):
+        return {
+            member["id"]: row for member, row in zip(self.members, np.outer(self.member_L, self.stations).tolist())
+        }
 
-        # 5. Solve displacements
-        Kff = K[np.ix_(free_dofs, free_dofs)]
-        Ff = F[free_dofs]
-        Uf = np.linalg.solve(Kff, Ff)
+    def _format_diagrams(self, values, positions=True):
+        """
+        (M, K, S) station values -> {member: {x, N, V, M, dy}} lists.
+        """
+        diagrams = {
+            member["id"]: dict(zip(self.DIAGRAM_KEYS, rows)) for member, rows in zip(self.members, values.tolist())
+        }
+        if positions:
+            for mid, x in self._station_positions().items():
+                diagrams[mid] = {"x": x, **diagrams[mid]}
+        return diagrams
 
-        # build full U vector
-        U = np.zeros(self.ndof)
-        for i, dof in enumerate(free_dofs):
-            U[dof] = Uf[i]
+    def _extreme_keys(self):
+        return self.MEMBER_FORCE_KEYS + self.DEFLECTION_KEYS
 
-        # 6. Recover forces in members
-        member_forces = {}
-        for member in self.members:
-            member_forces[member["id"]] = self._recover_forces(member, U)
+    # ================================
+    # Solver (factorize once per model)
+    # ================================
+    def _solve(self, F):
+        """
+        Solves K U = F for one load vector (ndof,) or a block of them (ndof, n).
+        The reduced stiffness Kff is assembled and factorized on first use and
+        reused by every later call on this model.
+        """
+        if self._factor is None:
+            self._factorize()
+
+        U = np.zeros(F.shape)
+        U[self.free_dofs] = self._factor(F[self.free_dofs])
+        return U
+
+    def _reactions(self, U, F):
+        """
+        Support reactions R = Ksf Uf - Fs (prescribed support displacements are zero).
+        """
+        if self._factor is None:
+            self._factorize()
+        return self._K_sf @ U[self.free_dofs] - F[self.fixed_dofs]
+
+    def _factorize(self):
+        K = self._assemble_stiffness()
+        free, fixed = self.free_dofs, self.fixed_dofs
+
+        if self.solver == "dense":
+            self._K_sf = K[np.ix_(fixed, free)]
+            self._factor = factorize_dense(K[np.ix_(free, free)])
+            return
+
+        K_free_cols = K[:, free]
+        self._K_sf = K_free_cols[fixed]
+        if self.solver == "banded":
+            self._factor = factorize_banded(K_free_cols[free], self.bandwidth)
+        else:
+            self._factor = factorize_sparse(K_free_cols[free])
+
+    # ================================
+    # Batched member data
+    # ================================
+    def _build_member_arrays(self):
+        """
+        Computes lengths, rotations, local stiffness and load rows for all members
+        in one vectorized pass; section/material properties are read once per id.
+        """
+        xy = np.array([[n["x"], n["y"]] for n in self.nodes.values()], dtype=float).reshape(-1, 2)
+        n1, n2 = self._n1, self._n2
+
+        section_props = {}
+        for sid, sec in self.sections.items():
+            p = sec["params"]
+            section_props[sid] = (p.get("A", p["bw"]*p["h"]), (p["bw"]*p["h"]**3)/12.0)
+
+        E, gamma = self._material_columns()
+        A, I = np.array([section_props[m["sectionId"]] for m in self.members], dtype=float).reshape(-1, 2).T
+
+        L, c, s = member_geometry(xy[n1], xy[n2])
+        self.member_L = L
+        self.member_T = transformation_stack(c, s)
+        self.member_k_local = local_stiffness_stack(E, A, I, L)
+        self._member_EI = (E * I)[:, None]
+        self.member_mass = gamma * A / GRAVITY  # t/m
+        self._build_load_rows()
+
+    def _material_columns(self):
+        """
+        E and unit weight (kN/m³) per member.
+        """
+        props = {
+            mid: (mat["E"], mat.get("unitWeight") or DEFAULT_UNIT_WEIGHT) for mid, mat in self.materials.items()
+        }
+        return np.array([props[m["materialId"]] for m in self.members], dtype=float).reshape(-1, 2).T
+
+    def _build_load_rows(self):
+        # member uniform loads flattened to one row per load
+        load_rows = [(i, load.get("w", 0.0), load.get("type", "D"))
+                     for i, m in enumerate(self.members) for load in m.get("loads", [])]
+        self._load_member = np.array([r[0] for r in load_rows], dtype=int)
+        self._load_w = np.array([r[1] for r in load_rows], dtype=float)
+        self._load_types, self._load_type_index = np.unique(
+            np.array([r[2] for r in load_rows], dtype=str), return_inverse=True
+        )
+
+    # ================================
+    # Modal analysis + response spectrum
+    # ================================
+    def mass_matrix(self, mass="lumped", load_mass_factors=None):
+        """
+        Global mass matrix (t = kN·s²/m, CSR) from member self-weight, slab self-weight
+        and member loads times load_mass_factors (default: dead load only, {"D": 1.0}).
+        Loads and slabs are always lumped on the translational DOFs.
+        """
+        if mass not in MASS_TYPES:
+            raise ValueError(f"Unknown mass type: {mass}")
+        factors = {"D": 1.0} if load_mass_factors is None else load_mass_factors
+
+        trans = np.array(self.TRANSLATIONAL_DOFS)
+        end_dofs = self.member_dofs[:, np.concatenate([trans, trans + self.dofs_per_node])]
+        lumped = np.zeros(self.ndof)
+
+        if len(self._load_w):
+            scale = np.array([factors.get(t, 0.0) for t in self._load_types])[self._load_type_index]
+            m = self._load_member
+            np.add.at(lumped, end_dofs[m], (np.abs(self._load_w) * scale * self.member_L[m] / (2 * GRAVITY))[:, None])
+
+        # slab self-weight, split over the member ends like _distribute_slab_load
+        if self.slabs and len(self.members):
+            q = sum(slab["t"] * 25.0 * slab["w"] * slab["h"] for slab in self.slabs) * factors.get("D", 0.0)
+            np.add.at(lumped, end_dofs, q / GRAVITY / len(self.members) / 2)
+
+        if mass == "lumped":
+            np.add.at(lumped, end_dofs, (self.member_mass * self.member_L / 2)[:, None])
+            return sparse.diags(lumped).tocsr()
+
+        m_global = to_global(self.member_T, self._consistent_mass_local())
+        return (self._assemble_member_matrices(m_global, dense=False) + sparse.diags(lumped)).tocsr()
+
+    def _consistent_mass_local(self):
+        return consistent_mass_stack(self.member_mass, self.member_L)
+
+    def modal_analysis(self, n_modes=12, mass="lumped", load_mass_factors=None):
+        """
+        Lowest natural modes of K φ = ω² M φ on the free DOFs: shift-invert Lanczos
+        around 0 reusing this model's factorized Kff as the inverse operator (a dense
+        symmetric eigen-solve for models on the dense solver).
+        Shapes are mass-normalized (ndof, n); participation factors per direction
+        are Γ = φᵀ M r for the unit ground displacement r.
+        """
+        if self._factor is None:
+            self._factorize()
+        free = self.free_dofs
+        nf = len(free)
+
+        M_ff = self.mass_matrix(mass, load_mass_factors)[free][:, free].tocsr()
+        M_ff.eliminate_zeros()
+        n_massive = int(np.count_nonzero(np.diff(M_ff.indptr)))
+
+        K = self._assemble_stiffness()
+        if self.solver == "dense":
+            # small model: M x = μ K x with K positive definite, μ = 1/ω² (M may be singular)
+            k = min(int(n_modes), n_massive)
+            if k < 1:
+                raise ValueError("Model has no free DOFs with mass")
+            mu, vectors = eigh(M_ff.toarray(), K[np.ix_(free, free)], subset_by_index=[nf - k, nf - 1])
+            eigenvalues = 1.0 / mu
+        else:
+            k = min(int(n_modes), n_massive - 1, nf - 1)
+            if k < 1:
+                raise ValueError("Model has no free DOFs with mass")
+            OPinv = LinearOperator((nf, nf), matvec=self._factor, dtype=float)
+            v0 = np.random.default_rng(0).random(nf)
+            eigenvalues, vectors = eigsh(
+                K[free][:, free], k=k, M=M_ff, sigma=0.0, which="LM", OPinv=OPinv, v0=v0
+            )
+
+        order = np.argsort(eigenvalues)
+        eigenvalues, vectors = eigenvalues[order], vectors[:, order]
+        vectors /= np.sqrt(np.einsum("ij,ij->j", vectors, M_ff @ vectors))
+        # deterministic sign: largest component positive
+        peak = vectors[np.abs(vectors).argmax(axis=0), np.arange(k)]
+        vectors *= np.where(peak < 0, -1.0, 1.0)
+
+        shapes = np.zeros((self.ndof, k))
+        shapes[free] = vectors
+        omega = np.sqrt(np.maximum(eigenvalues, 0.0))
+
+        # participation per direction: r_d = 1 on that translational DOF of every node
+        local = free % self.dofs_per_node
+        r = np.array([local == d for d in self.TRANSLATIONAL_DOFS], dtype=float)  # (ndir, nf)
+        Mr = (M_ff @ r.T).T
+        participation = vectors.T @ Mr.T  # (k, ndir)
+        total_mass = np.einsum("ij,ij->i", r, Mr)
 
         return {
-            "displacements": self._format_displacements(U),
-            "member_forces": member_forces,
+            "omega": omega,
+            "periods": 2 * np.pi / omega,
+            "shapes": shapes,
+            "participation": participation.T,
+            "effective_mass": participation.T**2,
+            "total_mass": total_mass,
+            "mass": mass,
         }
 
+    def response_spectrum(self, modes, spectrum, direction="X", combination="CQC", damping=0.05):
+        """
+        Peak response to a ground motion along direction, spectrum(periods) -> Sa (g).
+        Each mode's static response u_n = φ_n Γ_n Sa_n g / ω_n² is combined by SRSS
+        or CQC (displacements, member end forces, reactions, base shear).
+        """
+        d = self.DIRECTIONS.index(direction)
+        omega = modes["omega"]
+        Sa = np.asarray(spectrum(modes["periods"]), dtype=float)
+
+        q = modes["participation"][d] * Sa * GRAVITY / omega**2
+        U = modes["shapes"] * q
+        forces = self._recover_case_forces(U)
+        R = self._reactions(U, np.zeros_like(U))
+        base_shear = R[self.fixed_dofs % self.dofs_per_node == self.TRANSLATIONAL_DOFS[d]].sum(axis=0)
+
+        rho = cqc_correlation(omega, damping) if combination == "CQC" else None
+        return {
+            "direction": direction,
+            "combination": combination,
+            "spectral_accelerations": [round(float(v), 5) for v in Sa],
+            "base_shear": float(combine_modal(base_shear, combination, rho)),
+            "displacements": self._format_displacements(combine_modal(U, combination, rho)),
+            "member_forces": self._format_member_forces(combine_modal(forces, combination, rho)),
+            "reactions": self._format_reactions(combine_modal(R, combination, rho)),
+        }
+
+    def format_modes(self, modes, include_shapes=False):
+        """
+        Mode table (period, frequency, participation and mass ratios per direction).
+        """
+        ratios = modes["effective_mass"] / np.where(modes["total_mass"] > 0, modes["total_mass"], 1.0)[:, None]
+        cumulative = np.cumsum(ratios, axis=1)
+        table = []
+        for n, (T, w) in enumerate(zip(modes["periods"].tolist(), modes["omega"].tolist())):
+            row = {
+                "mode": n + 1,
+                "period": round(T, 5),
+                "frequency": round(w / (2 * np.pi), 5),
+                "participation": {k: round(float(modes["participation"][i, n]), 5) for i, k in enumerate(self.DIRECTIONS)},
+                "mass_ratio": {k: round(float(ratios[i, n]), 5) for i, k in enumerate(self.DIRECTIONS)},
+                "cumulative_mass_ratio": {k: round(float(cumulative[i, n]), 5) for i, k in enumerate(self.DIRECTIONS)},
+            }
+            if include_shapes:
+                row["shape"] = self._format_displacements(modes["shapes"][:, n])
+            table.append(row)
+        return table
+
     # ================================
     # Helpers
     # ================================
-    def _assemble_member(self, K, F, member, load_factors):
-        n1 = self.nodes[member["n1"]]
-        n2 = self.nodes[member["n2"]]
-
-        x1, y1 = n1["x"], n1["y"]
-        x2, y2 = n2["x"], n2["y"]
-
-        L = np.sqrt((x2-x1)**2 + (y2-y1)**2)
-        c, s = (x2-x1)/L, (y2-y1)/L
-
-        sec = self.sections[member["sectionId"]]
-        mat = self.materials[member["materialId"]]
-
-        E = mat["E"]
-        A = sec["params"].get("A", sec["params"]["bw"]*sec["params"]["h"])
-        I = (sec["params"]["bw"]*sec["params"]["h"]**3)/12.0
-
-        # local stiffness matrix (6x6)
-        k_local = np.array([
-            [ A*E/L,        0,              0, -A*E/L,        0,              0],
-            [ 0,     12*E*I/L**3,  6*E*I/L**2,  0, -12*E*I/L**3,  6*E*I/L**2],
-            [ 0,      6*E*I/L**2, 4*E*I/L,     0,  -6*E*I/L**2, 2*E*I/L],
-            [-A*E/L,        0,              0,  A*E/L,        0,              0],
-            [ 0, -12*E*I/L**3, -6*E*I/L**2,  0,  12*E*I/L**3, -6*E*I/L**2],
-            [ 0,      6*E*I/L**2, 2*E*I/L,     0,  -6*E*I/L**2, 4*E*I/L]
-        ])
-
-        # transformation matrix
-        T = np.array([
-            [ c,  s, 0,  0, 0, 0],
-            [-s,  c, 0,  0, 0, 0],
-            [ 0,  0, 1,  0, 0, 0],
-            [ 0,  0, 0,  c, s, 0],
-            [ 0,  0, 0, -s, c, 0],
-            [ 0,  0, 0,  0, 0, 1]
-        ])
-        k_global = T.T @ k_local @ T
-
-        # assemble into K
-        dofs = self.node_dofs[member["n1"]] + self.node_dofs[member["n2"]]
-        for i in range(6):
-            for j in range(6):
-                K[dofs[i], dofs[j]] += k_global[i, j]
-
-        # add uniform load (scaled)
-        for load in member.get("loads", []):
-            w = load.get("w", 0.0)  # kN/m
-            load_type = load.get("type", "D")  # default = Dead
-            factor = load_factors.get(load_type, 1.0)
-            w_eff = w * factor
-
-            # fixed-end forces
-            f_local = np.array([0, w_eff*L/2, w_eff*L**2/12, 0, w_eff*L/2, -w_eff*L**2/12])
-            f_global = T.T @ f_local
-            for i in range(6):
-                F[dofs[i]] += f_global[i]
-
-    def _distribute_slab_load(self, F, slab, load_factors):
+    def _assemble_stiffness(self):
+        """
+        Global K from the (M, 2d, 2d) member stack (d DOFs per node). Returns a
+        dense ndarray for the dense solver and CSR otherwise.
+        """
+        k_global = to_global(self.member_T, self.member_k_local)
+        return self._assemble_member_matrices(k_global, dense=self.solver == "dense")
+
+    def _assemble_member_matrices(self, stack, dense):
+        """
+        Expands a (M, 2d, 2d) global member stack to COO triplets and sums them.
+        """
+        n = self.member_dofs.shape[1]
+        rows = np.repeat(self.member_dofs, n, axis=1).ravel()
+        cols = np.tile(self.member_dofs, (1, n)).ravel()
+        vals = stack.ravel()
+
+        if not dense:
+            # duplicate (row, col) entries are summed on conversion
+            return sparse.coo_matrix((vals, (rows, cols)), shape=(self.ndof, self.ndof)).tocsr()
+
+        K = np.zeros((self.ndof, self.ndof))
+        np.add.at(K, (rows, cols), vals)
+        return K
+
+    def load_cases(self):
+        """
+        Load types present in the model (D, L, W, E, S ...); slabs always add D.
+        """
+        cases = set(self._load_types.tolist())
+        if self.slabs:
+            cases.add("D")
+        return sorted(cases)
+
+    def live_load_patterns(self):
+        """
+        Pattern live loading (loads.patternLive, on by default): {case: load-row scale}
+        with the L loads of horizontal members split by span. L_P1 / L_P2 load the
+        two halves of a checkerboard over span, grid line and level; L_AX1, L_AX2 ...
+        (L_AZ1 ... for beams along z) load two adjacent spans on every level.
+        L on columns and inclined members is part of every pattern.
+        """
+        if self._live_patterns is None:
+            self._live_patterns = self._build_live_patterns() if self.loads.get("patternLive", True) else {}
+        return self._live_patterns
+
+    def _build_live_patterns(self):
+        live = self._load_types[self._load_type_index] == "L"
+        if not live.any():
+            return {}
+
+        xyz = np.array(
+            [[n["x"], n["y"], n.get("z", 0.0)] for n in self.nodes.values()], dtype=float
+        ).reshape(-1, 3)
+        p1, p2 = xyz[self._n1], xyz[self._n2]
+        d = p2 - p1
+        horizontal = np.abs(d[:, 1]) <= 1e-6 * np.linalg.norm(d, axis=1)
+        along_x = np.abs(d[:, 0]) >= np.abs(d[:, 2])
+        mid = np.round((p1 + p2) / 2, 6)
+
+        # span / grid line / level ranks of every beam, per beam direction
+        parity = np.full(len(self.members), -1)
+        span = np.full(len(self.members), -1)
+        adjacent = []
+        for axis, other, label, beams in ((0, 2, "X", horizontal & along_x), (2, 0, "Z", horizontal & ~along_x)):
+            if not beams.any():
+                continue
+            ranks = [np.unique(mid[beams, k], return_inverse=True)[1] for k in (axis, other, 1)]
+            parity[beams] = sum(ranks) % 2
+            span[beams] = ranks[0]
+            n_spans = ranks[0].max() + 1
+            # with two spans the adjacent pair is the full load
+            if n_spans >= 3:
+                adjacent += [(f"L_A{label}{k + 1}", beams & ((span == k) | (span == k + 1))) for k in range(n_spans - 1)]
+
+        member = self._load_member
+        always = live & ~horizontal[member]
+        patterns = {}
+        halves = [(f"L_P{p + 1}", parity == p) for p in (0, 1)]
+        if all((live & mask[member]).any() for _, mask in halves):
+            patterns.update((name, (always | (live & mask[member])).astype(float)) for name, mask in halves)
+        patterns.update((name, (always | (live & mask[member])).astype(float)) for name, mask in adjacent)
+        return patterns
+
+    def _basic_load_cases(self):
+        """
+        Load cases solved as one RHS block: the model's load types, then the live-load patterns.
+        """
+        return self.load_cases() + list(self.live_load_patterns())
+
+    def _case_row_scales(self, cases):
+        """
+        (load rows, ncases) factor of every member load row in each basic case.
+        """
+        row_types = self._load_types[self._load_type_index]
+        patterns = self.live_load_patterns()
+        scales = np.zeros((len(row_types), len(cases)))
+        for j, case in enumerate(cases):
+            scales[:, j] = patterns[case] if case in patterns else row_types == case
+        return scales
+
+    def _basic_load_vectors(self, cases, row_scales=None):
+        """
+        One unfactored load vector per basic case, stacked as columns (ndof, ncases).
+        """
+        if row_scales is None:
+            row_scales = self._case_row_scales(cases)
+        F = np.zeros((self.ndof, len(cases)))
+        for j, case in enumerate(cases):
+            F[:, j] = self._assemble_row_loads(row_scales[:, j], float(case == "D"))
+        return F
+
+    def _member_loads(self, row_scales):
+        """
+        (M, 1, n) uniform load w per member for load row scales (rows, n).
+        """
+        W = np.zeros((len(self.members), 1, row_scales.shape[1]))
+        np.add.at(W[:, 0], self._load_member, self._load_w[:, None] * row_scales)
+        return W
+
+    def _assemble_row_loads(self, row_scale, dead_factor):
+        """
+        Load vector with every member load row scaled by row_scale and the slab
+        self-weight by dead_factor.
+        """
+        F = np.zeros(self.ndof)
+
+        if len(self._load_w):
+            m = self._load_member
+            f_local = self._member_load_fef(row_scale)
+            f_global = np.einsum("kji,kj->ki", self.member_T[m], f_local)
+            np.add.at(F, self.member_dofs[m], f_global)
+
+        # Slab loads -> distribute to beams
+        for slab in self.slabs:
+            self._distribute_slab_load(F, slab, dead_factor)
+        return F
+
+    def _member_load_fef(self, scale):
+        """
+        Local fixed-end forces of every member load row, each scaled by its load factor.
+        """
+        return uniform_load_fef(self._load_w * scale, self.member_L[self._load_member])
+
+    def _distribute_slab_load(self, F, slab, dead_factor):
         # self-weight of slab as Dead load
         q = slab["t"] * 25.0 * slab["w"] * slab["h"]  # kN تقريبية
-        q_eff = q * load_factors.get("D", 1.0)
+        q_eff = q * dead_factor
 
         per_member = q_eff / max(1, len(self.members))
-        for member in self.members:
-            dofs = self.node_dofs[member["n1"]] + self.node_dofs[member["n2"]]
-            F[dofs[1]] += -per_member/2
-            F[dofs[4]] += -per_member/2
+        # vertical (uy) DOF at both ends
+        np.add.at(F, self.member_dofs[:, 1], -per_member/2)
+        np.add.at(F, self.member_dofs[:, self.dofs_per_node + 1], -per_member/2)
 
     def _get_support_dofs(self):
         fixed = []
         for nid, node in self.nodes.items():
             dofs = self.node_dofs[nid]
-            if node["support"] == "fix":
-                fixed += dofs
-            elif node["support"] == "pin":
-                fixed += [dofs[0], dofs[1]]
-            elif node["support"] == "roller":
-                fixed += [dofs[1]]
+            fixed += [dofs[k] for k in self.SUPPORT_DOFS.get(node["support"], ())]
         return fixed
 
-    def _recover_forces(self, member, U):
+    def _recover_case_forces(self, U):
         """
         استرجاع القوى الداخلية (N, V, M) لكل عضو
+        End-1 forces for all members in one batched product: (M, 3), or
+        (M, 3, ncases) when U is a block of load cases.
         """
-        n1, n2 = self.nodes[member["n1"]], self.nodes[member["n2"]]
-        x1, y1, x2, y2 = n1["x"], n1["y"], n2["x"], n2["y"]
-        L = np.sqrt((x2-x1)**2 + (y2-y1)**2)
-
-        dofs = self.node_dofs[member["n1"]] + self.node_dofs[member["n2"]]
-        u_elem = U[dofs]
-
-        c, s = (x2-x1)/L, (y2-y1)/L
-        T = np.array([
-            [ c,  s, 0,  0, 0, 0],
-            [-s,  c, 0,  0, 0, 0],
-            [ 0,  0, 1,  0, 0, 0],
-            [ 0,  0, 0,  c, s, 0],
-            [ 0,  0, 0, -s, c, 0],
-            [ 0,  0, 0,  0, 0, 1]
-        ])
-
-        sec = self.sections[member["sectionId"]]
-        mat = self.materials[member["materialId"]]
-        E = mat["E"]
-        A = sec["params"].get("A", sec["params"]["bw"]*sec["params"]["h"])
-        I = (sec["params"]["bw"]*sec["params"]["h"]**3)/12.0
-
-        k_local = np.array([
-            [ A*E/L,        0,              0, -A*E/L,        0,              0],
-            [ 0,     12*E*I/L**3,  6*E*I/L**2,  0, -12*E*I/L**3,  6*E*I/L**2],
-            [ 0,      6*E*I/L**2, 4*E*I/L,     0,  -6*E*I/L**2, 2*E*I/L],
-            [-A*E/L,        0,              0,  A*E/L,        0,              0],
-            [ 0, -12*E*I/L**3, -6*E*I/L**2,  0,  12*E*I/L**3, -6*E*I/L**2],
-            [ 0,      6*E*I/L**2, 2*E*I/L,     0,  -6*E*I/L**2, 4*E*I/L]
-        ])
-
-        u_local = T @ u_elem
-        f_local = k_local @ u_local
-
-        N, V, M = f_local[0], f_local[1], f_local[2]
-        return {"Nmax": float(N), "Vmax": float(V), "Mmax": float(M)}
+        f_local = end_forces(self.member_T, self.member_k_local, U[self.member_dofs])
+        return f_local[:, :3]
+
+    def _format_member_forces(self, forces):
+        return self._format_member_values(forces, self.MEMBER_FORCE_KEYS)
+
+    def _format_member_values(self, values, keys):
+        return {member["id"]: dict(zip(keys, row)) for member, row in zip(self.members, values.tolist())}
+
+    def _format_reactions(self, R):
+        reactions = {}
+        values = R.tolist()
+        for nid, key, row in self._reaction_rows:
+            reactions.setdefault(nid, {})[key] = values[row]
+        return reactions
 
     def _format_displacements(self, U):
-        disp = {}
-        for nid, dofs in self.node_dofs.items():
-            disp[nid] = {"ux": float(U[dofs[0]]), "uy": float(U[dofs[1]]), "rz": float(U[dofs[2]])}
-        return disp
-
-    def _parse_load_combination(self, expr: str):
-        """
-        Parse load combination expression like '1.2D+1.6L+0.9E'
-        """
-        factors = {}
-        terms = expr.replace("-", "+-").split("+")
-        for t in terms:
-            t = t.strip()
-            if not t: continue
-            if t[-1].isalpha():
-                factor, ltype = float(t[:-1]), t[-1]
-                factors[ltype] = factor
-        return factors
+        keys = self.DISPLACEMENT_KEYS
+        return {nid: dict(zip(keys, row)) for nid, row in zip(self.nodes, U[self._node_dof_table].tolist())}
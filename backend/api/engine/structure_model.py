@@ -0,0 +1,69 @@
+import numpy as np
+
+# ================================
+# Indexed structure model (built once per request)
+# ================================
+
+class IndexedStructure:
+    """
+    Structure JSON indexed by id, plus per-member property columns
+    (bw, h, cover, d, fc, fy) so code handlers can run design checks
+    over all members at once instead of searching lists per member.
+    """
+
+    def __init__(self, structure: dict):
+        self.structure = structure
+        self.members = {m["id"]: m for m in structure["members"]}
+        self.sections = {s["id"]: s for s in structure["sections"]}
+        self.materials = {m["id"]: m for m in structure["materials"]}
+
+        self.member_ids = list(self.members)
+        self.member_index = {mid: i for i, mid in enumerate(self.member_ids)}
+
+        params = [self.sections[m["sectionId"]]["params"] for m in self.members.values()]
+        mats = [self.materials[m["materialId"]] for m in self.members.values()]
+
+        self.bw = np.array([p.get("bw", 0.3) for p in params], dtype=float)
+        self.h = np.array([p.get("h", 0.6) for p in params], dtype=float)
+        self.cover = np.array([p.get("cover", 0.04) for p in params], dtype=float)
+        self.d = self.h - self.cover
+
+        self.fc = np.array([m["fc"] for m in mats], dtype=float)
+        self.fy = np.array([m["fy"] for m in mats], dtype=float)
+
+    def force_columns(self, member_forces: dict):
+        """
+        |Mu|, |Vu|, |Nu| arrays aligned with member_ids.
+        """
+        forces = np.array(
+            [[f["Mmax"], f["Vmax"], f["Nmax"]] for f in (member_forces[mid] for mid in self.member_ids)],
+            dtype=float,
+        ).reshape(-1, 3)
+        Mu, Vu, Nu = np.abs(forces).T
+        return Mu, Vu, Nu
+
+    def design_table(self, Mu, Vu, Nu, As_req, As_prov, shear_ok, axial_ok, note=None):
+        """
+        Per-member design dicts (same keys the frontend reads) from check arrays.
+        """
+        overall_ok = shear_ok & axial_ok
+        columns = zip(
+            self.member_ids, Mu.tolist(), Vu.tolist(), Nu.tolist(), As_req.tolist(), As_prov.tolist(),
+            shear_ok.tolist(), axial_ok.tolist(), overall_ok.tolist(),
+        )
+
+        design = {}
+        for mid, mu, vu, nu, as_req, as_prov, s_ok, a_ok, ok in columns:
+            design[mid] = {
+                "Mu": round(mu, 2),
+                "Vu": round(vu, 2),
+                "Nu": round(nu, 2),
+                "As_required": round(as_req, 2),
+                "As_provided": round(as_prov, 2),
+                "Shear_OK": s_ok,
+                "Axial_OK": a_ok,
+                "Overall_OK": ok
+            }
+            if note:
+                design[mid]["Note"] = note
+        return design
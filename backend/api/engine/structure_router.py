@@ -2,12 +2,34 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 
-from .structure_analyzer import StructureAnalyzer
+from .analyzers import ANALYZERS, create_analyzer
+from .structure_model import IndexedStructure
 from .code_router import get_code_handler
 from .load_combination import generate_combinations   # ⬅️ جديد
+from .analysis_session import AnalysisSession, session_store
+from .response_spectrum import MODAL_COMBINATIONS
+from .seismic_router import get_seismic_handler
+from .structure_analyzer import ANALYSIS_MODES, DEFAULT_STATIONS, MASS_TYPES, MAX_STATIONS
+from .time_history import (
+    RECORD_CHUNK_SIZE,
+    HistoryLimitError,
+    array_chunks,
+    check_history_size,
+    ground_motion_chunks,
+    modal_time_history,
+    record_path,
+    record_steps,
+    record_time_step,
+)
+from ..utils.executor import compute_executor, session_executor
+from ..utils.result_cache import result_cache, is_success
 
 router = APIRouter()
 
+OUTPUT_MODES = ("envelope", "full")
+# results key of the compact response (one pseudo-combination holding the envelope)
+ENVELOPE_ID = "ENVELOPE"
+
 # ================================
 # Pydantic Models (نفس JSON القادم من الفرونت)
 # ================================
@@ -15,6 +37,7 @@ class Node(BaseModel):
     id: str
     x: float
     y: float
+    z: float = 0.0  # 3D models only
     support: str = "free"  # pin, fix, roller, free
 
 class Member(BaseModel):
@@ -24,7 +47,8 @@ class Member(BaseModel):
     type: str = "beam"  # beam, column
     sectionId: str
     materialId: str
-    loads: Optional[List[Dict]] = []
+    loads: Optional[List[Dict]] = []  # {w (local y), wz (local z, 3D), type}
+    orientation: Optional[List[float]] = None  # 3D: vector in the local x-z plane (default global Z)
 
 class Slab(BaseModel):
     id: str
@@ -41,6 +65,8 @@ class Material(BaseModel):
     fc: float
     fy: float
     E: float
+    nu: Optional[float] = None  # 3D torsion: G = E / 2(1 + nu)
+    unitWeight: Optional[float] = None  # kN/m³ for the modal mass (default 25)
 
 class Section(BaseModel):
     id: str
@@ -55,45 +81,345 @@ class LoadCombination(BaseModel):
 
 class StructureModel(BaseModel):
     code: str
+    dimension: int = 2  # 2 = plane frame (x, y), 3 = space frame (x, y, z)
     units: Dict
     materials: List[Material]
     sections: List[Section]
     nodes: List[Node]
     members: List[Member]
     slabs: List[Slab]
+    # optional: psi {case: [ψ0, ψ1, ψ2]} overrides, patternLive / pruneCombinations (default true)
     loads: Dict
+    output: str = "envelope"  # "envelope" (compact, default) | "full" (results per combination)
+    stations: int = DEFAULT_STATIONS  # points per member (ends included) for section forces / deflections
+    diagrams: bool = False  # station values per member (envelope: max / min per station)
+    analysis: str = "linear"  # "linear" | "p-delta" (second order, iterated per combination)
+    pDelta: Optional[Dict] = None  # P-Delta controls: tolerance, maxIterations
+
+MAX_MODES = 200
+
+class ModalAnalysisInput(BaseModel):
+    structure: StructureModel
+    modes: int = 12
+    mass: str = "lumped"  # lumped, consistent
+    loadMassFactors: Optional[Dict[str, float]] = None  # member load type -> mass factor (default {"D": 1.0})
+    includeShapes: bool = False
+    # response spectrum (optional): seismic data for the code's seismic handler (zone, soil, ..., R)
+    seismic: Optional[Dict] = None
+    directions: List[str] = ["X"]
+    combination: str = "CQC"  # CQC, SRSS
+    damping: float = 0.05
+
+class TimeHistoryInput(BaseModel):
+    structure: StructureModel
+    # ground acceleration in g: a record file in STRUCTICODE_RECORDS_DIR or inline values
+    record: Optional[str] = None
+    acceleration: Optional[List[float]] = None
+    dt: Optional[float] = None  # s (read from an .AT2 header when omitted)
+    scale: float = 1.0
+    direction: str = "X"
+    modes: int = 12
+    mass: str = "lumped"
+    loadMassFactors: Optional[Dict[str, float]] = None
+    damping: float = 0.05
+    beta: float = 0.25  # Newmark β (1/4 average, 1/6 linear acceleration)
+    gamma: float = 0.5
+    historyStep: int = 0  # keep every n-th step of the histories (0 = envelopes only)
+    historyNodes: List[str] = []
 
 
 # ================================
-# Endpoint
+# Structure analysis (sync, runs inside the compute executor)
 # ================================
-@router.post("/structure/analyze")
-def analyze_structure(structure: StructureModel):
-    try:
-        code = structure.code.upper()
-        handler = get_code_handler(code)
+def run_structure_analysis(structure_dict: dict):
+    code = structure_dict["code"].upper()
+    handler = get_code_handler(code)
 
-        if not handler:
-            raise HTTPException(status_code=400, detail=f"Unsupported code: {code}")
+    # ⬇️ استدعاء StructureAnalyzer (2D) / SpaceFrameAnalyzer (3D)
+    analyzer = create_analyzer(structure_dict)
+    return _design_response(code, handler, structure_dict, analyzer)
 
-        # ⬇️ توليد load combinations حسب الكود
-        structure_dict = structure.dict()
-        structure_dict["loads"]["combinations"] = generate_combinations(code)
 
-        # ⬇️ استدعاء StructureAnalyzer
-        analyzer = StructureAnalyzer(structure_dict)
-        raw_results = analyzer.analyze_combinations()
-
-        # ⬇️ تمرير النتائج للهاندلر (checks لكل combo)
-        results = {}
-        for combo_id, combo_result in raw_results.items():
-            results[combo_id] = handler.analyze_structure(structure_dict, combo_result)
+def _design_response(code, handler, structure_dict, analyzer):
+    # ⬇️ توليد load combinations حسب الكود والـ cases الموجودة بالموديل
+    loads = structure_dict["loads"]
+    combos = generate_combinations(
+        code, analyzer.load_cases(), list(analyzer.live_load_patterns()), psi=loads.get("psi")
+    )
+    loads["combinations"] = combos
+    model = IndexedStructure(structure_dict)
 
+    if structure_dict.get("output", "envelope") == "full":
+        # كل combo لحال (بعد ما نشيل الـ combos اللي ما بتحكم ولا عضو،
+        # loads.pruneCombinations = false يوقفها)
+        raw_results = analyzer.analyze_combinations(
+            combos, prune=loads.get("pruneCombinations", True), diagrams=structure_dict.get("diagrams", False)
+        )
+        results = handler.analyze_structure(structure_dict, raw_results, model)
         return {
             "status": "success",
             "code": code,
-            "results": results
+            "results": results,
+            "metadata": analyzer.metadata
+        }
+
+    # ⬇️ compact: envelope على كل الـ combos، والـ design checks مرة وحدة على
+    # أكبر |M|, |V|, |N| لكل عضو (الـ checks monotonic فيهم)
+    envelope = analyzer.analyze_envelope(combos, diagrams=structure_dict.get("diagrams", False))
+    governing = envelope.pop("governing")
+    governing_combos = envelope.pop("governing_combos")
+    raw_results = {ENVELOPE_ID: {"name": "Envelope", "expr": "envelope", **governing}}
+    results = handler.analyze_structure(structure_dict, raw_results, model)
+
+    member_combos = governing_combos["member_forces"]
+    for mid, design in results[ENVELOPE_ID].get("design", {}).items():
+        combos_of = member_combos[mid]
+        design["governing"] = {"Mu": combos_of["Mmax"], "Vu": combos_of["Vmax"], "Nu": combos_of["Nmax"]}
+    envelope["governing_combos"] = governing_combos
+
+    return {
+        "status": "success",
+        "code": code,
+        "results": results,
+        "envelope": envelope,
+        "metadata": analyzer.metadata
+    }
+
+
+# ================================
+# Modal + response spectrum analysis (sync, runs inside the compute executor)
+# ================================
+def run_modal_analysis(payload: dict):
+    structure_dict = payload["structure"]
+    code = structure_dict["code"].upper()
+
+    analyzer = create_analyzer(structure_dict)
+    modes = analyzer.modal_analysis(payload["modes"], payload["mass"], payload["loadMassFactors"])
+
+    response = {
+        "status": "success",
+        "code": code,
+        "modes": analyzer.format_modes(modes, payload["includeShapes"]),
+        "metadata": {**analyzer.metadata, "mass": payload["mass"], "n_modes": len(modes["omega"])},
+    }
+
+    seismic = payload["seismic"]
+    if seismic is not None:
+        handler = get_seismic_handler(code)
+
+        def spectrum(periods):
+            return handler.spectrum(periods, seismic)
+
+        response["spectrum"] = {**handler.spectrum_parameters(seismic), "R": float(seismic.get("R", 1.0))}
+        response["response_spectrum"] = {
+            direction: analyzer.response_spectrum(
+                modes, spectrum, direction, payload["combination"], payload["damping"]
+            )
+            for direction in payload["directions"]
         }
+    return response
+
+
+# ================================
+# Time history (modal superposition, record streamed in chunks)
+# ================================
+def run_time_history_analysis(payload: dict, path: str | None = None, dt: float | None = None):
+    structure_dict = payload["structure"]
+    analyzer = create_analyzer(structure_dict)
+    modes = analyzer.modal_analysis(payload["modes"], payload["mass"], payload["loadMassFactors"])
+
+    if path is not None:
+        chunks = ground_motion_chunks(path, RECORD_CHUNK_SIZE)
+    else:
+        chunks = array_chunks(payload["acceleration"], RECORD_CHUNK_SIZE)
+
+    result = modal_time_history(
+        analyzer, modes, chunks, dt,
+        direction=payload["direction"], damping=payload["damping"],
+        beta=payload["beta"], gamma=payload["gamma"], scale=payload["scale"],
+        history_step=payload["historyStep"], history_nodes=payload["historyNodes"],
+    )
+    return {
+        "status": "success",
+        "code": structure_dict["code"].upper(),
+        "modes": analyzer.format_modes(modes),
+        "time_history": result,
+        "metadata": {**analyzer.metadata, "mass": payload["mass"], "n_modes": len(modes["omega"])},
+    }
+
+
+# ================================
+# Incremental sessions (run on the session thread pool: the factorization
+# lives in this process and is reused across edits)
+# ================================
+def run_session_analysis(structure_dict: dict, session_id: str | None = None):
+    code = structure_dict["code"].upper()
+    handler = get_code_handler(code)
+
+    # the analyzer is shared session state: design runs under the session lock too,
+    # and a new session is locked before session_store makes it visible
+    if session_id is None:
+        session = AnalysisSession(structure_dict)
+        with session.lock:
+            session_store.add(session)
+            return _session_response(code, handler, structure_dict, session, session.analyzer)
+
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired session: {session_id}")
+    with session.lock:
+        analyzer = session.update(structure_dict)
+        return _session_response(code, handler, structure_dict, session, analyzer)
+
+
+def _session_response(code, handler, structure_dict, session, analyzer):
+    response = _design_response(code, handler, structure_dict, analyzer)
+    response["session"] = {"id": session.id, **session.last_update}
+    return response
+
 
+# ================================
+# Endpoint
+# ================================
+def _validate_structure(structure: StructureModel):
+    code = structure.code.upper()
+    # element-only codes (Steel) have no whole-structure design
+    if not hasattr(get_code_handler(code), "analyze_structure"):
+        raise HTTPException(status_code=400, detail=f"Unsupported code: {code}")
+    if structure.dimension not in ANALYZERS:
+        raise HTTPException(status_code=400, detail=f"Unsupported structure dimension: {structure.dimension}")
+    if structure.output not in OUTPUT_MODES:
+        raise HTTPException(status_code=400, detail=f"Unsupported output mode: {structure.output}")
+    if not 2 <= structure.stations <= MAX_STATIONS:
+        raise HTTPException(status_code=400, detail=f"stations must be between 2 and {MAX_STATIONS}")
+    if structure.analysis not in ANALYSIS_MODES:
+        raise HTTPException(status_code=400, detail=f"Unsupported analysis mode: {structure.analysis}")
+
+
+@router.post("/structure/analyze")
+async def analyze_structure(structure: StructureModel):
+    _validate_structure(structure)
+
+    structure_dict = structure.dict()
+    try:
+        return await result_cache.get_or_run(
+            "structure", structure_dict,
+            lambda: compute_executor.run(run_structure_analysis, structure_dict),
+            cacheable=is_success,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/structure/modal")
+async def analyze_structure_modal(payload: ModalAnalysisInput):
+    structure = payload.structure
+    _validate_structure(structure)
+
+    analyzer_class = ANALYZERS[structure.dimension]
+    if payload.mass not in MASS_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported mass type: {payload.mass}")
+    if not 1 <= payload.modes <= MAX_MODES:
+        raise HTTPException(status_code=400, detail=f"modes must be between 1 and {MAX_MODES}")
+    if payload.seismic is not None:
+        if not get_seismic_handler(structure.code):
+            raise HTTPException(status_code=400, detail=f"No seismic handler for code: {structure.code}")
+        if payload.combination not in MODAL_COMBINATIONS:
+            raise HTTPException(status_code=400, detail=f"Unsupported modal combination: {payload.combination}")
+        unknown = [d for d in payload.directions if d not in analyzer_class.DIRECTIONS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unsupported directions: {unknown}")
+
+    payload_dict = payload.dict()
+    try:
+        return await result_cache.get_or_run(
+            "modal", payload_dict,
+            lambda: compute_executor.run(run_modal_analysis, payload_dict),
+            cacheable=is_success,
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/structure/time-history")
+async def analyze_structure_time_history(payload: TimeHistoryInput):
+    structure = payload.structure
+    _validate_structure(structure)
+
+    if (payload.record is None) == (payload.acceleration is None):
+        raise HTTPException(status_code=400, detail="Give either a record name or acceleration values")
+    if payload.direction not in ANALYZERS[structure.dimension].DIRECTIONS:
+        raise HTTPException(status_code=400, detail=f"Unsupported direction: {payload.direction}")
+    if payload.mass not in MASS_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported mass type: {payload.mass}")
+    if not 1 <= payload.modes <= MAX_MODES:
+        raise HTTPException(status_code=400, detail=f"modes must be between 1 and {MAX_MODES}")
+    if payload.beta <= 0 or payload.gamma <= 0:
+        raise HTTPException(status_code=400, detail="Newmark beta and gamma must be positive")
+    if not 0 <= payload.damping < 1:
+        raise HTTPException(status_code=400, detail="damping must be in [0, 1)")
+    if payload.historyStep < 0:
+        raise HTTPException(status_code=400, detail="historyStep must be >= 0")
+    node_ids = {n.id for n in structure.nodes}
+    unknown = [nid for nid in payload.historyNodes if nid not in node_ids]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown history nodes: {unknown}")
+
+    path, dt = None, payload.dt
+    if payload.record is not None:
+        try:
+            path = record_path(payload.record)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        dt = dt or record_time_step(path)
+    if not dt or dt <= 0:
+        raise HTTPException(status_code=400, detail="Time step dt is required")
+
+    # text records are only counted while streaming (HistoryLimitError below)
+    steps = len(payload.acceleration) if path is None else record_steps(path)
+    try:
+        if steps is not None:
+            check_history_size(steps, payload.historyStep, len(payload.historyNodes),
+                               ANALYZERS[structure.dimension].DOFS_PER_NODE)
+        # not cached: a record file can change under the same name
+        return await compute_executor.run(run_time_history_analysis, payload.dict(), path, dt)
+    except HistoryLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _run_session(structure: StructureModel, session_id: str | None = None):
+    _validate_structure(structure)
+
+    try:
+        return await session_executor.run(run_session_analysis, structure.dict(), session_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/structure/session")
+async def create_structure_session(structure: StructureModel):
+    return await _run_session(structure)
+
+
+@router.put("/structure/session/{session_id}")
+async def update_structure_session(session_id: str, structure: StructureModel):
+    return await _run_session(structure, session_id)
+
+
+@router.delete("/structure/session/{session_id}")
+async def delete_structure_session(session_id: str):
+    if not session_store.remove(session_id):
+        raise HTTPException(status_code=404, detail=f"Unknown or expired session: {session_id}")
+    return {"status": "success", "session_id": session_id}
@@ -0,0 +1,303 @@
+import os
+import re
+
+import numpy as np
+
+from .response_spectrum import GRAVITY
+
+# ================================
+# Linear time-history analysis (modal superposition + Newmark-β)
+# ================================
+# الـ record بينقرأ على chunks (ما بنحمّل الملف كامل)، وكل chunk بيتكامل لكل
+# الـ modes مرة وحدة وبعدين بنحدّث الـ envelopes؛ الـ state بيستمر بين الـ chunks
+#
+# STRUCTICODE_RECORDS_DIR: folder of ground-motion files the API may read
+# STRUCTICODE_MAX_HISTORY_VALUES: max numbers in the returned histories
+#   (kept steps × (time, ground acceleration, base shear + node dofs))
+
+RECORDS_DIR = os.getenv(
+    "STRUCTICODE_RECORDS_DIR", os.path.join(os.path.dirname(__file__), "data", "records")
+)
+RECORD_CHUNK_SIZE = 4096
+MAX_HISTORY_VALUES = int(os.getenv("STRUCTICODE_MAX_HISTORY_VALUES", 5_000_000))
+
+_NUMBER = re.compile(r"^[-+]?(\d+\.?\d*|\.\d+)([eEdD][-+]?\d+)?$")
+_HEADER_DT = re.compile(r"DT\s*=\s*([-+]?[\d.]+(?:[eE][-+]?\d+)?)", re.IGNORECASE)
+
+
+# ================================
+# Ground-motion records
+# ================================
+def record_path(name: str):
+    """
+    Absolute path of a record inside RECORDS_DIR (no paths outside it).
+    """
+    root = os.path.realpath(RECORDS_DIR)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError(f"Invalid record name: {name}")
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Ground motion record not found: {name}")
+    return path
+
+
+def record_time_step(path):
+    """
+    DT from a PEER .AT2 style header ("NPTS= 5590, DT= .0050 SEC"), or None.
+    """
+    if path.endswith(".npy"):
+        return None
+    with open(path, "r", errors="replace") as f:
+        for _, line in zip(range(10), f):
+            match = _HEADER_DT.search(line)
+            if match:
+                return float(match.group(1))
+    return None
+
+
+def record_steps(path):
+    """
+    Number of samples of a .npy record (read from its header), or None.
+    """
+    if not path.endswith(".npy"):
+        return None
+    return len(np.load(path, mmap_mode="r"))
+
+
+def ground_motion_chunks(path, chunk_size=RECORD_CHUNK_SIZE):
+    """
+    Yields the record's accelerations as float arrays of up to chunk_size values.
+    .npy files are memory-mapped; text files (any number of values per line,
+    comma or whitespace separated) are read line by line and header lines skipped.
+    """
+    if path.endswith(".npy"):
+        data = np.load(path, mmap_mode="r")
+        for start in range(0, len(data), chunk_size):
+            yield np.array(data[start:start + chunk_size], dtype=float)
+        return
+
+    buffer = []
+    with open(path, "r", errors="replace") as f:
+        for line in f:
+            tokens = line.replace(",", " ").split()
+            if not tokens or not all(_NUMBER.match(t) for t in tokens):
+                continue
+            buffer.extend(float(t.replace("D", "E").replace("d", "e")) for t in tokens)
+            while len(buffer) >= chunk_size:
+                yield np.array(buffer[:chunk_size])
+                del buffer[:chunk_size]
+    if buffer:
+        yield np.array(buffer)
+
+
+def array_chunks(values, chunk_size=RECORD_CHUNK_SIZE):
+    values = np.asarray(values, dtype=float)
+    for start in range(0, len(values), chunk_size):
+        yield values[start:start + chunk_size]
+
+
+# ================================
+# History size limit
+# ================================
+class HistoryLimitError(ValueError):
+    """
+    The requested histories would exceed MAX_HISTORY_VALUES.
+    """
+
+
+def history_values(steps, history_step, n_nodes, dofs):
+    """
+    Numbers returned for steps record samples kept every history_step-th step.
+    """
+    if history_step <= 0:
+        return 0
+    kept = -(-steps // history_step)
+    return kept * (3 + n_nodes * dofs)
+
+
+def check_history_size(steps, history_step, n_nodes, dofs, limit=MAX_HISTORY_VALUES):
+    values = history_values(steps, history_step, n_nodes, dofs)
+    if values > limit:
+        raise HistoryLimitError(
+            f"Time history output too large ({values} values, limit {limit}): "
+            f"increase historyStep or request fewer historyNodes"
+        )
+
+
+# ================================
+# Newmark integration of the modal equations
+# ================================
+class NewmarkModalIntegrator:
+    """
+    Newmark-β (default average acceleration, β = 1/4, γ = 1/2) for the uncoupled
+    modal equations q̈ + 2ζω q̇ + ω² q = p(t), all modes advanced together.
+    The state is kept between calls so a record can be integrated chunk by chunk.
+    """
+
+    def __init__(self, omega, damping, dt, beta=0.25, gamma=0.5):
+        c = 2 * damping * omega
+        k = omega**2
+        self.k_hat = k + gamma / (beta * dt) * c + 1 / (beta * dt**2)
+        self.a = 1 / (beta * dt) + gamma / beta * c
+        self.b = 1 / (2 * beta) + dt * (gamma / (2 * beta) - 1) * c
+        self.v_coeffs = (gamma / (beta * dt), gamma / beta, dt * (1 - gamma / (2 * beta)))
+        self.acc_coeffs = (1 / (beta * dt**2), 1 / (beta * dt), 1 / (2 * beta))
+        self.c, self.k = c, k
+
+        n = len(omega)
+        self.q = np.zeros(n)
+        self.v = np.zeros(n)
+        self.acc = None
+        self.p_prev = None
+
+    def advance(self, p):
+        """
+        p: (n_modes, steps) modal loads -> (n_modes, steps) modal displacements.
+        """
+        out = np.empty_like(p)
+        q, v = self.q, self.v
+        start = 0
+        if self.acc is None:
+            # at rest at t = 0
+            self.acc = p[:, 0] - self.c * v - self.k * q
+            self.p_prev = p[:, 0]
+            out[:, 0] = q
+            start = 1
+
+        acc, p_prev = self.acc, self.p_prev
+        k_hat, a, b = self.k_hat, self.a, self.b
+        v1, v2, v3 = self.v_coeffs
+        a1, a2, a3 = self.acc_coeffs
+        for j in range(start, p.shape[1]):
+            dq = (p[:, j] - p_prev + a * v + b * acc) / k_hat
+            dv = v1 * dq - v2 * v + v3 * acc
+            dacc = a1 * dq - a2 * v - a3 * acc
+            q = q + dq
+            v = v + dv
+            acc = acc + dacc
+            p_prev = p[:, j]
+            out[:, j] = q
+
+        self.q, self.v, self.acc, self.p_prev = q, v, acc, p_prev
+        return out
+
+
+class _Envelope:
+    """
+    Running max / min of response rows over all steps.
+    """
+
+    def __init__(self, rows):
+        self.max = np.full(rows, -np.inf)
+        self.min = np.full(rows, np.inf)
+
+    def update(self, values):
+        np.maximum(self.max, values.max(axis=1), out=self.max)
+        np.minimum(self.min, values.min(axis=1), out=self.min)
+
+
+def modal_time_history(analyzer, modes, chunks, dt, direction="X", damping=0.05, beta=0.25, gamma=0.5,
+                       scale=1.0, history_step=0, history_nodes=(), max_history_values=MAX_HISTORY_VALUES):
+    """
+    Response to a ground acceleration record (in g, times scale) along direction.
+    Envelopes of displacements, member end forces and reactions over the whole
+    record; with history_step > 0 every history_step-th step of the base shear
+    and the history_nodes displacements is also returned (HistoryLimitError once
+    that passes max_history_values).
+    """
+    d = analyzer.DIRECTIONS.index(direction)
+    shapes = modes["shapes"]
+    n_modes = shapes.shape[1]
+    participation = modes["participation"][d]
+    integrator = NewmarkModalIntegrator(modes["omega"], damping, dt, beta, gamma)
+
+    # per-mode response rows: response(t) = rows @ q(t)
+    dofs = analyzer.dofs_per_node
+    modal_forces = analyzer._recover_case_forces(shapes)
+    force_shape = modal_forces.shape[:2]
+    modal_forces = modal_forces.reshape(-1, n_modes)
+    modal_reactions = analyzer._reactions(shapes, np.zeros_like(shapes))
+    base_rows = analyzer.fixed_dofs % dofs == analyzer.TRANSLATIONAL_DOFS[d]
+    modal_base_shear = modal_reactions[base_rows].sum(axis=0)
+
+    disp_env = _Envelope(analyzer.ndof)
+    force_env = _Envelope(modal_forces.shape[0])
+    reaction_env = _Envelope(modal_reactions.shape[0])
+
+    history_dofs = [analyzer.node_dofs[nid] for nid in history_nodes]
+    history = {"time": [], "ground_acceleration": [], "base_shear": [], "displacements": []}
+
+    steps = 0
+    pga = 0.0
+    shear_max = (-np.inf, 0.0)
+    shear_min = (np.inf, 0.0)
+    for ag in chunks:
+        ag = np.asarray(ag, dtype=float) * scale
+        if not len(ag):
+            continue
+        Q = integrator.advance(-np.outer(participation, ag * GRAVITY))
+
+        U = shapes @ Q
+        disp_env.update(U)
+        force_env.update(modal_forces @ Q)
+        reaction_env.update(modal_reactions @ Q)
+
+        shear = modal_base_shear @ Q
+        i, j = int(shear.argmax()), int(shear.argmin())
+        if shear[i] > shear_max[0]:
+            shear_max = (float(shear[i]), (steps + i) * dt)
+        if shear[j] < shear_min[0]:
+            shear_min = (float(shear[j]), (steps + j) * dt)
+        pga = max(pga, float(np.abs(ag).max()))
+
+        if history_step > 0:
+            check_history_size(steps + len(ag), history_step, len(history_dofs), dofs, max_history_values)
+            picks = np.arange((-steps) % history_step, len(ag), history_step)
+            history["time"].extend(((steps + picks) * dt).tolist())
+            history["ground_acceleration"].extend(ag[picks].tolist())
+            history["base_shear"].extend(shear[picks].tolist())
+            history["displacements"].append(np.array([U[node][:, picks] for node in history_dofs]).reshape(
+                len(history_dofs), dofs, len(picks)
+            ))
+        steps += len(ag)
+
+    if steps == 0:
+        raise ValueError("Ground motion record is empty")
+
+    def envelope(env, formatter, shape=None):
+        values = (env.max, env.min) if shape is None else (env.max.reshape(shape), env.min.reshape(shape))
+        return {"max": formatter(values[0]), "min": formatter(values[1])}
+
+    result = {
+        "direction": direction,
+        "dt": dt,
+        "steps": steps,
+        "duration": round(steps * dt, 6),
+        "peak_ground_acceleration": pga,
+        "base_shear": {
+            "max": shear_max[0], "time_max": shear_max[1],
+            "min": shear_min[0], "time_min": shear_min[1],
+        },
+        "envelopes": {
+            "displacements": envelope(disp_env, analyzer._format_displacements),
+            "member_forces": envelope(force_env, analyzer._format_member_forces, force_shape),
+            "reactions": envelope(reaction_env, analyzer._format_reactions),
+        },
+    }
+
+    if history_step > 0:
+        keys = analyzer.DISPLACEMENT_KEYS
+        node_histories = (
+            np.concatenate(history["displacements"], axis=2) if history["displacements"]
+            else np.zeros((len(history_dofs), dofs, 0))
+        )
+        result["history"] = {
+            "step": history_step,
+            "time": history["time"],
+            "ground_acceleration": history["ground_acceleration"],
+            "base_shear": history["base_shear"],
+            "displacements": {
+                nid: dict(zip(keys, rows)) for nid, rows in zip(history_nodes, node_histories.tolist())
+            },
+        }
+    return result
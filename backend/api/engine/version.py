@@ -0,0 +1,39 @@
+import hashlib
+import os
+from functools import lru_cache
+
+# ================================
+# Engine version (used to invalidate cached results)
+# ================================
+# ارفع ENGINE_RELEASE مع أي تغيير مقصود في النتائج؛ وكمان بنضيف hash لملفات
+# الـ engine/codes عشان أي تعديل بالكود يغيّر النسخة حتى لو نسينا نرفعها
+
+ENGINE_RELEASE = "1.0"
+
+API_DIR = os.path.dirname(os.path.dirname(__file__))
+SOURCE_DIRS = ("engine", "codes")
+SOURCE_FILES = ("codes_seismic.py",)
+
+
+def _source_files():
+    for d in SOURCE_DIRS:
+        for root, dirs, files in os.walk(os.path.join(API_DIR, d)):
+            dirs[:] = sorted(x for x in dirs if x != "__pycache__")
+            for name in sorted(files):
+                if name.endswith((".py", ".json")):
+                    yield os.path.join(root, name)
+    for name in SOURCE_FILES:
+        yield os.path.join(API_DIR, name)
+
+
+@lru_cache(maxsize=None)
+def engine_version():
+    """
+    "<release>+<short hash of engine sources>", computed once per process.
+    """
+    digest = hashlib.sha256()
+    for path in _source_files():
+        digest.update(os.path.relpath(path, API_DIR).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return f"{ENGINE_RELEASE}+{digest.hexdigest()[:12]}"
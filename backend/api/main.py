@@ -1,25 +1,39 @@
+from contextlib import asynccontextmanager
+from typing import List, Optional
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
+from uuid import uuid4
+import asyncio
+import math
 import os
 
 # ✅ الاستيرادات من backend.api لأن utils و engine بداخل api
 from backend.api.utils.pdf_generator import generate_pdf
+from backend.api.utils.executor import compute_executor, session_executor
+from backend.api.utils.result_cache import result_cache, is_success
 from backend.api.engine import structure_router
-from backend.api.engine.load_combination import combine_loads
-from backend.api.engine.code_router import get_code_handler
-from backend.api.engine.seismic_router import get_seismic_handler
-from backend.api.engine.concrete.slab_solid import analyze_solid_slab
-from backend.api.engine.concrete.slab_hollow import analyze_hollow_slab
-from backend.api.engine.concrete.slab_waffle import analyze_waffle_slab
-from backend.api.engine.concrete.beam import analyze_concrete_beam
-from backend.api.engine.concrete.column import analyze_concrete_column
-from backend.api.engine.concrete.footing import analyze_concrete_footing
-from backend.api.engine.concrete.staircase import analyze_concrete_staircase
-
-app = FastAPI()
+from backend.api.engine.element_router import run_element_analysis, run_element_batch
+from backend.api.engine.seismic_router import get_seismic_handler, run_spectrum_batch
+from backend.api.engine.steel.section_optimizer import run_steel_optimization
+from backend.api.engine.concrete.rebar_design import run_rebar_design, DEFAULT_TOP as REBAR_DEFAULT_TOP
+
+# أقصى عدد عناصر في طلب batch واحد
+BATCH_MAX_ITEMS = 10000
+SPECTRUM_MAX_PERIODS = 10000
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    compute_executor.shutdown()
+    session_executor.shutdown()
+    result_cache.close()
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(structure_router.router, prefix="/api")
 
@@ -37,73 +51,107 @@ class AnalysisInput(BaseModel):
     data: dict
     seismic: dict | None = None
 
+class SteelOptimizeInput(BaseModel):
+    element: str  # steel_beam | steel_column
+    data: dict
+    code: str = "AISC"
+
+class RebarDesignInput(BaseModel):
+    items: List[AnalysisInput]
+    top: int = REBAR_DEFAULT_TOP
+
+class SpectrumBatchInput(BaseModel):
+    code: str
+    cases: List[dict]  # seismic data per case: zone, soil, importance, R
+    periods: Optional[List[float]] = None  # default: `points` periods evenly on [0, maxPeriod]
+    maxPeriod: float = 4.0
+    points: int = Field(101, ge=2, le=SPECTRUM_MAX_PERIODS)
+
 class PDFRequest(BaseModel):
     data: dict
     result: dict
 
 @app.post("/analyze")
 async def analyze_element(payload: AnalysisInput):
-    code = payload.code
-    element_type = payload.element
-    seismic_data = payload.seismic
+    # CPU-bound engines run in the compute pool, not on the event loop;
+    # identical payloads are answered from the result cache
+    return await result_cache.get_or_run(
+        "element", payload.dict(),
+        lambda: compute_executor.run(run_element_analysis, payload.code, payload.element, payload.data, payload.seismic),
+        cacheable=is_success,
+    )
 
-    if element_type == "slab" and "geometry" in payload.data:
-        geom = payload.data.pop("geometry")
-        data = {**payload.data, **geom}
-    else:
-        data = payload.data
+@app.post("/analyze/batch")
+async def analyze_batch(payload: List[AnalysisInput]):
+    if len(payload) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_ITEMS} items)")
 
-    try:
-        if element_type == "slab":
-            slab_type = data.get("type", "solid")
-            if slab_type == "solid":
-                structural = analyze_solid_slab(data)
-            elif slab_type == "hollow":
-                structural = analyze_hollow_slab(data)
-            elif slab_type == "waffle":
-                structural = analyze_waffle_slab(data)
-            else:
-                return {"status": "error", "message": f"Unsupported slab type: {slab_type}"}
-        elif element_type == "beam":
-            structural = analyze_concrete_beam(data, code)
-        elif element_type == "column":
-            structural = analyze_concrete_column(data, code)
-        elif element_type == "footing":
-            structural = analyze_concrete_footing(data, code)
-        elif element_type == "staircase":
-            structural = analyze_concrete_staircase(data)
-        else:
-            handler = get_code_handler(code)
-            if not handler:
-                return {"status": "error", "message": "Unsupported code"}
-            structural = handler.analyze(element_type, data)
-
-        seismic_result = None
-        if seismic_data:
-            seismic_handler = get_seismic_handler(code)
-            if seismic_handler:
-                seismic_result = seismic_handler.analyze(seismic_data)
-
-        return {
-            "status": "success",
-            "element": element_type,
-            "result": {
-                "structural": structural,
-                "seismic": seismic_result
-            }
-        }
+    keys = [result_cache.key("element", p.dict()) for p in payload]
+    results = await result_cache.get_many_async(keys)
+    missing = [i for i, r in enumerate(results) if r is None]
 
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+    if missing:
+        items = [(payload[i].code, payload[i].element, payload[i].data, payload[i].seismic) for i in missing]
+
+        # split across the pool: dispatch overhead is paid per chunk, not per element
+        size = math.ceil(len(items) / min(compute_executor.workers, len(items)))
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        parts = await asyncio.gather(*(compute_executor.run(run_element_batch, chunk) for chunk in chunks))
+
+        for i, result in zip(missing, (r for part in parts for r in part)):
+            results[i] = result
+        await result_cache.set_many_async([(keys[i], results[i]) for i in missing if is_success(results[i])])
+
+    return {"status": "success", "count": len(results), "results": results}
+
+@app.post("/optimize/steel")
+async def optimize_steel_section(payload: SteelOptimizeInput):
+    # scans the whole section catalog and returns the lightest passing sections
+    return await compute_executor.run(run_steel_optimization, payload.element, payload.data, payload.code)
+
+@app.post("/design/rebar")
+async def design_rebar(payload: RebarDesignInput):
+    if len(payload.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_ITEMS} items)")
+
+    # the whole project goes in one job: elements of a type are searched together
+    items = [(p.code, p.element, p.data) for p in payload.items]
+    results = await compute_executor.run(run_rebar_design, items, payload.top)
+    return {"status": "success", "count": len(results), "results": results}
+
+@app.post("/seismic/spectrum")
+async def seismic_spectrum_batch(payload: SpectrumBatchInput):
+    if not get_seismic_handler(payload.code):
+        raise HTTPException(status_code=400, detail=f"No seismic handler for code: {payload.code}")
+    if len(payload.cases) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_ITEMS} cases)")
+
+    periods = payload.periods
+    if periods is None:
+        periods = [payload.maxPeriod * i / (payload.points - 1) for i in range(payload.points)]
+    if len(periods) > SPECTRUM_MAX_PERIODS:
+        raise HTTPException(status_code=413, detail=f"Too many periods (max {SPECTRUM_MAX_PERIODS})")
+    if any(T < 0 for T in periods):
+        raise HTTPException(status_code=400, detail="Periods must not be negative")
+
+    return await compute_executor.run(run_spectrum_batch, payload.code, payload.cases, periods)
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return result_cache.stats()
 
 @app.post("/generate-pdf")
 async def generate_pdf_report(request: PDFRequest):
     try:
         filename = "report.pdf"
-        path = generate_pdf(request.data, request.result, filename)
+        # unique file per request: concurrent workers must not overwrite each other
+        path = await compute_executor.run(generate_pdf, request.data, request.result, f"report-{uuid4().hex}.pdf")
         if not os.path.exists(path):
             raise HTTPException(status_code=500, detail="PDF not generated")
-        return FileResponse(path, media_type="application/pdf", filename=filename)
+        return FileResponse(path, media_type="application/pdf", filename=filename,
+                            background=BackgroundTask(os.remove, path))
+    except HTTPException:
+        raise
     except Exception as e:
         print("PDF generation failed:", e)
         raise HTTPException(status_code=500, detail=f"Failed to generate PDF: {e}")
@@ -0,0 +1,109 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException
+
+# ================================
+# Compute executor (keeps CPU-bound work off the event loop)
+# ================================
+# STRUCTICODE_EXECUTOR: "process" (default) or "thread"
+# STRUCTICODE_WORKERS: pool size (default: CPU count)
+# STRUCTICODE_MAX_QUEUE: jobs allowed to wait for a worker before we answer 503
+# STRUCTICODE_RETRY_AFTER: seconds sent in the Retry-After header
+
+EXECUTOR_KIND = os.getenv("STRUCTICODE_EXECUTOR", "process")
+EXECUTOR_WORKERS = int(os.getenv("STRUCTICODE_WORKERS", os.cpu_count() or 2))
+EXECUTOR_MAX_QUEUE = int(os.getenv("STRUCTICODE_MAX_QUEUE", EXECUTOR_WORKERS * 4))
+RETRY_AFTER_SECONDS = int(os.getenv("STRUCTICODE_RETRY_AFTER", 2))
+
+
+# ================================
+# Worker state (shipped with every process job)
+# ================================
+# spawn workers only see what importing the engine registers; state the server
+# process can change at runtime (plugin registrations) registers a snapshot /
+# restore pair here, the snapshot travels with each job and is restored first
+_worker_state = {}
+
+
+def register_worker_state(name, snapshot, restore):
+    """
+    snapshot() -> picklable state; restore(state) applies it inside the worker
+    (both module-level functions).
+    """
+    _worker_state[name] = (snapshot, restore)
+
+
+def _run_with_state(state, fn, args, kwargs):
+    for restore, snapshot in state:
+        restore(snapshot)
+    return fn(*args, **kwargs)
+
+
+class ComputeExecutor:
+    """
+    Runs sync engine functions in a thread or process pool with a bounded
+    number of in-flight jobs (running + queued). When the bound is reached
+    new work is rejected with 503 + Retry-After instead of piling up.
+    Functions sent to a process pool must be module-level (picklable).
+    """
+
+    def __init__(self, kind=EXECUTOR_KIND, workers=EXECUTOR_WORKERS, max_queue=EXECUTOR_MAX_QUEUE):
+        if kind not in ("process", "thread"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.max_in_flight = self.workers + max(0, max_queue)
+        self.in_flight = 0
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            if self.kind == "process":
+                # spawn: workers don't inherit the event loop / server threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="structicode")
+        return self._pool
+
+    async def run(self, fn, *args, **kwargs):
+        # in_flight is only touched from the event loop thread, no lock needed
+        if self.in_flight >= self.max_in_flight:
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+
+        call = functools.partial(fn, *args, **kwargs)
+        if self.kind == "process" and _worker_state:
+            state = [(restore, snapshot()) for snapshot, restore in _worker_state.values()]
+            call = functools.partial(_run_with_state, state, fn, args, kwargs)
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), call)
+        except BrokenProcessPool:
+            # a worker died (OOM / crash): drop the pool so the next job gets a fresh one
+            self.shutdown()
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+compute_executor = ComputeExecutor()
+
+# incremental analysis sessions keep factorizations in this process -> threads
+session_executor = ComputeExecutor(kind="thread")
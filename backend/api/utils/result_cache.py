@@ -0,0 +1,312 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from ..engine.version import engine_version
+
+# ================================
+# Result cache (content-addressed, in front of the analysis endpoints)
+# ================================
+# STRUCTICODE_CACHE_SIZE: max entries in memory (0 disables the cache)
+# STRUCTICODE_CACHE_BYTES: memory budget of the cached results (JSON size)
+# STRUCTICODE_CACHE_ENTRY_BYTES: results larger than this aren't cached
+# STRUCTICODE_CACHE_TTL: seconds an entry stays valid (0 = no expiry)
+# STRUCTICODE_CACHE_DB: optional SQLite file for a persistent second tier
+
+CACHE_SIZE = int(os.getenv("STRUCTICODE_CACHE_SIZE", 1024))
+CACHE_BYTES = int(os.getenv("STRUCTICODE_CACHE_BYTES", 256 * 1024**2))
+CACHE_ENTRY_BYTES = int(os.getenv("STRUCTICODE_CACHE_ENTRY_BYTES", 16 * 1024**2))
+CACHE_TTL = float(os.getenv("STRUCTICODE_CACHE_TTL", 3600))
+CACHE_DB = os.getenv("STRUCTICODE_CACHE_DB")
+
+
+def canonical_key(kind: str, payload, version: str) -> str:
+    """
+    sha256 of the canonical JSON of (kind, engine version, payload):
+    key order and whitespace don't matter, values do.
+    """
+    text = json.dumps(
+        {"kind": kind, "version": version, "payload": payload},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _DiskTier:
+    """
+    SQLite key -> JSON result store. Rows from other engine versions are
+    dropped when the tier is opened.
+    """
+
+    def __init__(self, path, version, ttl):
+        self.version = version
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, version TEXT NOT NULL, created REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            self._db.execute("DELETE FROM results WHERE version != ?", (version,))
+            if ttl:
+                self._db.execute("DELETE FROM results WHERE created < ?", (time.time() - ttl,))
+
+    def get(self, key):
+        """
+        (created, JSON text) or None.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT created, value FROM results WHERE key = ? AND version = ?", (key, self.version)
+            ).fetchone()
+        if row is None:
+            return None
+        created, text = row
+        if self.ttl and time.time() - created > self.ttl:
+            return None
+        return created, text
+
+    def set(self, key, text, created):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, version, created, value) VALUES (?, ?, ?, ?)",
+                (key, self.version, created, text),
+            )
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM results")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class ResultCache:
+    """
+    In-memory LRU (entries, bytes and TTL bounded) with an optional SQLite tier.
+    Entry sizes are the length of the result's JSON. Concurrent requests for
+    the same key share one computation; get_or_run / get_async / set_async keep
+    the serialization and disk I/O off the event loop.
+    """
+
+    def __init__(self, max_entries=CACHE_SIZE, ttl=CACHE_TTL, db_path=CACHE_DB, version=None,
+                 max_bytes=CACHE_BYTES, max_entry_bytes=CACHE_ENTRY_BYTES):
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self.max_entry_bytes = min(max(0, max_entry_bytes), self.max_bytes)
+        self.ttl = ttl
+        self.version = version or engine_version()
+        self._entries = OrderedDict()  # key -> (created, value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._pending = {}  # key -> asyncio.Future of an in-flight computation
+        self.db_path = db_path if self.enabled else None
+        self._disk_tier = None
+        self.metrics = {
+            "hits": 0, "disk_hits": 0, "misses": 0, "shared": 0, "stores": 0,
+            "evictions": 0, "expired": 0, "oversized": 0,
+        }
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    @property
+    def _disk(self):
+        # opened on first use: compute workers import this module but never touch the cache
+        if self._disk_tier is None and self.db_path:
+            with self._lock:
+                if self._disk_tier is None:
+                    self._disk_tier = _DiskTier(self.db_path, self.version, self.ttl)
+        return self._disk_tier
+
+    def key(self, kind, payload):
+        return canonical_key(kind, payload, self.version)
+
+    def _expired(self, created):
+        return bool(self.ttl) and time.time() - created > self.ttl
+
+    def get(self, key):
+        """
+        Cached value or None (counts a hit or a miss). Blocking on the disk tier.
+        """
+        if not self.enabled:
+            return None
+        value = self._memory_get(key)
+        if value is None and self.db_path:
+            value = self._disk_get(key)
+        if value is None:
+            self._count("misses")
+        return value
+
+    async def get_async(self, key):
+        """
+        get() with the disk lookup in a worker thread.
+        """
+        if not self.enabled:
+            return None
+        value = self._memory_get(key)
+        if value is None and self.db_path:
+            value = await asyncio.to_thread(self._disk_get, key)
+        if value is None:
+            self._count("misses")
+        return value
+
+    def set(self, key, value):
+        """
+        Stores value unless its JSON is over max_entry_bytes. Blocking: the value
+        is serialized (for its size and the disk tier).
+        """
+        if not self.enabled:
+            return
+        text = json.dumps(value, ensure_ascii=False, default=str)
+        if len(text) > self.max_entry_bytes:
+            self._count("oversized")
+            return
+        created = time.time()
+        self._remember(key, value, created, len(text))
+        if self._disk is not None:
+            self._disk.set(key, text, created)
+        self._count("stores")
+
+    async def set_async(self, key, value):
+        if self.enabled:
+            await asyncio.to_thread(self.set, key, value)
+
+    async def get_many_async(self, keys):
+        """
+        [value or None] for keys, disk lookups done together in one worker thread.
+        """
+        if not self.enabled:
+            return [None] * len(keys)
+        if not self.db_path:
+            return [self.get(key) for key in keys]
+        return await asyncio.to_thread(lambda: [self.get(key) for key in keys])
+
+    async def set_many_async(self, items):
+        if self.enabled and items:
+            await asyncio.to_thread(lambda: [self.set(key, value) for key, value in items])
+
+    def _memory_get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[0]):
+                self._drop(key)
+                self.metrics["expired"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.metrics["hits"] += 1
+            return entry[1]
+
+    def _disk_get(self, key):
+        found = self._disk.get(key)
+        if found is None:
+            return None
+        created, text = found
+        value = json.loads(text)
+        self._remember(key, value, created, len(text))
+        self._count("disk_hits")
+        return value
+
+    def _count(self, metric):
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def _drop(self, key):
+        # caller holds self._lock
+        self._bytes -= self._entries.pop(key)[2]
+
+    def _remember(self, key, value, created, size):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (created, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.metrics["evictions"] += 1
+
+    async def get_or_run(self, kind, payload, compute, cacheable=lambda result: True):
+        """
+        Cached result for payload, or await compute() once and store it.
+        Identical requests arriving while it runs wait for the same result.
+        """
+        if not self.enabled:
+            return await compute()
+
+        key = self.key(kind, payload)
+        value = self._memory_get(key)
+        if value is not None:
+            return value
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.metrics["shared"] += 1
+            return await asyncio.shield(pending)
+
+        # registered before the first await: the disk lookup is shared too
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await asyncio.to_thread(self._disk_get, key) if self.db_path else None
+            if value is None:
+                self._count("misses")
+                value = await compute()
+                if cacheable(value):
+                    await self.set_async(key, value)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved: waiters are optional
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._pending[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.metrics["hits"] + self.metrics["disk_hits"] + self.metrics["misses"]
+            return {
+                "enabled": self.enabled,
+                "engine_version": self.version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "disk_tier": bool(self.db_path),
+                **self.metrics,
+                "hit_rate": round((self.metrics["hits"] + self.metrics["disk_hits"]) / lookups, 4) if lookups else None,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self._disk is not None:
+            self._disk.clear()
+
+    def close(self):
+        if self._disk_tier is not None:
+            self._disk_tier.close()
+            self._disk_tier = None
+
+
+def is_success(result):
+    """
+    Only deterministic outcomes are cached; error results may be transient.
+    """
+    return isinstance(result, dict) and result.get("status") != "error"
+
+
+result_cache = ResultCache()
@@ -0,0 +1,112 @@
+import copy
+
+import numpy as np
+import pytest
+
+from backend.api.engine import structure_router
+from backend.api.engine.analysis_session import WOODBURY_MAX_RANK, AnalysisSession, session_store
+from backend.api.engine.structure_analyzer import StructureAnalyzer
+
+
+def frame(bays=3, storeys=3):
+    nodes, members = [], []
+    for j in range(storeys + 1):
+        for i in range(bays + 1):
+            nodes.append({"id": f"N{i}_{j}", "x": 5.0 * i, "y": 3.0 * j, "support": "fix" if j == 0 else "free"})
+    for j in range(storeys):
+        for i in range(bays + 1):
+            members.append({"id": f"C{i}_{j}", "n1": f"N{i}_{j}", "n2": f"N{i}_{j + 1}", "type": "column",
+                            "sectionId": "S1", "materialId": "M1", "loads": [{"w": 2.0, "type": "W"}]})
+    for j in range(1, storeys + 1):
+        for i in range(bays):
+            members.append({"id": f"B{i}_{j}", "n1": f"N{i}_{j}", "n2": f"N{i + 1}_{j}", "type": "beam",
+                            "sectionId": "S2", "materialId": "M1",
+                            "loads": [{"w": -20.0, "type": "D"}, {"w": -10.0, "type": "L"}]})
+    return {
+        "code": "ACI", "units": {},
+        "materials": [{"id": "M1", "name": "C30", "fc": 30, "fy": 420, "E": 25e6}],
+        "sections": [
+            {"id": "S1", "name": "C", "shape": "rect", "params": {"bw": 0.4, "h": 0.4}},
+            {"id": "S2", "name": "B", "shape": "rect", "params": {"bw": 0.3, "h": 0.6}},
+            {"id": "S3", "name": "B2", "shape": "rect", "params": {"bw": 0.35, "h": 0.8}},
+        ],
+        "nodes": nodes, "members": members, "slabs": [],
+        "loads": {"combinations": [
+            {"id": "LC1", "name": "1.2D+1.6L", "expr": "1.2D+1.6L"},
+            {"id": "LC2", "name": "1.2D+1.0W+1.0L", "expr": "1.2D+1.0W+1.0L"},
+        ]},
+    }
+
+
+def displacements(analyzer):
+    results = analyzer.analyze_combinations()
+    return np.array([[list(d.values()) for d in r["displacements"].values()] for r in results.values()])
+
+
+def assert_matches_fresh(analyzer, structure):
+    np.testing.assert_allclose(displacements(analyzer), displacements(StructureAnalyzer(structure)), atol=1e-12)
+
+
+@pytest.mark.parametrize("solver", ["dense", "banded", "sparse"])
+def test_update_paths(solver):
+    structure = frame()
+    session = AnalysisSession(structure, solver=solver)
+    assert session.last_update["mode"] == "full_factorization"
+
+    loads_only = copy.deepcopy(structure)
+    loads_only["members"][-1]["loads"][0]["w"] = -35.0
+    analyzer = session.update(loads_only)
+    assert session.last_update["mode"] == "reuse_factorization"
+    assert analyzer._factor is session._base_factor
+    assert_matches_fresh(analyzer, loads_only)
+
+    section = copy.deepcopy(loads_only)
+    section["members"][-1]["sectionId"] = "S3"
+    analyzer = session.update(section)
+    assert session.last_update["mode"] == "woodbury_update"
+    assert session.last_update["changed_members"] == [section["members"][-1]["id"]]
+    assert 0 < session.last_update["update_rank"] <= WOODBURY_MAX_RANK
+    assert_matches_fresh(analyzer, section)
+
+
+def test_many_changes_refactorize():
+    structure = frame(6, 6)
+    session = AnalysisSession(structure)
+    edited = copy.deepcopy(structure)
+    for member in edited["members"]:
+        member["sectionId"] = "S3"
+    analyzer = session.update(edited)
+    assert session.last_update["mode"] == "full_factorization"
+    assert "members changed" in session.last_update["reason"]
+    assert_matches_fresh(analyzer, edited)
+
+
+def test_support_change_refactorizes():
+    structure = frame()
+    session = AnalysisSession(structure)
+    edited = copy.deepcopy(structure)
+    edited["nodes"][0]["support"] = "pin"
+    analyzer = session.update(edited)
+    assert session.last_update["mode"] == "full_factorization"
+    assert session.last_update["reason"] == "topology or supports changed"
+    assert_matches_fresh(analyzer, edited)
+
+
+def test_design_runs_under_the_session_lock(monkeypatch):
+    design = structure_router._design_response
+    seen = []
+
+    def checked(code, handler, structure_dict, analyzer):
+        session = next(s for s in session_store._sessions.values() if s.analyzer is analyzer)
+        seen.append(session.lock.locked())
+        return design(code, handler, structure_dict, analyzer)
+
+    monkeypatch.setattr(structure_router, "_design_response", checked)
+    structure = frame()
+    created = structure_router.run_session_analysis(copy.deepcopy(structure))
+    session_id = created["session"]["id"]
+    updated = structure_router.run_session_analysis(copy.deepcopy(structure), session_id)
+
+    assert seen == [True, True]
+    assert updated["session"]["mode"] == "reuse_factorization"
+    session_store.remove(session_id)
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import main
+from backend.api.engine.code_router import available_codes, get_code_handler, register_code_handler
+from backend.api.engine.registry import HandlerRegistry
+from backend.api.utils.executor import ComputeExecutor
+
+
+class DummyCode:
+    instances = 0
+
+    def __init__(self):
+        DummyCode.instances += 1
+
+    def analyze(self, element_type, data):
+        return {"element": element_type, "span": data.get("span"), "pid": os.getpid()}
+
+
+def test_lookup_is_case_insensitive_and_lazy():
+    registry = HandlerRegistry()
+    registry.register("Dummy", DummyCode)
+    before = DummyCode.instances
+    assert registry.get("DUMMY") is registry.get("dummy") is registry.get("Dummy")
+    assert DummyCode.instances == before + 1
+    assert registry.names() == ["Dummy"]
+    assert registry.get("other") is None and registry.get("") is None
+
+
+def test_builtin_codes_resolve_in_any_case():
+    assert get_code_handler("eurocode") is get_code_handler("EUROCODE")
+    assert "Eurocode" in available_codes()
+
+
+def test_registrations_only_ship_importable_handlers():
+    registry = HandlerRegistry()
+    registry.register("Path", "..codes.aci:ACI")
+    registry.register("Class", DummyCode)
+    registry.register("Lambda", lambda: DummyCode())
+    assert registry.registrations() == [("Path", "..codes.aci:ACI"), ("Class", DummyCode)]
+
+
+def test_same_registration_keeps_the_cached_instance():
+    registry = HandlerRegistry()
+    registry.register("Dummy", DummyCode)
+    handler = registry.get("Dummy")
+    registry.restore(registry.registrations())
+    assert registry.get("Dummy") is handler
+
+
+@pytest.fixture
+def process_executor(monkeypatch):
+    executor = ComputeExecutor(kind="process", workers=1)
+    monkeypatch.setattr(main, "compute_executor", executor)
+    yield executor
+    executor.shutdown()
+
+
+def test_runtime_plugin_reaches_process_workers(process_executor):
+    register_code_handler("DummyPlugin", DummyCode)
+    with TestClient(main.app) as client:
+        response = client.post(
+            "/analyze", json={"code": "dummyplugin", "element": "truss", "data": {"span": 7.5}}
+        ).json()
+
+    assert response["status"] == "success"
+    structural = response["result"]["structural"]
+    assert structural["span"] == 7.5
+    assert structural["pid"] != os.getpid()
@@ -0,0 +1,39 @@
+import pytest
+
+from backend.api.engine.load_combination import CODE_COMBINATIONS, generate_combinations
+
+
+def exprs(code, cases, **kwargs):
+    return {c["expr"] for c in generate_combinations(code, cases, **kwargs)}
+
+
+# models with lateral loads but no live load keep their gravity and D + W / D + E combinations
+@pytest.mark.parametrize("code, cases, expected", [
+    ("ACI", ["D", "W_X", "E_X"], {"1.4D", "1.2D+1.0W_X", "1.2D-1.0E_X", "0.9D+1.0W_X", "0.9D-1.0E_X"}),
+    ("EUROCODE", ["D", "W"], {"1.35D", "1.35D+1.5W", "1.0D-1.5W"}),
+    ("EGYPT", ["D", "W"], {"1.5D", "1.12D+1.28W", "0.9D-1.3W"}),
+    ("TURKEY", ["D", "W", "E"], {"1.4D", "1.0D+1.3W", "1.0D+1.0E", "0.9D-1.0E"}),
+    ("BS", ["D", "E"], {"1.4D", "1.0D+1.0E"}),
+])
+def test_missing_companion_keeps_template(code, cases, expected):
+    assert expected <= exprs(code, cases)
+
+
+@pytest.mark.parametrize("code", sorted(CODE_COMBINATIONS))
+@pytest.mark.parametrize("cases", [["D", "W"], ["D", "E"]])
+def test_gravity_and_lateral_without_live_load(code, cases):
+    combos = exprs(code, cases)
+    lateral = cases[1]
+    assert any(lateral not in expr for expr in combos)
+    assert any(lateral in expr for expr in combos)
+    assert all("L" not in expr for expr in combos)
+
+
+def test_missing_leading_action_skips_template():
+    # 1.2D+1.6Lr+0.5W is led by roof live load: no Lr, no combination
+    assert "1.2D+0.5W" not in exprs("ACI", ["D", "L", "W"])
+
+
+def test_psi_overrides_reach_generated_expressions():
+    assert "1.35D+0.75L+1.5W" in exprs("EUROCODE", ["D", "L", "W"], psi={"L": [0.5, 0.3, 0.2]})
+    assert "1.35D+1.05L+1.5W" in exprs("EUROCODE", ["D", "L", "W"])
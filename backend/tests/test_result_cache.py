@@ -0,0 +1,97 @@
+import asyncio
+import json
+import time
+
+from backend.api.utils.result_cache import ResultCache
+
+
+def size(value):
+    return len(json.dumps(value, ensure_ascii=False))
+
+
+def test_hit_and_miss_counts():
+    cache = ResultCache(max_entries=4, ttl=0)
+    key = cache.key("element", {"b": 1, "a": 2})
+    assert cache.get(key) is None
+    cache.set(key, {"status": "success"})
+    assert cache.get(cache.key("element", {"a": 2, "b": 1})) == {"status": "success"}
+    assert cache.metrics["hits"] == 1 and cache.metrics["misses"] == 1
+
+
+def test_lru_eviction_by_entries():
+    cache = ResultCache(max_entries=2, ttl=0)
+    for i in range(3):
+        cache.set(str(i), {"i": i})
+    cache.get("1")
+    cache.set("3", {"i": 3})
+    assert list(cache._entries) == ["1", "3"]
+    assert cache.metrics["evictions"] == 2
+
+
+def test_eviction_by_bytes_and_oversized_entries():
+    value = {"data": "x" * 100}
+    cache = ResultCache(max_entries=100, ttl=0, max_bytes=3 * size(value), max_entry_bytes=3 * size(value))
+    for i in range(5):
+        cache.set(str(i), value)
+    assert list(cache._entries) == ["2", "3", "4"]
+    assert cache.stats()["bytes"] == 3 * size(value)
+
+    cache.set("big", {"data": "x" * 1000})
+    assert cache.get("big") is None
+    assert cache.metrics["oversized"] == 1
+
+
+def test_ttl_expiry():
+    cache = ResultCache(max_entries=4, ttl=0.05)
+    cache.set("k", {"v": 1})
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    assert cache.metrics["expired"] == 1 and cache.stats()["bytes"] == 0
+
+
+def test_disk_tier_is_invalidated_by_engine_version(tmp_path):
+    db = str(tmp_path / "cache.db")
+    first = ResultCache(db_path=db, version="1")
+    key = first.key("structure", {"a": 1})
+    first.set(key, {"status": "success"})
+    first.close()
+
+    reopened = ResultCache(db_path=db, version="1")
+    assert reopened.get(key) == {"status": "success"}
+    assert reopened.metrics["disk_hits"] == 1
+    reopened.close()
+
+    upgraded = ResultCache(db_path=db, version="2")
+    assert upgraded.get(upgraded.key("structure", {"a": 1})) is None
+    assert upgraded.get(key) is None
+    upgraded.close()
+
+
+def test_get_or_run_shares_one_computation(tmp_path):
+    cache = ResultCache(max_entries=4, ttl=0, db_path=str(tmp_path / "cache.db"))
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"status": "success"}
+
+    async def main():
+        results = await asyncio.gather(*(cache.get_or_run("x", {"a": 1}, compute) for _ in range(5)))
+        again = await cache.get_or_run("x", {"a": 1}, compute)
+        return results, again
+
+    results, again = asyncio.run(main())
+    assert len(calls) == 1 and cache.metrics["shared"] == 4
+    assert all(r == {"status": "success"} for r in results) and again == results[0]
+    cache.close()
+
+
+def test_errors_are_not_cached():
+    cache = ResultCache(max_entries=4, ttl=0)
+
+    async def compute():
+        return {"status": "error", "message": "bad input"}
+
+    asyncio.run(cache.get_or_run("x", {}, compute, cacheable=lambda r: r["status"] != "error"))
+    assert cache.stats()["entries"] == 0
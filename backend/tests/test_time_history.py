@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import main
+from backend.api.engine.structure_analyzer import StructureAnalyzer
+from backend.api.engine.time_history import (
+    HistoryLimitError,
+    NewmarkModalIntegrator,
+    array_chunks,
+    modal_time_history,
+)
+
+
+
+def portal():
+    return {
+        "code": "ACI", "units": {},
+        "materials": [{"id": "M1", "name": "C30", "fc": 30, "fy": 420, "E": 25e6}],
+        "sections": [{"id": "S1", "name": "C", "shape": "rect", "params": {"bw": 0.4, "h": 0.4}}],
+        "nodes": [
+            {"id": "A", "x": 0.0, "y": 0.0, "support": "fix"},
+            {"id": "B", "x": 0.0, "y": 3.0, "support": "free"},
+            {"id": "C", "x": 5.0, "y": 3.0, "support": "free"},
+            {"id": "D", "x": 5.0, "y": 0.0, "support": "fix"},
+        ],
+        "members": [
+            {"id": m, "n1": n1, "n2": n2, "type": "column" if m != "BC" else "beam",
+             "sectionId": "S1", "materialId": "M1", "loads": [{"w": -20.0, "type": "D"}] if m == "BC" else []}
+            for m, n1, n2 in (("AB", "A", "B"), ("BC", "B", "C"), ("CD", "C", "D"))
+        ],
+        "slabs": [], "loads": {"combinations": []},
+    }
+
+
+def test_newmark_matches_sdof_step_response():
+    # undamped SDOF under a unit step load: q(t) = (1 - cos ωt) / ω²
+    omega, dt = 2 * np.pi, 1e-3
+    t = np.arange(0, 3, dt)
+    q = NewmarkModalIntegrator(np.array([omega]), 0.0, dt).advance(np.ones((1, len(t))))[0]
+    np.testing.assert_allclose(q, (1 - np.cos(omega * t)) / omega**2, atol=1e-4 / omega**2)
+
+
+def test_newmark_state_carries_across_chunks():
+    omega = np.array([3.0, 12.0])
+    p = np.sin(np.linspace(0, 20, 1000))[None, :] * np.array([[1.0], [0.5]])
+    whole = NewmarkModalIntegrator(omega, 0.05, 0.01).advance(p)
+    chunked = NewmarkModalIntegrator(omega, 0.05, 0.01)
+    parts = [chunked.advance(p[:, i:i + 137]) for i in range(0, p.shape[1], 137)]
+    np.testing.assert_allclose(np.hstack(parts), whole, atol=1e-12)
+
+
+def test_history_limit_is_enforced_while_streaming():
+    analyzer = StructureAnalyzer(portal())
+    modes = analyzer.modal_analysis(2, "lumped", None)
+    record = np.sin(np.linspace(0, 10, 500)) * 0.1
+    kwargs = dict(history_step=1, history_nodes=["B"])
+    result = modal_time_history(analyzer, modes, array_chunks(record, 100), 0.01, **kwargs)
+    assert len(result["history"]["time"]) == 500
+    with pytest.raises(HistoryLimitError):
+        modal_time_history(analyzer, modes, array_chunks(record, 100), 0.01, max_history_values=1000, **kwargs)
+
+
+@pytest.mark.parametrize("override, status", [
+    ({"beta": 0}, 400),
+    ({"gamma": -0.5}, 400),
+    ({"damping": 1.0}, 400),
+    ({"damping": -0.01}, 400),
+    ({"historyStep": -1}, 400),
+    ({"historyStep": 1, "historyNodes": ["B"], "acceleration": [0.0] * 1_000_000}, 413),
+])
+def test_invalid_time_history_input(override, status):
+    payload = {"structure": portal(), "acceleration": [0.0, 0.1, -0.1], "dt": 0.01, **override}
+    with TestClient(main.app) as client:
+        response = client.post("/api/structure/time-history", json=payload)
+    assert response.status_code == status